@@ -0,0 +1,73 @@
+"""Benchmark size and CPU cost of body compression codecs.
+
+Usage:
+    python benchmarks/compression.py
+
+"""
+
+import functools
+import random
+import timeit
+
+import ujson
+
+from sns_sqs_communicator import compression
+
+# Number of calls for each measurement
+ROUNDS = 50
+# Approximate sizes (in bytes) of generated bodies
+BODY_SIZES = (1024, 16 * 1024, 64 * 1024, 256 * 1024)
+
+
+def generate_body(size: int) -> str:
+    """Generate large repetitive json body of approximate size."""
+    items = []
+    body = "[]"
+    while len(body) < size:
+        items.append(
+            {
+                "id": random.randint(1, 1_000_000),
+                "type": random.choice(("order", "invoice", "payment")),
+                "status": random.choice(("created", "updated", "deleted")),
+                "amount": round(random.uniform(1, 1000), 2),
+                "tags": ["sns", "sqs", "communicator"],
+            },
+        )
+        body = ujson.dumps({"items": items})
+    return body
+
+
+def run() -> None:
+    """Run benchmark and print results."""
+    codecs = tuple(compression.codecs_registry.values())
+    print(
+        f"{'codec':<6} {'size':>8} {'compressed':>11} {'ratio':>6} "
+        f"{'compress, ms':>13} {'decompress, ms':>15}",
+    )
+    for size in BODY_SIZES:
+        body = generate_body(size)
+        for codec in codecs:
+            config = compression.CompressionConfig(codec=codec, threshold=0)
+            compressed_body, _ = config.compress(body, {})
+            compress_time = timeit.timeit(
+                functools.partial(config.compress, body, {}),
+                number=ROUNDS,
+            )
+            decompress_time = timeit.timeit(
+                functools.partial(
+                    compression.decompress,
+                    compressed_body,
+                    codec.name,
+                ),
+                number=ROUNDS,
+            )
+            print(
+                f"{codec.name:<6} {len(body):>8} {len(compressed_body):>11} "
+                f"{len(compressed_body) / len(body):>6.2f} "
+                f"{compress_time / ROUNDS * 1000:>13.3f} "
+                f"{decompress_time / ROUNDS * 1000:>15.3f}",
+            )
+
+
+if __name__ == "__main__":
+    run()
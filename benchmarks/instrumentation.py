@@ -0,0 +1,118 @@
+"""Benchmark overhead of tracking on `SQSParser.parse`.
+
+Disabled sites are the original functions, so parsing with disabled
+tracking is expected to take the same time as parsing without it.
+
+Usage:
+    python benchmarks/instrumentation.py
+
+"""
+
+import collections.abc
+import enum
+import functools
+import timeit
+import typing
+
+import ujson
+
+from sns_sqs_communicator import metrics, parsers, schemas
+
+# Number of calls for each measurement
+ROUNDS = 100_000
+# Number of measurements to take best one of
+REPEATS = 7
+
+
+class Action(enum.StrEnum):
+    """Actions of benchmarked messages."""
+
+    create = "create"
+
+
+class OrderQueueBodySchema(schemas.QueueBodySchema, for_type="order"):
+    """Schema of benchmarked messages."""
+
+    id: int
+    amount: float
+    tags: list[str]
+
+
+class Parser(parsers.SQSParser[Action]):
+    """Parser of benchmarked messages."""
+
+    message_action_enum = Action
+
+
+RAW_MESSAGE = {
+    "MessageId": "message-id",
+    "ReceiptHandle": "receipt-handle",
+    "Body": ujson.dumps({"id": 1, "amount": 9.99, "tags": ["sns", "sqs"]}),
+    "MessageAttributes": {
+        "type": {"DataType": "String", "StringValue": "order"},
+        "action": {"DataType": "String", "StringValue": "create"},
+    },
+}
+
+
+def placeholder_tracker(
+    func: collections.abc.Callable[..., typing.Any],
+) -> collections.abc.Callable[..., typing.Any]:
+    """Pass-through wrapper which tracker used to be by default."""
+
+    @functools.wraps(func)
+    def wrapper_tracker(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        return func(*args, **kwargs)
+
+    return wrapper_tracker
+
+
+def configure(tracker: metrics.instrumentation.Tracker | None) -> None:
+    """Enable all sites with given tracker or disable them."""
+    registry = metrics.instrumentation.registry
+    registry.disable()
+    if tracker:
+        registry.set_tracker(tracker)
+        registry.enable()
+
+
+def run() -> None:
+    """Run benchmark and print results.
+
+    Configurations are measured in turns, so noise affects them equally,
+    and the best result of each one is taken.
+
+    """
+    configurations = {
+        "disabled": None,
+        "pass-through wrappers": placeholder_tracker,
+        "built-in tracker": metrics.builtin.tracker,
+    }
+    site = metrics.instrumentation.registry.sites[
+        f"{parsers.SQSParser.__module__}:SQSParser.parse"
+    ]
+    configure(None)
+    # No wrapper is left between callers and the original function
+    if vars(parsers.SQSParser)["parse"].__func__ is not site.func:
+        raise RuntimeError("Disabled site is still wrapped")
+    parse = functools.partial(Parser.parse, RAW_MESSAGE)  # type: ignore
+    timeit.timeit(parse, number=ROUNDS)  # warm up
+    results = dict.fromkeys(configurations, float("inf"))
+    for _ in range(REPEATS):
+        for name, tracker in configurations.items():
+            configure(tracker)
+            results[name] = min(
+                results[name],
+                timeit.timeit(parse, number=ROUNDS) / ROUNDS * 1_000_000,
+            )
+    configure(None)
+    print(f"{'tracking':<24} {'parse, us':>10} {'overhead, us':>13}")
+    for name, result in results.items():
+        print(
+            f"{name:<24} {result:>10.3f} "
+            f"{result - results['disabled']:>13.3f}",
+        )
+
+
+if __name__ == "__main__":
+    run()
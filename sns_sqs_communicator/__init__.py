@@ -1,16 +1,24 @@
 import contextlib
 
 from . import (
+    batching,
+    claim_check,
     clients,
+    compression,
     fifo_attributes_creator,
+    lifecycle,
     local,
     messages,
+    outbox,
     parsers,
+    prepared,
     processing,
+    publishers,
     queue,
     schemas,
     sqs_poll_worker,
     topic,
+    tracing,
     types,
 )
 
@@ -20,18 +28,30 @@ with contextlib.suppress(ImportError):
 with contextlib.suppress(ImportError):
     from . import sentry
 
+with contextlib.suppress(ImportError):
+    from . import otel
+
 __all__ = (
+    "batching",
+    "claim_check",
     "clients",
+    "compression",
     "fifo_attributes_creator",
     "sqs_poll_worker",
     "messages",
+    "outbox",
     "parsers",
+    "prepared",
     "processing",
+    "publishers",
     "queue",
     "schemas",
     "topic",
+    "tracing",
     "types",
+    "lifecycle",
     "local",
     "testing",
     "sentry",
+    "otel",
 )
@@ -0,0 +1,126 @@
+import collections.abc
+import typing
+
+import anyio
+
+from . import metrics, prepared
+
+# AWS limit for number of entries in single batch request
+MAX_BATCH_ENTRIES = 10
+# AWS limit for total size (in bytes) of all entries of single batch request
+MAX_BATCH_SIZE = 256 * 1024
+
+EntryT = typing.TypeVar("EntryT")
+
+# Sends batch of entries keyed by entry id, responses of SQS
+# SendMessageBatch, DeleteMessageBatch and SNS PublishBatch share the same
+# format
+BatchSender: typing.TypeAlias = collections.abc.Callable[
+    [collections.abc.Mapping[str, EntryT]],
+    collections.abc.Awaitable[typing.Any],
+]
+
+
+class BatchEntryError(Exception):
+    """Exception when AWS rejects entry of batch."""
+
+    def __init__(
+        self,
+        code: str,
+        message: str,
+        sender_fault: bool = False,
+    ) -> None:
+        super().__init__(f"{code}: {message}")
+        self.code = code
+        self.message = message
+        # Entry rejected due to sender's fault would fail again
+        self.sender_fault = sender_fault
+
+
+def get_message_size(prepared_message: prepared.PreparedMessage) -> int:
+    """Calculate size of message the same way as AWS does.
+
+    AWS counts body along with names, types and values of attributes.
+
+    """
+    return len(prepared_message.body.encode()) + sum(
+        len(key) + len("String") + len(value)
+        for key, value in prepared_message.metadata.items()
+    )
+
+
+def split_into_batches(
+    prepared_messages: collections.abc.Sequence[prepared.PreparedMessage],
+) -> list[dict[str, prepared.PreparedMessage]]:
+    """Split messages into batches which fit into AWS limits.
+
+    Messages are keyed by their index, so entry ids are unique across all
+    batches. Message which alone exceeds size limit gets its own batch, so
+    AWS reports error for it.
+
+    """
+    batches: list[dict[str, prepared.PreparedMessage]] = []
+    batch: dict[str, prepared.PreparedMessage] = {}
+    batch_size = 0
+    for index, prepared_message in enumerate(prepared_messages):
+        message_size = get_message_size(prepared_message)
+        if batch and (
+            len(batch) == MAX_BATCH_ENTRIES
+            or batch_size + message_size > MAX_BATCH_SIZE
+        ):
+            batches.append(batch)
+            batch, batch_size = {}, 0
+        batch[str(index)] = prepared_message
+        batch_size += message_size
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+@metrics.tracker
+async def send_batch(
+    send: BatchSender[EntryT],
+    prepared_messages: collections.abc.Mapping[str, EntryT],
+    max_retries: int = 3,
+    retry_delay_seconds: float = 0.1,
+) -> dict[str, str | Exception]:
+    """Send batch retrying entries failed on AWS side.
+
+    Returns message id (empty for deletions) or error for each entry id.
+    Entries rejected due to sender's fault are not retried, since they
+    would fail again.
+
+    """
+    results: dict[str, str | Exception] = {}
+    pending = dict(prepared_messages)
+    for attempt in range(max_retries + 1):
+        if attempt:
+            await anyio.sleep(retry_delay_seconds * 2 ** (attempt - 1))
+        try:
+            response = await send(pending)
+        except Exception as exception:  # noqa: BLE001
+            results.update(dict.fromkeys(pending, exception))
+            return results
+        for successful in response.get("Successful", []):
+            del pending[successful["Id"]]
+            results[successful["Id"]] = successful.get("MessageId", "")
+        for failed in response.get("Failed", []):
+            if failed["SenderFault"] or attempt == max_retries:
+                del pending[failed["Id"]]
+                results[failed["Id"]] = BatchEntryError(
+                    code=failed["Code"],
+                    message=failed.get("Message", ""),
+                    sender_fault=failed["SenderFault"],
+                )
+        if not pending:
+            break
+    results.update(
+        dict.fromkeys(
+            pending,
+            BatchEntryError(
+                code="MissingResult",
+                message="No result has been returned for entry",
+            ),
+        ),
+    )
+    return results
@@ -0,0 +1,264 @@
+import collections
+import collections.abc
+import contextlib
+import dataclasses
+import logging
+import pathlib
+import threading
+import typing
+import uuid
+
+import anyio
+
+import mypy_boto3_s3
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# Name of message attribute which holds key of offloaded body
+CLAIM_CHECK_ATTRIBUTE = "claim-check"
+
+
+class ClaimCheckNotConfiguredError(Exception):
+    """Exception when message has claim check, but no config is set."""
+
+
+class InvalidClaimCheckKeyError(Exception):
+    """Exception when claim check key isn't one generated on offloading."""
+
+
+def validate_key(key: str) -> str:
+    """Check that key is UUID generated on offloading.
+
+    Keys come from message attributes, so anything else could point
+    outside of store.
+
+    """
+    try:
+        is_valid = str(uuid.UUID(key)) == key
+    except ValueError:
+        is_valid = False
+    if not is_valid:
+        raise InvalidClaimCheckKeyError(f"Invalid claim check key {key!r}")
+    return key
+
+
+class BlobStoreProtocol(typing.Protocol):
+    """Protocol for storages of offloaded message bodies."""
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store data under key."""
+        ...  # pragma: no cover
+
+    def get(self, key: str) -> bytes:
+        """Retrieve data stored under key."""
+        ...  # pragma: no cover
+
+    def delete(self, key: str) -> None:
+        """Delete data stored under key."""
+        ...  # pragma: no cover
+
+
+@dataclasses.dataclass(frozen=True)
+class LocalBlobStore:
+    """Blob store which keeps bodies in local directory.
+
+    Useful for local development and testing without S3.
+
+    """
+
+    directory: pathlib.Path
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store data under key."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.get_path(key).write_bytes(data)
+
+    def get(self, key: str) -> bytes:
+        """Retrieve data stored under key."""
+        return self.get_path(key).read_bytes()
+
+    def delete(self, key: str) -> None:
+        """Delete data stored under key."""
+        self.get_path(key).unlink(missing_ok=True)
+
+    def get_path(self, key: str) -> pathlib.Path:
+        """Get path of key checking that it stays inside of directory."""
+        directory = self.directory.resolve()
+        path = (directory / key).resolve()
+        if path.parent != directory:
+            raise InvalidClaimCheckKeyError(
+                f"Claim check key {key!r} points outside of {directory}",
+            )
+        return path
+
+
+@dataclasses.dataclass(frozen=True)
+class S3BlobStore:
+    """Blob store which keeps bodies in S3 compatible storage."""
+
+    client: mypy_boto3_s3.S3Client
+    bucket: str
+    prefix: str = ""
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store data under key."""
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=f"{self.prefix}{key}",
+            Body=data,
+        )
+
+    def get(self, key: str) -> bytes:
+        """Retrieve data stored under key."""
+        return self.client.get_object(
+            Bucket=self.bucket,
+            Key=f"{self.prefix}{key}",
+        )["Body"].read()
+
+    def delete(self, key: str) -> None:
+        """Delete data stored under key."""
+        self.client.delete_object(
+            Bucket=self.bucket,
+            Key=f"{self.prefix}{key}",
+        )
+
+
+@dataclasses.dataclass
+class ClaimCheckConfig:
+    """Configuration of claim check offloading.
+
+    Messages with size (body and attributes, in bytes) above `threshold` are
+    put into `store` and only the key is sent. Default threshold leaves room
+    below 256 KiB limit of SQS and SNS.
+
+    If topic is subscribed by several queues, set `delete_after_ack` to
+    `False` and expire bodies in store (for example, with S3 lifecycle rules)
+    instead, since the first consumer would delete body for the rest of them.
+
+    Retrieved bodies are kept in LRU cache of up to `cache_max_bytes` bytes
+    until they are released. Parsers retrieve bodies synchronously, so
+    bodies of messages being processed are fetched beforehand in thread by
+    `prefetch`.
+
+    """
+
+    store: BlobStoreProtocol
+    threshold: int = 192 * 1024
+    cache_max_bytes: int = 16 * 1024 * 1024
+    delete_after_ack: bool = True
+    _cache: collections.OrderedDict[str, bytes] = dataclasses.field(
+        init=False,
+        repr=False,
+        compare=False,
+        default_factory=collections.OrderedDict,
+    )
+    _cached_bytes: int = dataclasses.field(
+        init=False,
+        repr=False,
+        compare=False,
+        default=0,
+    )
+    # Bodies of messages being processed keyed by claim checks
+    _prefetched: dict[str, bytes] = dataclasses.field(
+        init=False,
+        repr=False,
+        compare=False,
+        default_factory=dict,
+    )
+    _lock: threading.Lock = dataclasses.field(
+        init=False,
+        repr=False,
+        compare=False,
+        default_factory=threading.Lock,
+    )
+
+    @metrics.tracker
+    def offload(
+        self,
+        body: str,
+        metadata: dict[str, str],
+    ) -> tuple[str, dict[str, str]]:
+        """Put body into store if message is too large."""
+        encoded_body = body.encode()
+        message_size = len(encoded_body) + sum(
+            len(key) + len(value) for key, value in metadata.items()
+        )
+        if message_size < self.threshold:
+            return body, metadata
+        key = str(uuid.uuid4())
+        self.store.put(key, encoded_body)
+        return key, {**metadata, CLAIM_CHECK_ATTRIBUTE: key}
+
+    @metrics.tracker
+    def retrieve(self, key: str) -> str:
+        """Retrieve offloaded body from store."""
+        validate_key(key)
+        with self._lock:
+            if (data := self._cache.get(key)) is not None:
+                self._cache.move_to_end(key)
+                return data.decode()
+            data = self._prefetched.get(key)
+        if data is None:
+            data = self.store.get(key)
+        self.cache(key, data)
+        return data.decode()
+
+    @contextlib.asynccontextmanager
+    async def prefetch(self, key: str) -> collections.abc.AsyncIterator[None]:
+        """Fetch body in thread keeping it until context is exited.
+
+        Invalid keys are left to be reported on retrieving.
+
+        """
+        try:
+            validate_key(key)
+        except InvalidClaimCheckKeyError:
+            is_cached = True
+        else:
+            with self._lock:
+                is_cached = key in self._cache or key in self._prefetched
+        if is_cached:
+            yield
+            return
+        data = await anyio.to_thread.run_sync(self.store.get, key)
+        with self._lock:
+            self._prefetched[key] = data
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._prefetched.pop(key, None)
+
+    def cache(self, key: str, data: bytes) -> None:
+        """Cache retrieved body evicting least recently used ones."""
+        if len(data) > self.cache_max_bytes:
+            return
+        with self._lock:
+            if key in self._cache:
+                return
+            self._cache[key] = data
+            self._cached_bytes += len(data)
+            while self._cached_bytes > self.cache_max_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._cached_bytes -= len(evicted)
+
+    def forget(self, key: str) -> None:
+        """Drop body from cache."""
+        with self._lock:
+            if (data := self._cache.pop(key, None)) is not None:
+                self._cached_bytes -= len(data)
+
+    @metrics.tracker
+    def release(self, keys: collections.abc.Iterable[str]) -> None:
+        """Delete offloaded bodies from store skipping invalid keys."""
+        for key in keys:
+            try:
+                validate_key(key)
+            except InvalidClaimCheckKeyError:
+                logger.warning(f"Skipped release of claim check {key!r}")
+                continue
+            self.forget(key)
+            if self.delete_after_ack:
+                self.store.delete(key)
@@ -1,9 +1,21 @@
-from .sns import SNSClient, get_boto3_sns_client
-from .sqs import SQSClient, get_boto3_sqs_client
+from . import cache, credentials, factory, hedging, retry
+from .credentials import CachingAccessKeyGetter
+from .factory import ClientConfig
+from .sns import SNSClient, get_boto3_sns_client, get_subscription_attributes
+from .sqs import ResolvedQueue, SQSClient, get_boto3_sqs_client
 
 __all__ = (
+    "CachingAccessKeyGetter",
+    "ClientConfig",
+    "ResolvedQueue",
     "SQSClient",
     "get_boto3_sqs_client",
     "SNSClient",
     "get_boto3_sns_client",
+    "get_subscription_attributes",
+    "cache",
+    "credentials",
+    "factory",
+    "hedging",
+    "retry",
 )
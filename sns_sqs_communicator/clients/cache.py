@@ -0,0 +1,40 @@
+import dataclasses
+import time
+import typing
+
+KeyT = typing.TypeVar("KeyT")
+ValueT = typing.TypeVar("ValueT")
+
+
+@dataclasses.dataclass
+class TTLCache(typing.Generic[KeyT, ValueT]):
+    """Cache which forgets values after `ttl_seconds`."""
+
+    ttl_seconds: float = 5 * 60
+    _entries: dict[KeyT, tuple[float, ValueT]] = dataclasses.field(
+        init=False,
+        repr=False,
+        default_factory=dict,
+    )
+
+    def get(self, key: KeyT) -> ValueT | None:
+        """Get value if it's cached and not expired."""
+        if not (entry := self._entries.get(key)):
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            self._entries.pop(key, None)
+            return None
+        return value
+
+    def set(self, key: KeyT, value: ValueT) -> None:
+        """Cache value."""
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def invalidate(self, key: KeyT) -> None:
+        """Forget cached value."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Forget all cached values."""
+        self._entries.clear()
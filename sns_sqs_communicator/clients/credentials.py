@@ -0,0 +1,96 @@
+import dataclasses
+import logging
+import random
+import threading
+import time
+
+import botocore.credentials
+
+from .. import metrics, types
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class CachingAccessKeyGetter:
+    """Access key getter which caches credentials of wrapped getter.
+
+    Credentials are refreshed in background thread `refresh_ahead_seconds`
+    before `ttl_seconds` pass, so callers get cached credentials without
+    waiting for STS or metadata lookups. Refresh time is shifted by random
+    jitter, so processes started together don't refresh all at once. Only
+    first call and calls after credentials expired (for example, because of
+    failed refreshes) wait for wrapped getter.
+
+    Usage:
+        ```python
+        access_key_getter = CachingAccessKeyGetter(get_credentials)
+        sqs_client = get_boto3_sqs_client(access_key_getter)
+        ```
+
+    """
+
+    access_key_getter: types.AccessKeyGetter
+    # Should be less than lifetime of credentials returned by getter
+    ttl_seconds: float = 15 * 60
+    refresh_ahead_seconds: float = 5 * 60
+    jitter_seconds: float = 60
+    _credentials: botocore.credentials.Credentials | None = dataclasses.field(
+        init=False,
+        repr=False,
+        default=None,
+    )
+    _expires_at: float = dataclasses.field(init=False, repr=False, default=0)
+    _refresh_at: float = dataclasses.field(init=False, repr=False, default=0)
+    _is_refreshing: bool = dataclasses.field(
+        init=False,
+        repr=False,
+        default=False,
+    )
+    _lock: threading.Lock = dataclasses.field(
+        init=False,
+        repr=False,
+        default_factory=threading.Lock,
+    )
+
+    @metrics.tracker
+    def __call__(self) -> botocore.credentials.Credentials:
+        """Get cached credentials refreshing them if needed."""
+        now = time.monotonic()
+        with self._lock:
+            credentials = self._credentials
+            if credentials and now < self._expires_at:
+                if now >= self._refresh_at and not self._is_refreshing:
+                    self._is_refreshing = True
+                    threading.Thread(
+                        target=self.refresh_in_background,
+                        name=f"{self.__class__.__name__}-refresh",
+                        daemon=True,
+                    ).start()
+                return credentials
+        return self.refresh()
+
+    @metrics.tracker
+    def refresh(self) -> botocore.credentials.Credentials:
+        """Fetch credentials from wrapped getter and cache them."""
+        fetched_at = time.monotonic()
+        credentials = self.access_key_getter()
+        with self._lock:
+            self._credentials = credentials
+            self._expires_at = fetched_at + self.ttl_seconds
+            self._refresh_at = (
+                self._expires_at
+                - self.refresh_ahead_seconds
+                - random.uniform(0, self.jitter_seconds)  # noqa: S311
+            )
+        return credentials
+
+    def refresh_in_background(self) -> None:
+        """Refresh credentials keeping cached ones on failure."""
+        try:
+            self.refresh()
+        except Exception:
+            logger.exception("Failed to refresh credentials")
+        finally:
+            with self._lock:
+                self._is_refreshing = False
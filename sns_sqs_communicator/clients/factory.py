@@ -0,0 +1,135 @@
+import dataclasses
+import functools
+import threading
+import typing
+
+import anyio.to_thread
+
+import boto3
+import botocore.config
+import botocore.credentials
+
+# Number of threads anyio runs sync calls in by default
+DEFAULT_THREADS_LIMIT = 40
+
+
+def get_default_pool_size() -> int:
+    """Get pool size matching number of threads boto3 calls are run in.
+
+    Clients run boto3 calls in anyio threads, so there is no reason to have
+    more connections than threads, while fewer ones make calls wait for
+    free connection.
+
+    """
+    try:
+        return int(
+            anyio.to_thread.current_default_thread_limiter().total_tokens,
+        )
+    except RuntimeError:
+        return DEFAULT_THREADS_LIMIT
+
+
+@dataclasses.dataclass(frozen=True)
+class ClientConfig:
+    """Settings of connections of boto3 clients.
+
+    Settings which aren't set keep defaults of botocore.
+
+    """
+
+    # Defaults to number of threads used to run boto3 calls
+    max_pool_connections: int | None = None
+    tcp_keepalive: bool | None = None
+    connect_timeout: float | None = None
+    # Should be longer than wait time of long polling
+    read_timeout: float | None = None
+    retry_mode: typing.Literal["legacy", "standard", "adaptive"] | None = None
+    max_attempts: int | None = None
+
+    def resolve(self) -> typing.Self:
+        """Fill settings which depend on current environment."""
+        if self.max_pool_connections:
+            return self
+        return dataclasses.replace(
+            self,
+            max_pool_connections=get_default_pool_size(),
+        )
+
+    def to_botocore_config(self) -> botocore.config.Config:
+        """Convert into botocore config."""
+        resolved = self.resolve()
+        options: dict[str, typing.Any] = {
+            "max_pool_connections": resolved.max_pool_connections,
+        }
+        for option in ("tcp_keepalive", "connect_timeout", "read_timeout"):
+            if (value := getattr(self, option)) is not None:
+                options[option] = value
+        retries: dict[str, typing.Any] = {}
+        if self.retry_mode is not None:
+            retries["mode"] = self.retry_mode
+        if self.max_attempts is not None:
+            retries["max_attempts"] = self.max_attempts
+        if retries:
+            options["retries"] = retries
+        return botocore.config.Config(**options)
+
+
+# boto3 sessions aren't thread-safe, so clients are created under lock
+_lock = threading.Lock()
+
+
+@functools.cache
+def get_session() -> boto3.session.Session:
+    """Get session shared by all clients.
+
+    Session keeps loaded service models, so they are loaded only once.
+
+    """
+    return boto3.session.Session()
+
+
+def get_client(
+    service_name: typing.Literal["sqs", "sns"],
+    credentials: botocore.credentials.Credentials,
+    region: str | None = None,
+    endpoint_url: str | None = None,
+    config: ClientConfig | None = None,
+) -> typing.Any:
+    """Get cached boto3 client for credentials, region and endpoint.
+
+    Config is resolved on every call, so clients follow changes of number
+    of threads boto3 calls are run in.
+
+    """
+    with _lock:
+        return _get_cached_client(
+            service_name=service_name,
+            access_key=credentials.access_key,
+            secret_key=credentials.secret_key,
+            token=credentials.token,
+            region=region,
+            endpoint_url=endpoint_url,
+            config=(config or ClientConfig()).resolve(),
+        )
+
+
+@functools.lru_cache(maxsize=32)
+def _get_cached_client(
+    service_name: typing.Literal["sqs", "sns"],
+    access_key: str,
+    secret_key: str,
+    token: str | None,
+    region: str | None,
+    endpoint_url: str | None,
+    config: ClientConfig,
+) -> typing.Any:
+    """Create boto3 client."""
+    return get_session().client(
+        service_name=service_name,
+        region_name=region,
+        aws_session_token=token,
+        aws_access_key_id=access_key,
+        aws_secret_access_key=secret_key,
+        endpoint_url=endpoint_url,
+        config=config.to_botocore_config(),
+    )
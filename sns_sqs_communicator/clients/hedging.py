@@ -0,0 +1,231 @@
+import collections
+import collections.abc
+import dataclasses
+import logging
+import threading
+import time
+import typing
+
+import anyio
+
+from .. import metrics
+
+logger = logging.getLogger(__name__)
+
+ReturnT = typing.TypeVar("ReturnT")
+ParamT = typing.ParamSpec("ParamT")
+
+
+class DiscardableCall(typing.Generic[ParamT, ReturnT]):
+    """Sync call which result is cleaned up if its caller is gone.
+
+    Calls run in threads are abandoned on cancellation, so their results
+    never reach callers. Thread of such call passes its result to
+    `on_discarded` itself once it finishes, and results which have
+    finished right before cancellation are passed to it by `discard`.
+
+    Usage:
+        ```python
+        call = DiscardableCall(client.receive_message, on_discarded=release)
+        try:
+            return await anyio.to_thread.run_sync(call, abandon_on_cancel=True)
+        except BaseException:
+            await call.discard()
+            raise
+        ```
+
+    """
+
+    def __init__(
+        self,
+        func: collections.abc.Callable[ParamT, ReturnT],
+        on_discarded: collections.abc.Callable[[ReturnT], typing.Any],
+    ) -> None:
+        self.func = func
+        self.on_discarded = on_discarded
+        self.__name__ = getattr(func, "__name__", "")
+        self._results: list[ReturnT] = []
+        self._is_discarded = False
+        self._lock = threading.Lock()
+
+    def __call__(self, *args: ParamT.args, **kwargs: ParamT.kwargs) -> ReturnT:
+        """Call function cleaning up result if it's been discarded."""
+        result = self.func(*args, **kwargs)
+        with self._lock:
+            if not self._is_discarded:
+                self._results.append(result)
+                return result
+        self._clean_up([result])
+        return result
+
+    async def discard(self) -> None:
+        """Clean up results which won't reach caller."""
+        with self._lock:
+            self._is_discarded = True
+            results, self._results = self._results, []
+        if results:
+            with anyio.CancelScope(shield=True):
+                await anyio.to_thread.run_sync(self._clean_up, results)
+
+    def _clean_up(self, results: list[ReturnT]) -> None:
+        """Pass results to callback logging its failures."""
+        for result in results:
+            try:
+                self.on_discarded(result)
+            except Exception:
+                logger.exception(
+                    "Failed to clean up result of discarded call",
+                )
+
+
+@dataclasses.dataclass
+class HedgingPolicy:
+    """Policy of hedging slow idempotent calls.
+
+    When call takes longer than `quantile` of recent latencies of the same
+    operation, second identical call is made and whichever succeeds first
+    wins. Losing call is cancelled, so no call outlives its caller. If it
+    completes anyway, before cancellation reaches it, its result is passed
+    to `on_discarded` callback, so results which hold resources (like
+    received messages) could be released. Results of sync calls abandoned
+    in threads could be cleaned up by `DiscardableCall`.
+
+    Latencies of long polling depend on queue traffic, so hedging receives
+    is mostly useful with short wait time.
+
+    Usage:
+        ```python
+        sqs_client = SQSClient(
+            client=get_boto3_sqs_client(...),
+            hedging_policy=HedgingPolicy(),
+        )
+        ```
+
+    """
+
+    quantile: float = 0.95
+    # Number of recent latencies of operation to estimate quantile from
+    window_size: int = 100
+    # Until enough latencies are recorded, `initial_delay_seconds` is used
+    min_samples: int = 20
+    initial_delay_seconds: float = 1.0
+    min_delay_seconds: float = 0.01
+    _latencies: dict[str, collections.deque[float]] = dataclasses.field(
+        init=False,
+        repr=False,
+        default_factory=dict,
+    )
+    _lock: threading.Lock = dataclasses.field(
+        init=False,
+        repr=False,
+        default_factory=threading.Lock,
+    )
+
+    def record_latency(self, operation: str, seconds: float) -> None:
+        """Remember latency of successful call."""
+        with self._lock:
+            if operation not in self._latencies:
+                self._latencies[operation] = collections.deque(
+                    maxlen=self.window_size,
+                )
+            self._latencies[operation].append(seconds)
+
+    def get_delay(self, operation: str) -> float:
+        """Get delay after which call of operation is hedged."""
+        with self._lock:
+            latencies = sorted(self._latencies.get(operation, ()))
+        if len(latencies) < self.min_samples:
+            return self.initial_delay_seconds
+        index = min(len(latencies) - 1, int(len(latencies) * self.quantile))
+        return max(self.min_delay_seconds, latencies[index])
+
+    @metrics.tracker
+    async def call(
+        self,
+        func: collections.abc.Callable[
+            [],
+            collections.abc.Awaitable[ReturnT],
+        ],
+        operation: str,
+        on_discarded: collections.abc.Callable[
+            [ReturnT],
+            collections.abc.Awaitable[typing.Any],
+        ]
+        | None = None,
+    ) -> ReturnT:
+        """Call function hedging it if it's slow.
+
+        If both calls fail, error of the last failed one is raised.
+
+        """
+        results: dict[int, ReturnT] = {}
+        errors: dict[int, Exception] = {}
+        first_failed = anyio.Event()
+        async with anyio.create_task_group() as task_group:
+
+            async def attempt(index: int) -> None:
+                try:
+                    result = await self._timed(func, operation)
+                except Exception as error:  # noqa: BLE001
+                    errors[index] = error
+                    if index == 0:
+                        first_failed.set()
+                    return
+                if results:
+                    await self._discard(result, on_discarded)
+                    return
+                results[index] = result
+                task_group.cancel_scope.cancel()
+
+            task_group.start_soon(attempt, 0)
+            with anyio.move_on_after(self.get_delay(operation)):
+                await first_failed.wait()
+            if not errors:
+                metrics.counter(
+                    "sns_sqs_communicator.client.hedges",
+                    operation=operation,
+                )
+                task_group.start_soon(attempt, 1)
+        if not results:
+            raise list(errors.values())[-1]
+        ((index, result),) = results.items()
+        if index:
+            metrics.counter(
+                "sns_sqs_communicator.client.hedge_wins",
+                operation=operation,
+            )
+        return result
+
+    async def _timed(
+        self,
+        func: collections.abc.Callable[
+            [],
+            collections.abc.Awaitable[ReturnT],
+        ],
+        operation: str,
+    ) -> ReturnT:
+        """Call function recording its latency."""
+        started_at = time.monotonic()
+        result = await func()
+        self.record_latency(operation, time.monotonic() - started_at)
+        return result
+
+    async def _discard(
+        self,
+        result: ReturnT,
+        on_discarded: collections.abc.Callable[
+            [ReturnT],
+            collections.abc.Awaitable[typing.Any],
+        ]
+        | None,
+    ) -> None:
+        """Pass result of losing call to callback."""
+        if not on_discarded:
+            return
+        with anyio.CancelScope(shield=True):
+            try:
+                await on_discarded(result)
+            except Exception:
+                logger.exception(
+                    "Failed to clean up result of discarded call",
+                )
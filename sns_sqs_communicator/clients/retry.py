@@ -0,0 +1,246 @@
+import collections.abc
+import dataclasses
+import enum
+import random
+import threading
+import time
+import typing
+
+import anyio
+
+import botocore.exceptions
+
+from .. import metrics
+
+ReturnT = typing.TypeVar("ReturnT")
+
+# Error codes AWS returns when it throttles requests
+THROTTLING_ERROR_CODES = frozenset(
+    (
+        "Throttling",
+        "ThrottlingException",
+        "ThrottledException",
+        "RequestThrottled",
+        "RequestThrottledException",
+        "TooManyRequestsException",
+        "RequestLimitExceeded",
+        "KMSThrottlingException",
+        "KMS.ThrottlingException",
+    ),
+)
+# Error codes of failures on AWS side which could pass on retry
+TRANSIENT_ERROR_CODES = frozenset(
+    (
+        "InternalError",
+        "InternalFailure",
+        "ServiceUnavailable",
+        "RequestTimeout",
+        "RequestTimeoutException",
+    ),
+)
+
+
+class ErrorKind(enum.StrEnum):
+    """Kind of error defining whether call should be retried."""
+
+    throttling = "throttling"
+    transient = "transient"
+    fatal = "fatal"
+
+
+def classify_error(error: Exception) -> ErrorKind:
+    """Classify error raised by boto3 call."""
+    if isinstance(error, botocore.exceptions.ClientError):
+        error_code = error.response.get("Error", {}).get("Code", "")
+        if error_code in THROTTLING_ERROR_CODES:
+            return ErrorKind.throttling
+        if error_code in TRANSIENT_ERROR_CODES:
+            return ErrorKind.transient
+        return ErrorKind.fatal
+    if isinstance(
+        error,
+        (
+            botocore.exceptions.ConnectionError,
+            botocore.exceptions.HTTPClientError,
+        ),
+    ):
+        return ErrorKind.transient
+    return ErrorKind.fatal
+
+
+@dataclasses.dataclass
+class RetryBudget:
+    """Token bucket which limits share of retried calls.
+
+    Each retry spends `retry_cost` tokens and each successful call returns
+    `success_refund` tokens, so once AWS fails most of calls, they stop
+    being retried instead of multiplying the load.
+
+    """
+
+    capacity: int = 500
+    retry_cost: int = 5
+    success_refund: int = 1
+    _tokens: int = dataclasses.field(init=False, repr=False)
+    _lock: threading.Lock = dataclasses.field(
+        init=False,
+        repr=False,
+        default_factory=threading.Lock,
+    )
+
+    def __post_init__(self) -> None:
+        """Start with full budget."""
+        self._tokens = self.capacity
+
+    def acquire(self) -> bool:
+        """Spend tokens for retry if budget allows it."""
+        with self._lock:
+            if self._tokens < self.retry_cost:
+                return False
+            self._tokens -= self.retry_cost
+            return True
+
+    def refund(self) -> None:
+        """Return tokens after successful call."""
+        with self._lock:
+            self._tokens = min(
+                self.capacity,
+                self._tokens + self.success_refund,
+            )
+
+
+@dataclasses.dataclass
+class AdaptiveRateLimiter:
+    """Client-side limiter of request rate which adapts to throttling.
+
+    Limiter doesn't restrict calls until first throttling. After that,
+    rate is cut by `decrease_factor` on each throttling and grows by
+    `increase_step` requests per second on each successful call.
+
+    """
+
+    min_rate: float = 1.0
+    max_rate: float = 1000.0
+    decrease_factor: float = 0.5
+    increase_step: float = 1.0
+    # Current limit of requests per second, `None` means no limit
+    rate: float | None = None
+    _next_slot: float = dataclasses.field(init=False, repr=False, default=0)
+    _lock: threading.Lock = dataclasses.field(
+        init=False,
+        repr=False,
+        default_factory=threading.Lock,
+    )
+
+    async def acquire(self) -> None:
+        """Wait until request could be sent."""
+        with self._lock:
+            if self.rate is None:
+                return
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1 / self.rate
+        if (delay := slot - now) > 0:
+            await anyio.sleep(delay)
+
+    def on_throttling(self) -> None:
+        """Slow down after AWS has throttled request."""
+        with self._lock:
+            rate = self.rate or self.max_rate
+            self.rate = max(self.min_rate, rate * self.decrease_factor)
+
+    def on_success(self) -> None:
+        """Speed up after successful request."""
+        with self._lock:
+            if self.rate is None:
+                return
+            self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+
+@dataclasses.dataclass
+class RetryPolicy:
+    """Policy of retrying AWS calls.
+
+    Throttled and transient failures are retried with exponential backoff
+    with full jitter, while retry budget allows it. Optional rate limiter
+    slows down all calls made with this policy when AWS throttles them, so
+    policy should be shared by clients which share AWS limits.
+
+    Usage:
+        ```python
+        sqs_client = SQSClient(
+            client=get_boto3_sqs_client(...),
+            retry_policy=RetryPolicy(rate_limiter=AdaptiveRateLimiter()),
+        )
+        ```
+
+    """
+
+    max_attempts: int = 3
+    base_delay_seconds: float = 0.05
+    max_delay_seconds: float = 5.0
+    budget: RetryBudget = dataclasses.field(default_factory=RetryBudget)
+    rate_limiter: AdaptiveRateLimiter | None = None
+
+    @metrics.tracker
+    async def call(
+        self,
+        func: collections.abc.Callable[[], ReturnT],
+        operation: str,
+    ) -> ReturnT:
+        """Run sync function in thread retrying failures."""
+        attempt = 1
+        while True:
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
+            try:
+                result = await anyio.to_thread.run_sync(
+                    func,
+                    abandon_on_cancel=True,
+                )
+            except Exception as error:
+                error_kind = self.handle_error(error, operation)
+                if (
+                    error_kind == ErrorKind.fatal
+                    or attempt >= self.max_attempts
+                    or not self.budget.acquire()
+                ):
+                    raise
+                metrics.counter(
+                    "sns_sqs_communicator.client.retries",
+                    operation=operation,
+                    error_kind=error_kind.value,
+                )
+                await anyio.sleep(self.get_delay(attempt))
+                attempt += 1
+                continue
+            self.budget.refund()
+            if self.rate_limiter:
+                self.rate_limiter.on_success()
+            return result
+
+    def handle_error(
+        self,
+        error: Exception,
+        operation: str,
+    ) -> ErrorKind:
+        """Classify error and slow down if it's throttling."""
+        error_kind = classify_error(error)
+        if error_kind == ErrorKind.throttling:
+            metrics.counter(
+                "sns_sqs_communicator.client.throttles",
+                operation=operation,
+            )
+            if self.rate_limiter:
+                self.rate_limiter.on_throttling()
+        return error_kind
+
+    def get_delay(self, attempt: int) -> float:
+        """Get jittered delay before next attempt."""
+        return random.uniform(  # noqa: S311
+            0,
+            min(
+                self.max_delay_seconds,
+                self.base_delay_seconds * 2 ** (attempt - 1),
+            ),
+        )
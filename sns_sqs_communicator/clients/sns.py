@@ -6,10 +6,10 @@ import typing
 import anyio
 import ujson
 
-import boto3
 import mypy_boto3_sns.type_defs
 
 from .. import types
+from . import factory, retry
 
 ReturnT = typing.TypeVar("ReturnT")
 ParamT = typing.ParamSpec("ParamT")
@@ -19,28 +19,45 @@ def get_boto3_sns_client(
     access_key_getter: types.AccessKeyGetter,
     sns_endpoint_url_getter: types.AWSEndpointUrlGetter | None = None,
     region: str | None = None,
+    config: factory.ClientConfig | None = None,
 ) -> mypy_boto3_sns.SNSClient:
-    """Prepare boto3 sns client for usage."""
+    """Prepare boto3 sns client for usage.
+
+    Clients are cached, so it's cheap to call it for every use.
+
+    """
     endpoint_url = None
     if sns_endpoint_url_getter:
         endpoint_url = sns_endpoint_url_getter()
-    credentials = access_key_getter()
-    return boto3.client(
-        service_name="sns",  # type: ignore
-        region_name=region,
-        aws_session_token=credentials.token,
-        aws_access_key_id=credentials.access_key,
-        aws_secret_access_key=credentials.secret_key,
+    return factory.get_client(
+        service_name="sns",
+        credentials=access_key_getter(),
+        region=region,
         endpoint_url=endpoint_url,
+        config=config,
     )
 
 
+def get_subscription_attributes(
+    raw_message_delivery: bool = False,
+) -> dict[str, str]:
+    """Prepare attributes for topic subscription."""
+    if raw_message_delivery:
+        return {"RawMessageDelivery": "true"}
+    return {}
+
+
 @dataclasses.dataclass(frozen=True)
 class SNSClient:
     """Client for interacting with SNS."""
 
     client: mypy_boto3_sns.SNSClient
     default_topic_arn: str = ""
+    # Policy is mutable, so it's left out of comparison and hash
+    retry_policy: retry.RetryPolicy | None = dataclasses.field(
+        default=None,
+        compare=False,
+    )
 
     async def run_sync_as_async(
         self,
@@ -48,15 +65,19 @@ class SNSClient:
         *args: ParamT.args,
         **kwargs: ParamT.kwargs,
     ) -> ReturnT:
-        """Make sync function run in async env."""
-        return await anyio.to_thread.run_sync(  # type: ignore
-            functools.partial(func, *args, **kwargs),
-        )
+        """Make sync function run in async env retrying failures."""
+        call = functools.partial(func, *args, **kwargs)
+        if self.retry_policy:
+            return await self.retry_policy.call(
+                call,
+                operation=getattr(func, "__name__", ""),
+            )
+        return await anyio.to_thread.run_sync(call)
 
     async def publish(
         self,
         message_attributes: types.SNSMessageAttributes,
-        body: dict[str, typing.Any],
+        body: dict[str, typing.Any] | str,
         topic_arn: str = "",
         **additional_attrs,
     ) -> mypy_boto3_sns.type_defs.PublishResponseTypeDef:
@@ -65,10 +86,24 @@ class SNSClient:
             self.client.publish,
             TopicArn=topic_arn or self.default_topic_arn,
             MessageAttributes=message_attributes,
-            Message=ujson.dumps(body),
+            Message=body if isinstance(body, str) else ujson.dumps(body),
             **additional_attrs,
         )
 
+    async def publish_batch(
+        self,
+        entries: collections.abc.Sequence[
+            mypy_boto3_sns.type_defs.PublishBatchRequestEntryTypeDef
+        ],
+        topic_arn: str = "",
+    ) -> mypy_boto3_sns.type_defs.PublishBatchResponseTypeDef:
+        """Publish up to 10 messages in topic in single request."""
+        return await self.run_sync_as_async(
+            self.client.publish_batch,
+            TopicArn=topic_arn or self.default_topic_arn,
+            PublishBatchRequestEntries=entries,
+        )
+
     async def create_topic(
         self,
         name: str,
@@ -86,13 +121,23 @@ class SNSClient:
         topic_arn: str,
         endpoint: str,
         protocol: str = "sqs",
+        raw_message_delivery: bool = False,
     ) -> mypy_boto3_sns.type_defs.SubscribeResponseTypeDef:
-        """Subscribe topic."""
+        """Subscribe topic.
+
+        With `raw_message_delivery` SNS delivers body and attributes as is,
+        without wrapping them into SNS envelope, so such messages should be
+        parsed with `SNSRawDeliveryParser`.
+
+        """
         return await self.run_sync_as_async(
             self.client.subscribe,
             TopicArn=topic_arn,
             Protocol=protocol,
             Endpoint=endpoint,
+            Attributes=get_subscription_attributes(
+                raw_message_delivery=raw_message_delivery,
+            ),
         )
 
     async def delete_topic(
@@ -6,11 +6,11 @@ import typing
 import anyio
 import ujson
 
-import boto3
 import mypy_boto3_sqs.literals
 import mypy_boto3_sqs.type_defs
 
-from .. import metrics, types
+from .. import lifecycle, metrics, types
+from . import cache, factory, hedging, retry
 
 ReturnT = typing.TypeVar("ReturnT")
 ParamT = typing.ParamSpec("ParamT")
@@ -20,22 +20,52 @@ def get_boto3_sqs_client(
     access_key_getter: types.AccessKeyGetter,
     sqs_endpoint_url_getter: types.AWSEndpointUrlGetter | None = None,
     region: str | None = None,
+    config: factory.ClientConfig | None = None,
 ) -> mypy_boto3_sqs.SQSClient:
-    """Prepare boto3 sqs client for usage."""
+    """Prepare boto3 sqs client for usage.
+
+    Clients are cached, so it's cheap to call it for every use.
+
+    """
     endpoint_url = None
     if sqs_endpoint_url_getter:
         endpoint_url = sqs_endpoint_url_getter()
-    credentials = access_key_getter()
-    return boto3.client(
-        service_name="sqs",  # type: ignore
-        region_name=region,
-        aws_session_token=credentials.token,
-        aws_access_key_id=credentials.access_key,
-        aws_secret_access_key=credentials.secret_key,
+    return factory.get_client(
+        service_name="sqs",
+        credentials=access_key_getter(),
+        region=region,
         endpoint_url=endpoint_url,
+        config=config,
     )
 
 
+def get_release_entries(
+    messages_to_release: collections.abc.Sequence[
+        mypy_boto3_sqs.type_defs.MessageTypeDef
+    ],
+) -> list[
+    mypy_boto3_sqs.type_defs.ChangeMessageVisibilityBatchRequestEntryTypeDef
+]:
+    """Build entries which make received messages visible right away."""
+    return [
+        {
+            "Id": str(idx),
+            "ReceiptHandle": message["ReceiptHandle"],
+            "VisibilityTimeout": 0,
+        }
+        for idx, message in enumerate(messages_to_release)
+        if "ReceiptHandle" in message
+    ]
+
+
+@dataclasses.dataclass(frozen=True)
+class ResolvedQueue:
+    """Url and arn of queue."""
+
+    url: str
+    arn: str
+
+
 @dataclasses.dataclass(frozen=True)
 class SQSClient:
     """Client for interacting with SQS."""
@@ -43,6 +73,32 @@ class SQSClient:
     client: mypy_boto3_sqs.SQSClient
     default_queue_url: str = ""
     wait_time_seconds: int = 0
+    # Policies are mutable, so they are left out of comparison and hash
+    retry_policy: retry.RetryPolicy | None = dataclasses.field(
+        default=None,
+        compare=False,
+    )
+    # Used to hedge receiving and deleting of messages
+    hedging_policy: hedging.HedgingPolicy | None = dataclasses.field(
+        default=None,
+        compare=False,
+    )
+    # Seconds calls may take keyed by boto3 method names, like
+    # `receive_message`. Wait time of long polling is added to deadline.
+    deadlines: collections.abc.Mapping[str, float] = dataclasses.field(
+        default_factory=dict,
+        compare=False,
+    )
+    # Urls keyed by queue names
+    queue_url_cache: cache.TTLCache[str, str] = dataclasses.field(
+        default_factory=cache.TTLCache,
+        compare=False,
+    )
+    # Arns keyed by queue urls
+    queue_arn_cache: cache.TTLCache[str, str] = dataclasses.field(
+        default_factory=cache.TTLCache,
+        compare=False,
+    )
 
     async def run_sync_as_async(
         self,
@@ -50,16 +106,51 @@ class SQSClient:
         *args: ParamT.args,
         **kwargs: ParamT.kwargs,
     ) -> ReturnT:
-        """Make sync function run in async env."""
-        return await anyio.to_thread.run_sync(  # type: ignore
-            functools.partial(func, *args, **kwargs),
+        """Make sync function run in async env retrying failures.
+
+        Raises `TimeoutError` if call doesn't finish before its deadline.
+
+        """
+        call = functools.partial(func, *args, **kwargs)
+        operation = getattr(func, "__name__", "")
+        deadline = self.deadlines.get(operation)
+        if deadline is not None:
+            deadline += kwargs.get("WaitTimeSeconds", 0)  # type: ignore
+        with anyio.fail_after(deadline):
+            if self.retry_policy:
+                return await self.retry_policy.call(call, operation=operation)
+            return await anyio.to_thread.run_sync(
+                call,
+                abandon_on_cancel=True,
+            )
+
+    async def run_hedged(
+        self,
+        func: collections.abc.Callable[
+            [],
+            collections.abc.Awaitable[ReturnT],
+        ],
+        operation: str,
+        on_discarded: collections.abc.Callable[
+            [ReturnT],
+            collections.abc.Awaitable[typing.Any],
+        ]
+        | None = None,
+    ) -> ReturnT:
+        """Run idempotent call hedging it if hedging policy is set."""
+        if not self.hedging_policy:
+            return await func()
+        return await self.hedging_policy.call(
+            func,
+            operation=operation,
+            on_discarded=on_discarded,
         )
 
     @metrics.tracker
     async def send_message(
         self,
         metadata_attributes: types.SQSMessageAttributes,
-        body: dict[str, typing.Any],
+        body: dict[str, typing.Any] | str,
         queue_url: str = "",
         **additional_attrs,
     ) -> mypy_boto3_sqs.type_defs.SendMessageResultTypeDef:
@@ -68,23 +159,79 @@ class SQSClient:
             self.client.send_message,
             QueueUrl=queue_url or self.default_queue_url,
             MessageAttributes=metadata_attributes,
-            MessageBody=ujson.dumps(body),
+            MessageBody=body if isinstance(body, str) else ujson.dumps(body),
             **additional_attrs,
         )
 
+    @metrics.tracker
+    async def send_message_batch(
+        self,
+        entries: collections.abc.Sequence[
+            mypy_boto3_sqs.type_defs.SendMessageBatchRequestEntryTypeDef
+        ],
+        queue_url: str = "",
+    ) -> mypy_boto3_sqs.type_defs.SendMessageBatchResultTypeDef:
+        """Send up to 10 messages to queue in single request."""
+        return await self.run_sync_as_async(
+            self.client.send_message_batch,
+            QueueUrl=queue_url or self.default_queue_url,
+            Entries=entries,
+        )
+
     @metrics.tracker
     async def receive_messages(
         self,
         queue_url: str = "",
         wait_time_seconds: int | None = None,
     ) -> mypy_boto3_sqs.type_defs.ReceiveMessageResultTypeDef:
-        """Receive messages."""
-        return await self.run_sync_as_async(
+        """Receive messages.
+
+        Timestamps of sending and first receiving are requested along with
+        message attributes to measure time messages spend in queue. Messages
+        received by losing hedged call, or by call which has been abandoned
+        because of cancellation or deadline, are made visible again.
+
+        """
+        queue_url = queue_url or self.default_queue_url
+        return await self.run_hedged(
+            functools.partial(
+                self.receive_discardable_messages,
+                queue_url=queue_url,
+                wait_time_seconds=wait_time_seconds or self.wait_time_seconds,
+            ),
+            operation="receive_message",
+            on_discarded=lambda response: self.release_messages(
+                response.get("Messages", []),
+                queue_url=queue_url,
+            ),
+        )
+
+    async def receive_discardable_messages(
+        self,
+        queue_url: str,
+        wait_time_seconds: int,
+    ) -> mypy_boto3_sqs.type_defs.ReceiveMessageResultTypeDef:
+        """Receive messages releasing them if call is abandoned."""
+        call = hedging.DiscardableCall(
             self.client.receive_message,
-            QueueUrl=queue_url or self.default_queue_url,
-            MessageAttributeNames=["All"],
-            WaitTimeSeconds=wait_time_seconds or self.wait_time_seconds,
+            on_discarded=lambda response: self.release_messages_sync(
+                response.get("Messages", []),
+                queue_url=queue_url,
+            ),
         )
+        try:
+            return await self.run_sync_as_async(
+                call,
+                QueueUrl=queue_url,
+                MessageAttributeNames=["All"],
+                MessageSystemAttributeNames=list(
+                    lifecycle.SYSTEM_ATTRIBUTE_NAMES,
+                ),
+                WaitTimeSeconds=wait_time_seconds,
+            )
+        except BaseException:
+            await call.discard()
+            raise
 
     @metrics.tracker
     async def delete_messages(
@@ -95,10 +242,8 @@ class SQSClient:
         queue_url: str = "",
     ) -> mypy_boto3_sqs.type_defs.DeleteMessageBatchResultTypeDef:
         """Delete messages from queue."""
-        return await self.run_sync_as_async(
-            self.client.delete_message_batch,
-            QueueUrl=queue_url or self.default_queue_url,
-            Entries=[
+        return await self.delete_message_batch(
+            entries=[
                 {
                     "Id": str(idx),
                     "ReceiptHandle": message["ReceiptHandle"],
@@ -106,6 +251,58 @@ class SQSClient:
                 for idx, message in enumerate(messages_to_delete)
                 if "ReceiptHandle" in message
             ],
+            queue_url=queue_url,
+        )
+
+    @metrics.tracker
+    async def delete_message_batch(
+        self,
+        entries: collections.abc.Sequence[
+            mypy_boto3_sqs.type_defs.DeleteMessageBatchRequestEntryTypeDef
+        ],
+        queue_url: str = "",
+    ) -> mypy_boto3_sqs.type_defs.DeleteMessageBatchResultTypeDef:
+        """Delete up to 10 messages from queue in single request."""
+        return await self.run_hedged(
+            functools.partial(
+                self.run_sync_as_async,
+                self.client.delete_message_batch,
+                QueueUrl=queue_url or self.default_queue_url,
+                Entries=entries,
+            ),
+            operation="delete_message_batch",
+        )
+
+    @metrics.tracker
+    async def release_messages(
+        self,
+        messages_to_release: collections.abc.Sequence[
+            mypy_boto3_sqs.type_defs.MessageTypeDef
+        ],
+        queue_url: str = "",
+    ) -> None:
+        """Make received messages visible to other consumers right away."""
+        if not (entries := get_release_entries(messages_to_release)):
+            return
+        await self.run_sync_as_async(
+            self.client.change_message_visibility_batch,
+            QueueUrl=queue_url or self.default_queue_url,
+            Entries=entries,
+        )
+
+    def release_messages_sync(
+        self,
+        messages_to_release: collections.abc.Sequence[
+            mypy_boto3_sqs.type_defs.MessageTypeDef
+        ],
+        queue_url: str = "",
+    ) -> None:
+        """Release messages from thread of abandoned call."""
+        if not (entries := get_release_entries(messages_to_release)):
+            return
+        self.client.change_message_visibility_batch(
+            QueueUrl=queue_url or self.default_queue_url,
+            Entries=entries,
         )
 
     @metrics.tracker
@@ -131,12 +328,16 @@ class SQSClient:
         name: str,
     ) -> str:
         """Get queue url."""
-        return (
+        if queue_url := self.queue_url_cache.get(name):
+            return queue_url
+        queue_url = (
             await self.run_sync_as_async(
                 self.client.get_queue_url,
                 QueueName=name,
             )
         )["QueueUrl"]
+        self.queue_url_cache.set(name, queue_url)
+        return queue_url
 
     @metrics.tracker
     async def get_queue_arn(
@@ -144,13 +345,37 @@ class SQSClient:
         queue_url: str,
     ) -> str:
         """Get queue arn."""
-        return (
+        if queue_arn := self.queue_arn_cache.get(queue_url):
+            return queue_arn
+        queue_arn = (
             await self.run_sync_as_async(
                 self.client.get_queue_attributes,
                 QueueUrl=queue_url,
                 AttributeNames=["QueueArn"],
             )
         )["Attributes"]["QueueArn"]
+        self.queue_arn_cache.set(queue_url, queue_arn)
+        return queue_arn
+
+    @metrics.tracker
+    async def resolve_many(
+        self,
+        names: collections.abc.Iterable[str],
+    ) -> dict[str, ResolvedQueue]:
+        """Resolve urls and arns of queues concurrently."""
+        resolved_queues: dict[str, ResolvedQueue] = {}
+
+        async def resolve(name: str) -> None:
+            queue_url = await self.get_queue_url(name)
+            resolved_queues[name] = ResolvedQueue(
+                url=queue_url,
+                arn=await self.get_queue_arn(queue_url),
+            )
+
+        async with anyio.create_task_group() as task_group:
+            for name in names:
+                task_group.start_soon(resolve, name)
+        return resolved_queues
 
     @metrics.tracker
     async def delete_queue(
@@ -158,7 +383,18 @@ class SQSClient:
         queue_url: str,
     ) -> mypy_boto3_sqs.type_defs.EmptyResponseMetadataTypeDef:
         """Delete queue."""
-        return await self.run_sync_as_async(
+        response = await self.run_sync_as_async(
             self.client.delete_queue,
             QueueUrl=queue_url,
         )
+        self.invalidate_queue(queue_url)
+        return response
+
+    def invalidate_queue(
+        self,
+        queue_url: str,
+    ) -> None:
+        """Forget cached url and arn of queue."""
+        # Queue url ends with queue name
+        self.queue_url_cache.invalidate(queue_url.rsplit("/", 1)[-1])
+        self.queue_arn_cache.invalidate(queue_url)
@@ -0,0 +1,133 @@
+import base64
+import dataclasses
+import gzip
+import typing
+
+from . import metrics
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None  # type: ignore
+
+# Name of message attribute which holds codec used to compress body
+CONTENT_ENCODING_ATTRIBUTE = "content-encoding"
+
+
+class UnknownContentEncodingError(Exception):
+    """Exception when body is encoded with unknown codec."""
+
+
+class CodecProtocol(typing.Protocol):
+    """Protocol for codecs which compress message bodies."""
+
+    @property
+    def name(self) -> str:
+        """Get name of codec used as content encoding."""
+        ...  # pragma: no cover
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress data."""
+        ...  # pragma: no cover
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress data."""
+        ...  # pragma: no cover
+
+
+@dataclasses.dataclass(frozen=True)
+class GzipCodec:
+    """Codec which compresses bodies with gzip."""
+
+    name: str = "gzip"
+    level: int = 6
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress data."""
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress data."""
+        return gzip.decompress(data)
+
+
+@dataclasses.dataclass(frozen=True)
+class ZstdCodec:
+    """Codec which compresses bodies with zstd.
+
+    Requires `zstandard` package (`zstd` extra).
+
+    """
+
+    name: str = "zstd"
+    level: int = 3
+
+    def __post_init__(self) -> None:
+        """Check that zstd support is installed."""
+        if zstandard is None:  # pragma: no cover
+            raise ImportError(
+                "Please install `zstandard` to use zstd compression",
+            )
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress data."""
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress data."""
+        return zstandard.ZstdDecompressor().decompress(data)
+
+
+# Codecs available for decompression, keyed by content encoding
+codecs_registry: dict[str, CodecProtocol] = {
+    GzipCodec.name: GzipCodec(),
+}
+if zstandard is not None:  # pragma: no branch
+    codecs_registry[ZstdCodec.name] = ZstdCodec()
+
+
+@dataclasses.dataclass(frozen=True)
+class CompressionConfig:
+    """Configuration of body compression.
+
+    Bodies with size (in bytes) below `threshold` are sent as is. Compressed
+    bodies are base64-encoded for transport, since SQS and SNS accept only
+    text, and are sent only if they are smaller than original ones.
+
+    """
+
+    codec: CodecProtocol = GzipCodec()
+    threshold: int = 16 * 1024
+
+    @metrics.tracker
+    def compress(
+        self,
+        body: str,
+        metadata: dict[str, str],
+    ) -> tuple[str, dict[str, str]]:
+        """Compress body and mark it in metadata."""
+        encoded_body = body.encode()
+        if len(encoded_body) < self.threshold:
+            return body, metadata
+        compressed_body = base64.b64encode(
+            self.codec.compress(encoded_body),
+        ).decode()
+        if len(compressed_body) >= len(encoded_body):
+            return body, metadata
+        return compressed_body, {
+            **metadata,
+            CONTENT_ENCODING_ATTRIBUTE: self.codec.name,
+        }
+
+
+@metrics.tracker
+def decompress(
+    body: str,
+    content_encoding: str,
+) -> str:
+    """Decompress body compressed with codec from `content_encoding`."""
+    if not (codec := codecs_registry.get(content_encoding)):
+        raise UnknownContentEncodingError(
+            f"No codec is registered for {content_encoding} encoding",
+        )
+    return codec.decompress(base64.b64decode(body)).decode()
@@ -1,10 +1,19 @@
 import hashlib
 import typing
+import zlib
 
 import ujson
 
 from . import metrics
 
+# AWS limit for length of MessageGroupId
+MAX_MESSAGE_GROUP_ID_LENGTH = 128
+
+
+def encode_body(body: dict[str, typing.Any]) -> bytes:
+    """Serialize body the same way as it's sent."""
+    return ujson.dumps(body).encode()
+
 
 class FifoAttributesCreatorProtocol(typing.Protocol):
     """Protocol to create special attributes for AWS FIFO topics and queues."""
@@ -44,11 +53,24 @@ class FifoAttributesCreator(FifoAttributesCreatorProtocol):
         metadata: dict[str, str],
     ) -> str:
         """Construct message deduplication id."""
+        return cls.get_encoded_message_deduplication_id(
+            encode_body(body),
+            metadata,
+        )
+
+    @classmethod
+    @metrics.tracker
+    def get_encoded_message_deduplication_id(
+        cls,
+        encoded_body: bytes,
+        metadata: dict[str, str],
+    ) -> str:
+        """Construct message deduplication id from serialized body."""
         action = metadata["action"]
         # Make sha256 hash of body like AWS do under the hood but also add
         # action to the beginning to avoid treating messages as duplicates if
         # they have same body but different actions.
-        body_sha256_hash = hashlib.sha256(ujson.dumps(body).encode())
+        body_sha256_hash = hashlib.sha256(encoded_body)
         return f"{action}:{body_sha256_hash.hexdigest()}"
 
     @classmethod
@@ -62,6 +84,76 @@ class FifoAttributesCreator(FifoAttributesCreatorProtocol):
         return metadata["type"]
 
 
+class EntityFifoAttributesCreator(FifoAttributesCreator):
+    """Class to create FIFO attributes with group per entity.
+
+    Messages about the same entity (for example, order) are processed in
+    order, while messages of different entities are processed in parallel.
+    Entity key is taken from body by `entity_key_path`.
+
+    Usage:
+        ```python
+        class OrderFifoAttributesCreator(EntityFifoAttributesCreator):
+            entity_key_path = ("order", "id")
+        ```
+
+    """
+
+    # Keys to follow in body to get entity key
+    entity_key_path: typing.ClassVar[tuple[str, ...]] = ("id",)
+
+    @classmethod
+    @metrics.tracker
+    def get_message_group_id(
+        cls,
+        body: dict[str, typing.Any],
+        metadata: dict[str, str],
+    ) -> str:
+        """Construct message group id."""
+        message_group_id = f"{metadata['type']}:{cls.get_entity_key(body)}"
+        if len(message_group_id) > MAX_MESSAGE_GROUP_ID_LENGTH:
+            # Keep group id within AWS limit, while keeping it unique
+            return hashlib.sha256(message_group_id.encode()).hexdigest()
+        return message_group_id
+
+    @classmethod
+    def get_entity_key(
+        cls,
+        body: dict[str, typing.Any],
+    ) -> str:
+        """Extract entity key from body."""
+        value: typing.Any = body
+        for key in cls.entity_key_path:
+            value = value[key]
+        return str(value)
+
+
+class ShardedFifoAttributesCreator(EntityFifoAttributesCreator):
+    """Class to create FIFO attributes with groups spread over shards.
+
+    Entities are hashed into `shards_count` groups for each message type, so
+    messages of the same entity are still processed in order, but number of
+    groups (and parallel consumers) is bounded.
+
+    """
+
+    shards_count: typing.ClassVar[int] = 16
+
+    @classmethod
+    @metrics.tracker
+    def get_message_group_id(
+        cls,
+        body: dict[str, typing.Any],
+        metadata: dict[str, str],
+    ) -> str:
+        """Construct message group id."""
+        # Use crc32, since builtin `hash` is randomized between processes
+        shard = (
+            zlib.crc32(cls.get_entity_key(body).encode()) % cls.shards_count
+        )
+        return f"{metadata['type']}:{shard}"
+
+
 class DeadLetterFifoAttributesCreator(FifoAttributesCreatorProtocol):
     """Class to create special attributes for AWS FIFO topics and queues.
 
@@ -78,11 +170,24 @@ class DeadLetterFifoAttributesCreator(FifoAttributesCreatorProtocol):
         metadata: dict[str, str],
     ) -> str:
         """Construct message deduplication id."""
+        return cls.get_encoded_message_deduplication_id(
+            encode_body(body),
+            metadata,
+        )
+
+    @classmethod
+    @metrics.tracker
+    def get_encoded_message_deduplication_id(
+        cls,
+        encoded_body: bytes,
+        metadata: dict[str, str],
+    ) -> str:
+        """Construct message deduplication id from serialized body."""
         message_id = metadata["message_id"]
         # Make sha256 hash of body like AWS do under the hood but also add
         # action to the beginning to avoid treating messages as duplicates if
         # they have same body but different actions.
-        body_sha256_hash = hashlib.sha256(ujson.dumps(body).encode())
+        body_sha256_hash = hashlib.sha256(encoded_body)
         return f"{message_id}:{body_sha256_hash.hexdigest()}"
 
     @classmethod
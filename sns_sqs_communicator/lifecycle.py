@@ -0,0 +1,159 @@
+import collections.abc
+import contextlib
+import contextvars
+import dataclasses
+import enum
+import time
+import typing
+
+import mypy_boto3_sqs.literals
+import mypy_boto3_sqs.type_defs
+
+from . import metrics
+
+# System attributes with timestamps (in milliseconds) of message, SQS
+# returns them only when they are requested on receiving
+SENT_TIMESTAMP: typing.Final = "SentTimestamp"
+FIRST_RECEIVE_TIMESTAMP: typing.Final = "ApproximateFirstReceiveTimestamp"
+SYSTEM_ATTRIBUTE_NAMES: tuple[
+    mypy_boto3_sqs.literals.MessageSystemAttributeNameType,
+    ...,
+] = (SENT_TIMESTAMP, FIRST_RECEIVE_TIMESTAMP)
+# Label of messages which haven't been parsed
+UNKNOWN = "unknown"
+METRIC_PREFIX = "sns_sqs_communicator.message"
+
+
+class Stage(enum.StrEnum):
+    """Stage of message lifecycle."""
+
+    # From sending message to receiving it for the first time
+    queue_wait = "queue_wait"
+    # From receiving batch with message to starting to process it
+    receive_to_dispatch = "receive_to_dispatch"
+    parse = "parse"
+    handler = "handler"
+    # From finishing processing to deleting message from queue
+    ack = "ack"
+
+
+@dataclasses.dataclass
+class MessageLifecycle:
+    """Durations of stages message has passed through.
+
+    Usage:
+        ```python
+        message_lifecycle = MessageLifecycle.from_raw_message(raw_message)
+        with lifecycle.track(message_lifecycle):
+            await process(raw_message)
+        if not await queue.delete_messages([raw_message]):
+            message_lifecycle.finish_ack()
+        message_lifecycle.record()
+        ```
+
+    """
+
+    # Moment batch with message has been received, by `time.perf_counter`
+    received_at: float
+    durations: dict[Stage, float] = dataclasses.field(default_factory=dict)
+    message_type: str = UNKNOWN
+    action: str = UNKNOWN
+    processed_at: float | None = None
+
+    @classmethod
+    def from_raw_message(
+        cls,
+        raw_message: mypy_boto3_sqs.type_defs.MessageTypeDef,
+        received_at: float | None = None,
+    ) -> typing.Self:
+        """Start lifecycle of received message.
+
+        Time in queue is measured by timestamps of SQS, so it doesn't depend
+        on clocks of workers. Messages without time of first receiving are
+        measured until now.
+
+        """
+        message_lifecycle = cls(
+            received_at=(
+                time.perf_counter() if received_at is None else received_at
+            ),
+        )
+        attributes = raw_message.get("Attributes", {})
+        if sent_timestamp := attributes.get(SENT_TIMESTAMP):
+            first_receive_timestamp = attributes.get(FIRST_RECEIVE_TIMESTAMP)
+            received_timestamp = (
+                int(first_receive_timestamp)
+                if first_receive_timestamp
+                else time.time() * 1000
+            )
+            message_lifecycle.durations[Stage.queue_wait] = (
+                max(received_timestamp - int(sent_timestamp), 0) / 1000
+            )
+        return message_lifecycle
+
+    def start_dispatch(self) -> None:
+        """Mark start of processing."""
+        self.durations[Stage.receive_to_dispatch] = (
+            time.perf_counter() - self.received_at
+        )
+
+    def finish_processing(self) -> None:
+        """Mark end of processing."""
+        self.processed_at = time.perf_counter()
+
+    def finish_ack(self, acked_at: float | None = None) -> None:
+        """Mark deletion of message from queue."""
+        if self.processed_at is None:
+            return
+        acked_at = time.perf_counter() if acked_at is None else acked_at
+        self.durations[Stage.ack] = acked_at - self.processed_at
+
+    def record(self) -> None:
+        """Record durations of stages labelled by type and action."""
+        for stage, seconds in self.durations.items():
+            metrics.histogram(
+                f"{METRIC_PREFIX}.{stage}",
+                seconds,
+                type=self.message_type,
+                action=self.action,
+            )
+
+
+current: contextvars.ContextVar[MessageLifecycle | None] = (
+    contextvars.ContextVar("current_message_lifecycle", default=None)
+)
+
+
+@contextlib.contextmanager
+def track(
+    message_lifecycle: MessageLifecycle,
+) -> collections.abc.Iterator[MessageLifecycle]:
+    """Make lifecycle current while message is processed."""
+    token = current.set(message_lifecycle)
+    message_lifecycle.start_dispatch()
+    try:
+        yield message_lifecycle
+    finally:
+        message_lifecycle.finish_processing()
+        current.reset(token)
+
+
+@contextlib.contextmanager
+def measure(stage: Stage) -> collections.abc.Iterator[None]:
+    """Measure stage of message processed in current context."""
+    message_lifecycle = current.get()
+    if message_lifecycle is None:
+        yield
+        return
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        message_lifecycle.durations[stage] = time.perf_counter() - started_at
+
+
+def set_labels(message_type: str, action: str) -> None:
+    """Label lifecycle of message processed in current context."""
+    if message_lifecycle := current.get():
+        message_lifecycle.message_type = message_type
+        message_lifecycle.action = action
@@ -31,6 +31,8 @@ class LocalSetupConfig(pydantic.BaseModel):
     queues_to_create: list[str] = []
     topics_to_create: list[str] = []
     topics_subscriptions: dict[str, collections.abc.Sequence[str]] = {}
+    # Deliver messages from topics to queues without SNS envelope
+    raw_message_delivery: bool = False
 
 
 class LocalSetupManager:
@@ -208,6 +210,15 @@ class LocalSetupManager:
         cls.created_topics[topic_arn] = response
         return response
 
+    @classmethod
+    def get_subscription_attributes(
+        cls,
+    ) -> dict[str, str]:
+        """Get attributes for subscription of queue to topic."""
+        return sns_sqs_communicator.clients.get_subscription_attributes(
+            raw_message_delivery=cls.get_config().raw_message_delivery,
+        )
+
     @classmethod
     def subscribe_topic_to_queues(
         cls,
@@ -226,6 +237,7 @@ class LocalSetupManager:
                 TopicArn=cls.created_topics[topic_arn]["TopicArn"],
                 Protocol="sqs",
                 Endpoint=queue_arn,
+                Attributes=cls.get_subscription_attributes(),
             )
 
     @classmethod
@@ -1,4 +1,6 @@
+import collections.abc
 import enum
+import functools
 import typing
 
 import pydantic
@@ -11,23 +13,45 @@ MessageActionT = typing.TypeVar(
 )
 
 
-class Message(
+class BaseMessage(
     pydantic.BaseModel,
     typing.Generic[schemas.QueueBodySchemaT, MessageActionT],
 ):
-    """Queue message."""
+    """Base of queue message.
+
+    Subclasses define how `body_schema` is provided.
+
+    """
+
+    if typing.TYPE_CHECKING:  # pragma: no cover
+
+        @property
+        def body_schema(self) -> schemas.QueueBodySchemaT:
+            """Get body schema."""
+
+        @property
+        def schema_class(self) -> type[schemas.QueueBodySchemaT]:
+            """Get class of body schema."""
 
-    body_schema: schemas.QueueBodySchemaT
     action: MessageActionT
     type: str
 
     @property
     def metadata(self) -> dict[str, str]:
-        """Get message metadata."""
-        return {
+        """Get message metadata.
+
+        Schema version is included only for versioned schemas, since
+        messages without it are treated as messages of default version.
+
+        """
+        metadata = {
             "action": self.action.value,
             "type": self.type,
         }
+        schema_version = self.schema_class.schema_version
+        if schema_version != schemas.DEFAULT_SCHEMA_VERSION:
+            metadata[schemas.SCHEMA_VERSION_ATTRIBUTE] = str(schema_version)
+        return metadata
 
     def serialize_body(self) -> dict[str, typing.Any]:
         """Serialize message body."""
@@ -41,13 +65,71 @@ class Message(
         }
 
 
+class Message(
+    BaseMessage[schemas.QueueBodySchemaT, MessageActionT],
+    typing.Generic[schemas.QueueBodySchemaT, MessageActionT],
+):
+    """Queue message."""
+
+    body_schema: schemas.QueueBodySchemaT
+
+    @property
+    def schema_class(self) -> type[schemas.QueueBodySchemaT]:
+        """Get class of body schema."""
+        return type(self.body_schema)
+
+
+class LazyMessage(
+    BaseMessage[schemas.QueueBodySchemaT, MessageActionT],
+    typing.Generic[schemas.QueueBodySchemaT, MessageActionT],
+):
+    """Queue message which decodes and validates body on first access.
+
+    Routing and cancellation only need `type` and `action`, so messages which
+    would be cancelled never pay for body parsing.
+
+    """
+
+    # Retrieves raw body, it's called only on first access to `body_schema`
+    body_loader: collections.abc.Callable[[], str]
+    schema_class: type[schemas.QueueBodySchemaT]
+    # Version of schema which body has been sent with
+    body_schema_version: int = schemas.DEFAULT_SCHEMA_VERSION
+
+    @functools.cached_property
+    def body_schema(self) -> schemas.QueueBodySchemaT:
+        """Decode, upgrade and validate body."""
+        return self.schema_class.validate_body(
+            self.body_loader(),
+            from_version=self.body_schema_version,
+        )
+
+    @property
+    def is_body_loaded(self) -> bool:
+        """Check if body has been already decoded and validated."""
+        return "body_schema" in self.__dict__
+
+
 class DeadLetterMessage(pydantic.BaseModel):
-    """Message for dead letter queue."""
+    """Message for dead letter queue.
+
+    Body and attributes of failed message are kept as they were received,
+    so compressed or offloaded bodies could be redriven as is.
+
+    """
 
     message_id: str
     receipt_handle: str
     raw_message: typing.Any
     error_details: str
+    message_attributes: dict[str, typing.Any] = pydantic.Field(
+        default_factory=dict,
+    )
+
+    @property
+    def metadata(self) -> dict[str, str]:
+        """Get metadata of dead letter."""
+        return {"message_id": self.message_id}
 
     def to_dict(self) -> dict[str, typing.Any]:
         """Serialize message to dict."""
@@ -55,5 +137,6 @@ class DeadLetterMessage(pydantic.BaseModel):
             "message_id": self.message_id,
             "receipt_handle": self.receipt_handle,
             "raw_message": self.raw_message,
+            "message_attributes": self.message_attributes,
             "exception_details": self.error_details,
         }
@@ -0,0 +1,75 @@
+import collections.abc
+import contextlib
+import importlib
+import os
+import typing
+
+from . import builtin, histograms, instrumentation, prometheus
+
+FP = typing.ParamSpec("FP")  # Function Parameters
+RV = typing.TypeVar("RV")  # Returned Value
+
+
+def tracker(
+    func: collections.abc.Callable[FP, RV],
+) -> collections.abc.Callable[FP, RV]:
+    """Register function in instrumentation registry.
+
+    Function is returned as is while tracking is disabled, so it costs
+    nothing until it's enabled through `instrumentation.registry`.
+
+    """
+    return instrumentation.registry.register(func)
+
+
+def counter(
+    name: str,
+    value: int = 1,
+    **tags: str,
+) -> None:
+    """Count events in built-in registry."""
+    builtin.counter(name, value, **tags)
+
+
+def histogram(
+    name: str,
+    seconds: float,
+    **tags: str,
+) -> None:
+    """Record duration into histogram of built-in registry."""
+    builtin.histogram(name, seconds, **tags)
+
+
+with contextlib.suppress(KeyError):  # pragma: no cover
+    metric_tracker_path = os.environ["SNS_SQS_COMMUNICATOR_METRIC_TRACKER"]
+    *module, tracker_name = metric_tracker_path.split(".")
+    instrumentation.registry.set_tracker(
+        getattr(importlib.import_module(".".join(module)), tracker_name),
+    )
+    instrumentation.registry.enabled_by_default = True
+
+with contextlib.suppress(KeyError):  # pragma: no cover
+    metric_counter_path = os.environ["SNS_SQS_COMMUNICATOR_METRIC_COUNTER"]
+    *module, counter_name = metric_counter_path.split(".")
+    counter = getattr(
+        importlib.import_module(".".join(module)),
+        counter_name,
+    )
+
+with contextlib.suppress(KeyError):  # pragma: no cover
+    metric_histogram_path = os.environ["SNS_SQS_COMMUNICATOR_METRIC_HISTOGRAM"]
+    *module, histogram_name = metric_histogram_path.split(".")
+    histogram = getattr(
+        importlib.import_module(".".join(module)),
+        histogram_name,
+    )
+
+__all__ = (
+    "builtin",
+    "counter",
+    "histogram",
+    "histograms",
+    "instrumentation",
+    "prometheus",
+    "tracker",
+)
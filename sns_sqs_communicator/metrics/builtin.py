@@ -0,0 +1,285 @@
+"""Built-in metrics backend.
+
+Its tracker wraps enabled instrumentation sites, while its counter and
+histogram record events and durations by default. Functions are named like
+`module:qualname`, the same way as sites of instrumentation.
+
+"""
+
+import collections.abc
+import contextlib
+import dataclasses
+import functools
+import inspect
+import threading
+import time
+import typing
+
+from . import histograms
+
+FP = typing.ParamSpec("FP")  # Function Parameters
+RV = typing.TypeVar("RV")  # Returned Value
+
+# Metric name with sorted tags
+MetricKey: typing.TypeAlias = tuple[str, tuple[tuple[str, str], ...]]
+
+
+@dataclasses.dataclass(frozen=True)
+class FunctionSnapshot:
+    """Stats of tracked function at some moment."""
+
+    calls: int
+    errors: int
+    latency: histograms.HistogramSnapshot
+    # Time spent on producing each item by async generator
+    item_latency: histograms.HistogramSnapshot | None = None
+
+
+@dataclasses.dataclass(frozen=True)
+class MetricsSnapshot:
+    """Stats of tracked functions, counters and histograms at some moment."""
+
+    # Keyed by names of functions like `module:qualname`
+    functions: dict[str, FunctionSnapshot]
+    counters: dict[MetricKey, int]
+    # Recorded by `histogram` and keyed like counters
+    durations: dict[MetricKey, histograms.HistogramSnapshot] = (
+        dataclasses.field(default_factory=dict)
+    )
+
+
+class FunctionStats:
+    """Stats of tracked function.
+
+    Number of calls is the number of recorded latencies.
+
+    """
+
+    __slots__ = ("_lock", "errors", "item_latency", "latency")
+
+    def __init__(self) -> None:
+        self.errors = 0
+        self.latency = histograms.LogLinearHistogram()
+        self.item_latency: histograms.LogLinearHistogram | None = None
+        self._lock = threading.Lock()
+
+    def record_item(self, seconds: float) -> None:
+        """Record time spent on producing item by generator."""
+        if self.item_latency is None:
+            with self._lock:
+                if self.item_latency is None:
+                    self.item_latency = histograms.LogLinearHistogram()
+        self.item_latency.record(seconds)
+
+    def record(self, seconds: float, is_error: bool) -> None:
+        """Record finished call."""
+        if is_error:
+            with self._lock:
+                self.errors += 1
+        self.latency.record(seconds)
+
+
+class MetricsRegistry:
+    """Storage of stats of tracked functions, counters and histograms."""
+
+    def __init__(self) -> None:
+        self.functions: dict[str, FunctionStats] = {}
+        self.counters: collections.Counter[MetricKey] = collections.Counter()
+        self.durations: dict[MetricKey, histograms.LogLinearHistogram] = {}
+        self._lock = threading.Lock()
+
+    def get_function_stats(self, name: str) -> FunctionStats:
+        """Get stats of function registering it if needed."""
+        with self._lock:
+            if name not in self.functions:
+                self.functions[name] = FunctionStats()
+            return self.functions[name]
+
+    def increment(self, name: str, value: int, tags: dict[str, str]) -> None:
+        """Increment counter."""
+        key = (name, tuple(sorted(tags.items())))
+        with self._lock:
+            self.counters[key] += value
+
+    def observe(self, name: str, seconds: float, tags: dict[str, str]) -> None:
+        """Record value into histogram."""
+        key = (name, tuple(sorted(tags.items())))
+        with self._lock:
+            if key not in self.durations:
+                self.durations[key] = histograms.LogLinearHistogram()
+            histogram = self.durations[key]
+        histogram.record(seconds)
+
+    def snapshot(self) -> MetricsSnapshot:
+        """Copy current stats."""
+        with self._lock:
+            functions = dict(self.functions)
+            counters = dict(self.counters)
+            durations = dict(self.durations)
+        return MetricsSnapshot(
+            functions={
+                name: FunctionSnapshot(
+                    calls=latency.count,
+                    errors=stats.errors,
+                    latency=latency,
+                    item_latency=(
+                        stats.item_latency.snapshot()
+                        if stats.item_latency
+                        else None
+                    ),
+                )
+                for name, stats in functions.items()
+                # Skip functions which calls haven't finished yet
+                if (latency := stats.latency.snapshot()).count
+            },
+            counters=counters,
+            durations={
+                key: histogram.snapshot()
+                for key, histogram in durations.items()
+            },
+        )
+
+    def reset(self) -> None:
+        """Forget all stats."""
+        with self._lock:
+            self.functions.clear()
+            self.counters.clear()
+            self.durations.clear()
+
+
+registry = MetricsRegistry()
+
+
+def tracker(
+    func: collections.abc.Callable[FP, RV],
+) -> collections.abc.Callable[FP, RV]:
+    """Track calls, errors and latency of function.
+
+    Coroutine functions are measured until returned coroutine finishes and
+    async generators until they are exhausted or closed, along with time
+    spent on producing each item. Cancellation isn't counted as error.
+
+    """
+    name = f"{func.__module__}:{func.__qualname__}"
+    if inspect.isasyncgenfunction(func):
+        return typing.cast(
+            collections.abc.Callable[FP, RV],
+            track_async_generator(func, name),
+        )
+    if inspect.iscoroutinefunction(func):
+        return typing.cast(
+            collections.abc.Callable[FP, RV],
+            track_coroutine(func, name),
+        )
+
+    @functools.wraps(func)
+    def wrapper_tracker(
+        *args: FP.args,
+        **kwargs: FP.kwargs,
+    ) -> RV:
+        stats = registry.get_function_stats(name)
+        started_at = time.perf_counter()
+        is_error = False
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            is_error = True
+            raise
+        finally:
+            stats.record(time.perf_counter() - started_at, is_error)
+
+    return wrapper_tracker
+
+
+def track_coroutine(
+    func: collections.abc.Callable[FP, collections.abc.Awaitable[RV]],
+    name: str,
+) -> collections.abc.Callable[FP, collections.abc.Coroutine[None, None, RV]]:
+    """Track coroutine function until its coroutine finishes."""
+
+    @functools.wraps(func)
+    async def wrapper_tracker(
+        *args: FP.args,
+        **kwargs: FP.kwargs,
+    ) -> RV:
+        stats = registry.get_function_stats(name)
+        started_at = time.perf_counter()
+        is_error = False
+        try:
+            return await func(*args, **kwargs)
+        except Exception:
+            is_error = True
+            raise
+        finally:
+            stats.record(time.perf_counter() - started_at, is_error)
+
+    return wrapper_tracker
+
+
+def track_async_generator(
+    func: collections.abc.Callable[FP, collections.abc.AsyncGenerator[RV]],
+    name: str,
+) -> collections.abc.Callable[FP, collections.abc.AsyncGenerator[RV]]:
+    """Track async generator function until its generator is closed.
+
+    Time consumer spends between items counts towards total latency, but
+    not towards latency of items. Values and exceptions sent into wrapper
+    are forwarded to generator, so it could be used by
+    `contextlib.asynccontextmanager`.
+
+    """
+
+    @functools.wraps(func)
+    async def wrapper_tracker(
+        *args: FP.args,
+        **kwargs: FP.kwargs,
+    ) -> collections.abc.AsyncGenerator[RV]:
+        stats = registry.get_function_stats(name)
+        started_at = item_started_at = time.perf_counter()
+        is_error = False
+        try:
+            async with contextlib.aclosing(func(*args, **kwargs)) as items:
+                sent: typing.Any = None
+                thrown: BaseException | None = None
+                while True:
+                    try:
+                        item = await (
+                            items.athrow(thrown)
+                            if thrown
+                            else items.asend(sent)
+                        )
+                    except StopAsyncIteration:
+                        break
+                    stats.record_item(time.perf_counter() - item_started_at)
+                    try:
+                        sent, thrown = (yield item), None
+                    except GeneratorExit:
+                        raise
+                    except BaseException as exception:  # noqa: BLE001
+                        sent, thrown = None, exception
+                    item_started_at = time.perf_counter()
+        except Exception:
+            is_error = True
+            raise
+        finally:
+            stats.record(time.perf_counter() - started_at, is_error)
+
+    return wrapper_tracker
+
+
+def counter(
+    name: str,
+    value: int = 1,
+    **tags: str,
+) -> None:
+    """Count events."""
+    registry.increment(name, value, tags)
+
+
+def histogram(
+    name: str,
+    seconds: float,
+    **tags: str,
+) -> None:
+    """Record duration into histogram."""
+    registry.observe(name, seconds, tags)
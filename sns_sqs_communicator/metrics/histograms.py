@@ -0,0 +1,111 @@
+import array
+import dataclasses
+import threading
+
+# Latencies are recorded in integer microseconds
+UNITS_PER_SECOND = 1_000_000
+
+
+@dataclasses.dataclass(frozen=True)
+class HistogramSnapshot:
+    """Copy of histogram state at some moment."""
+
+    count: int
+    sum_seconds: float
+    # Upper bounds (in seconds) of non-empty buckets with their counts
+    buckets: tuple[tuple[float, int], ...]
+
+    def quantile(self, quantile: float) -> float:
+        """Estimate quantile by upper bound of its bucket."""
+        if not self.count:
+            return 0.0
+        rank = quantile * self.count
+        seen = 0
+        for upper_bound, count in self.buckets:
+            seen += count
+            if seen >= rank:
+                return upper_bound
+        return self.buckets[-1][0]
+
+
+class LogLinearHistogram:
+    """Histogram of latencies with log-linear buckets.
+
+    Each power of two range of microseconds is split into
+    `2 ** (precision_bits - 1)` linear buckets, so relative error stays
+    below `2 ** (1 - precision_bits)` for any value. Buckets are stored in
+    preallocated array, so recording value is a couple of integer
+    operations.
+
+    """
+
+    __slots__ = (
+        "_lock",
+        "counts",
+        "max_value_bits",
+        "precision_bits",
+        "sum_seconds",
+    )
+
+    def __init__(
+        self,
+        precision_bits: int = 4,
+        # Values above 2 ** 40 microseconds (~12.7 days) are clamped
+        max_value_bits: int = 40,
+    ) -> None:
+        self.precision_bits = precision_bits
+        self.max_value_bits = max_value_bits
+        self.counts = array.array(
+            "Q",
+            bytes(8 * self.get_bucket_index(2**max_value_bits - 1) + 8),
+        )
+        self.sum_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def get_bucket_index(self, value: int) -> int:
+        """Get index of bucket for value in microseconds."""
+        exponent = value.bit_length() - self.precision_bits
+        if exponent <= 0:
+            return value
+        sub_buckets = 1 << (self.precision_bits - 1)
+        return exponent * sub_buckets + (value >> exponent)
+
+    def get_bucket_upper_bound(self, index: int) -> int:
+        """Get exclusive upper bound (in microseconds) of bucket."""
+        linear_buckets = 1 << self.precision_bits
+        if index < linear_buckets:
+            return index + 1
+        sub_buckets = linear_buckets >> 1
+        exponent = index // sub_buckets - 1
+        return (index % sub_buckets + sub_buckets + 1) << exponent
+
+    def record(self, seconds: float) -> None:
+        """Record latency."""
+        index = min(
+            self.get_bucket_index(max(0, int(seconds * UNITS_PER_SECOND))),
+            len(self.counts) - 1,
+        )
+        with self._lock:
+            self.counts[index] += 1
+            self.sum_seconds += seconds
+
+    def snapshot(self) -> HistogramSnapshot:
+        """Copy current state of histogram."""
+        with self._lock:
+            counts = self.counts.tolist()
+            sum_seconds = self.sum_seconds
+        return HistogramSnapshot(
+            count=sum(counts),
+            sum_seconds=sum_seconds,
+            buckets=tuple(
+                (self.get_bucket_upper_bound(index) / UNITS_PER_SECOND, count)
+                for index, count in enumerate(counts)
+                if count
+            ),
+        )
+
+    def reset(self) -> None:
+        """Forget recorded values."""
+        with self._lock:
+            self.counts = array.array("Q", bytes(8 * len(self.counts)))
+            self.sum_seconds = 0.0
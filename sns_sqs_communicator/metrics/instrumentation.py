@@ -0,0 +1,184 @@
+import collections.abc
+import contextlib
+import dataclasses
+import fnmatch
+import signal
+import sys
+import threading
+import types
+import typing
+
+from . import builtin
+
+# Wraps function into tracking one
+Tracker: typing.TypeAlias = collections.abc.Callable[
+    [collections.abc.Callable[..., typing.Any]],
+    collections.abc.Callable[..., typing.Any],
+]
+
+
+@dataclasses.dataclass
+class Site:
+    """Tracked function."""
+
+    func: collections.abc.Callable[..., typing.Any]
+    enabled: bool = False
+    # Created by tracker on first enabling
+    wrapped: collections.abc.Callable[..., typing.Any] | None = None
+
+    @property
+    def name(self) -> str:
+        """Get name of function as `module:qualname`."""
+        return f"{self.func.__module__}:{self.func.__qualname__}"
+
+    @property
+    def current(self) -> collections.abc.Callable[..., typing.Any]:
+        """Get function which callers should see now."""
+        if self.enabled and self.wrapped:
+            return self.wrapped
+        return self.func
+
+
+class InstrumentationRegistry:
+    """Registry of tracked functions which could be toggled at runtime.
+
+    Disabled site is the original function, so it costs nothing. Enabling
+    site replaces it in its class or module with function wrapped by
+    tracker, and disabling puts the original function back. Functions
+    defined inside other functions can't be replaced, so they stay as
+    they were when registered. Sites are named like `module:qualname`.
+
+    Usage:
+        ```python
+        metrics.instrumentation.registry.enable("*:SQSParser.*")
+        metrics.instrumentation.registry.disable()
+        ```
+
+    """
+
+    def __init__(
+        self,
+        tracker: Tracker = builtin.tracker,
+        enabled_by_default: bool = False,
+    ) -> None:
+        self.tracker = tracker
+        self.enabled_by_default = enabled_by_default
+        self.sites: dict[str, Site] = {}
+        self._lock = threading.RLock()
+
+    def register(
+        self,
+        func: collections.abc.Callable[..., typing.Any],
+    ) -> collections.abc.Callable[..., typing.Any]:
+        """Register function and get what should be used in its place."""
+        site = Site(func=func)
+        with self._lock:
+            self.sites[site.name] = site
+            if self.enabled_by_default:
+                site.wrapped = self.tracker(func)
+                site.enabled = True
+        return site.current
+
+    def set_tracker(self, tracker: Tracker) -> None:
+        """Wrap enabled and later enabled sites with another tracker."""
+        with self._lock:
+            self.tracker = tracker
+            for site in self.sites.values():
+                previous = site.current
+                site.wrapped = tracker(site.func) if site.enabled else None
+                replace(site.func, previous, site.current)
+
+    def enable(self, pattern: str = "*") -> list[str]:
+        """Enable sites with names matching pattern."""
+        return self._set_enabled(pattern, enabled=True)
+
+    def disable(self, pattern: str = "*") -> list[str]:
+        """Disable sites with names matching pattern."""
+        return self._set_enabled(pattern, enabled=False)
+
+    def toggle(self) -> None:
+        """Disable all sites if any is enabled, or enable all of them."""
+        with self._lock:
+            if any(site.enabled for site in self.sites.values()):
+                self.disable()
+            else:
+                self.enable()
+
+    def install_signal_handler(self, signum: int | None = None) -> None:
+        """Toggle all sites on signal, `SIGUSR2` by default."""
+        signal.signal(
+            signal.SIGUSR2 if signum is None else signum,
+            lambda *_: self.toggle(),
+        )
+
+    def _set_enabled(self, pattern: str, enabled: bool) -> list[str]:
+        """Enable or disable matching sites returning names of changed ones.
+
+        Sites which couldn't be replaced aren't counted as changed.
+
+        """
+        changed: list[str] = []
+        with self._lock:
+            for name, site in self.sites.items():
+                if site.enabled == enabled or not fnmatch.fnmatchcase(
+                    name,
+                    pattern,
+                ):
+                    continue
+                if site.wrapped is None:
+                    site.wrapped = self.tracker(site.func)
+                previous = site.current
+                site.enabled = enabled
+                if replace(site.func, previous, site.current):
+                    changed.append(name)
+                else:
+                    site.enabled = not enabled
+        return changed
+
+
+def get_owner(func: collections.abc.Callable[..., typing.Any]) -> typing.Any:
+    """Get class or module function is defined in."""
+    owner: typing.Any = sys.modules.get(func.__module__)
+    for name in func.__qualname__.split(".")[:-1]:
+        owner = getattr(owner, name, None)
+    return owner
+
+
+def replace(
+    func: collections.abc.Callable[..., typing.Any],
+    old: collections.abc.Callable[..., typing.Any],
+    new: collections.abc.Callable[..., typing.Any],
+) -> bool:
+    """Replace function in its class or module.
+
+    Function wrapped by `classmethod`, `staticmethod` or decorator which
+    keeps it in closure (like `contextlib.asynccontextmanager`) is
+    replaced inside of it.
+
+    """
+    if old is new:
+        return True
+    if (owner := get_owner(func)) is None:
+        return False
+    attribute = func.__name__
+    current = vars(owner).get(attribute)
+    if current is old:
+        setattr(owner, attribute, new)
+        return True
+    if isinstance(current, classmethod | staticmethod):
+        if current.__func__ is old:
+            setattr(owner, attribute, type(current)(new))
+            return True
+        current = current.__func__
+    if isinstance(current, types.FunctionType):
+        for cell in current.__closure__ or ():
+            with contextlib.suppress(ValueError):  # empty cell
+                if cell.cell_contents is old:
+                    cell.cell_contents = new
+                    if getattr(current, "__wrapped__", None) is old:
+                        current.__wrapped__ = new  # type: ignore
+                    return True
+    return False
+
+
+registry = InstrumentationRegistry()
@@ -0,0 +1,157 @@
+import collections.abc
+import re
+
+from . import builtin, histograms
+
+# Upper bounds (in seconds) of exported latency buckets
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+)
+PREFIX = "sns_sqs_communicator"
+
+
+def render(
+    snapshot: builtin.MetricsSnapshot | None = None,
+    buckets: collections.abc.Sequence[float] = DEFAULT_BUCKETS,
+) -> str:
+    """Render metrics in Prometheus text exposition format.
+
+    Renders current stats of built-in registry by default. Latencies and
+    recorded histograms are exported as histograms with given buckets, each
+    recorded bucket is counted by its upper bound.
+
+    """
+    snapshot = snapshot or builtin.registry.snapshot()
+    lines = [
+        f"# HELP {PREFIX}_calls_total Number of calls of function.",
+        f"# TYPE {PREFIX}_calls_total counter",
+        *(
+            f"{PREFIX}_calls_total{{function={quote(name)}}} {stats.calls}"
+            for name, stats in snapshot.functions.items()
+        ),
+        f"# HELP {PREFIX}_errors_total Number of failed calls of function.",
+        f"# TYPE {PREFIX}_errors_total counter",
+        *(
+            f"{PREFIX}_errors_total{{function={quote(name)}}} {stats.errors}"
+            for name, stats in snapshot.functions.items()
+        ),
+        f"# HELP {PREFIX}_duration_seconds Duration of calls of function.",
+        f"# TYPE {PREFIX}_duration_seconds histogram",
+    ]
+    for name, stats in snapshot.functions.items():
+        lines.extend(
+            render_histogram(
+                f"{PREFIX}_duration_seconds",
+                f"function={quote(name)}",
+                stats.latency,
+                buckets,
+            ),
+        )
+    lines.extend(
+        (
+            f"# HELP {PREFIX}_item_duration_seconds Duration of items.",
+            f"# TYPE {PREFIX}_item_duration_seconds histogram",
+        ),
+    )
+    for name, stats in snapshot.functions.items():
+        if stats.item_latency:
+            lines.extend(
+                render_histogram(
+                    f"{PREFIX}_item_duration_seconds",
+                    f"function={quote(name)}",
+                    stats.item_latency,
+                    buckets,
+                ),
+            )
+    counter_names = sorted({name for name, _ in snapshot.counters})
+    for counter_name in counter_names:
+        metric_name = f"{sanitize(counter_name)}_total"
+        lines.append(f"# TYPE {metric_name} counter")
+        for (name, tags), value in snapshot.counters.items():
+            if name != counter_name:
+                continue
+            labels = render_labels(tags)
+            lines.append(
+                f"{metric_name}{{{labels}}} {value}"
+                if labels
+                else f"{metric_name} {value}",
+            )
+    histogram_names = sorted({name for name, _ in snapshot.durations})
+    for histogram_name in histogram_names:
+        metric_name = f"{sanitize(histogram_name)}_seconds"
+        lines.append(f"# TYPE {metric_name} histogram")
+        for (name, tags), histogram in snapshot.durations.items():
+            if name != histogram_name:
+                continue
+            lines.extend(
+                render_histogram(
+                    metric_name,
+                    render_labels(tags),
+                    histogram,
+                    buckets,
+                ),
+            )
+    return "\n".join(lines) + "\n"
+
+
+def render_histogram(
+    metric_name: str,
+    labels: str,
+    histogram: histograms.HistogramSnapshot,
+    buckets: collections.abc.Sequence[float],
+) -> list[str]:
+    """Render histogram lines with cumulative buckets."""
+    lines = []
+    bucket_labels = f"{labels}," if labels else ""
+    for bucket in buckets:
+        count = sum(
+            count
+            for upper_bound, count in histogram.buckets
+            if upper_bound <= bucket
+        )
+        lines.append(
+            f'{metric_name}_bucket{{{bucket_labels}le="{bucket}"}} {count}',
+        )
+    lines.extend(
+        (
+            (
+                f'{metric_name}_bucket{{{bucket_labels}le="+Inf"}} '
+                f"{histogram.count}"
+            ),
+            f"{metric_name}_sum{{{labels}}} {histogram.sum_seconds}",
+            f"{metric_name}_count{{{labels}}} {histogram.count}",
+        ),
+    )
+    return lines
+
+
+def render_labels(tags: collections.abc.Iterable[tuple[str, str]]) -> str:
+    """Render tags as labels."""
+    return ",".join(f"{sanitize(key)}={quote(tag)}" for key, tag in tags)
+
+
+def sanitize(name: str) -> str:
+    """Replace characters which aren't allowed in metric names."""
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def quote(value: str) -> str:
+    """Quote label value escaping special characters."""
+    escaped = (
+        value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    )
+    return f'"{escaped}"'
@@ -0,0 +1,3 @@
+from .tracer import OpenTelemetrySpan, OpenTelemetryTracer
+
+__all__ = ("OpenTelemetrySpan", "OpenTelemetryTracer")
@@ -0,0 +1,100 @@
+import collections.abc
+import contextlib
+
+import opentelemetry.propagate
+import opentelemetry.propagators.textmap
+import opentelemetry.trace
+
+from .. import tracing
+
+SPAN_KINDS = {
+    tracing.SpanKind.internal: opentelemetry.trace.SpanKind.INTERNAL,
+    tracing.SpanKind.producer: opentelemetry.trace.SpanKind.PRODUCER,
+    tracing.SpanKind.consumer: opentelemetry.trace.SpanKind.CONSUMER,
+}
+
+
+class OpenTelemetrySpan:
+    """Adapter of OpenTelemetry span."""
+
+    def __init__(self, span: opentelemetry.trace.Span) -> None:
+        self.span = span
+
+    def set_attribute(
+        self,
+        key: str,
+        value: tracing.AttributeValue,
+    ) -> None:
+        """Attach attribute to span."""
+        self.span.set_attribute(key, value)
+
+    def record_exception(self, exception: BaseException) -> None:
+        """Mark span as failed with exception."""
+        self.span.record_exception(exception)
+        self.span.set_status(
+            opentelemetry.trace.Status(
+                opentelemetry.trace.StatusCode.ERROR,
+                str(exception),
+            ),
+        )
+
+
+class OpenTelemetryTracer:
+    """Tracing backend built on OpenTelemetry.
+
+    Trace context is propagated through message attributes, so it counts
+    towards limit of 10 attributes per message (W3C propagator adds
+    `traceparent` and optional `tracestate`).
+
+    Usage:
+        ```python
+        tracing.set_tracer(OpenTelemetryTracer())
+        ```
+
+    """
+
+    is_enabled = True
+
+    def __init__(
+        self,
+        tracer_provider: opentelemetry.trace.TracerProvider | None = None,
+        propagator: (
+            opentelemetry.propagators.textmap.TextMapPropagator | None
+        ) = None,
+    ) -> None:
+        self.tracer = opentelemetry.trace.get_tracer(
+            "sns_sqs_communicator",
+            tracer_provider=tracer_provider,
+        )
+        self.propagator = (
+            propagator or opentelemetry.propagate.get_global_textmap()
+        )
+
+    def inject(self, metadata: dict[str, str]) -> dict[str, str]:
+        """Get metadata with context of current span added to it."""
+        carrier = dict(metadata)
+        self.propagator.inject(carrier)
+        return carrier
+
+    @contextlib.contextmanager
+    def start_span(
+        self,
+        name: str,
+        kind: tracing.SpanKind = tracing.SpanKind.internal,
+        metadata: collections.abc.Mapping[str, str] | None = None,
+        attributes: (
+            collections.abc.Mapping[str, tracing.AttributeValue] | None
+        ) = None,
+    ) -> collections.abc.Iterator[OpenTelemetrySpan]:
+        """Start span, which continues trace from metadata if it's passed."""
+        with self.tracer.start_as_current_span(
+            name,
+            context=(
+                self.propagator.extract(metadata)
+                if metadata is not None
+                else None
+            ),
+            kind=SPAN_KINDS[kind],
+            attributes=attributes,
+        ) as span:
+            yield OpenTelemetrySpan(span)
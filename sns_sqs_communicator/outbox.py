@@ -0,0 +1,427 @@
+import collections.abc
+import contextlib
+import dataclasses
+import functools
+import logging
+import pathlib
+import sqlite3
+import typing
+
+import anyio
+import ujson
+
+from . import batching, metrics, prepared, topic
+
+
+@dataclasses.dataclass(frozen=True)
+class OutboxEntry:
+    """Message stored in outbox until it's published."""
+
+    id: int
+    body: dict[str, typing.Any]
+    metadata: dict[str, str]
+    # Number of failed attempts to publish message
+    attempts: int = 0
+    # Kept after first failed attempt, so body is offloaded only once
+    prepared_message: prepared.PreparedMessage | None = None
+
+
+@dataclasses.dataclass(frozen=True)
+class OutboxDeadLetter:
+    """Message which has been given up on."""
+
+    entry: OutboxEntry
+    error: str
+
+
+class OutboxStoreProtocol(typing.Protocol):
+    """Protocol for durable storages of outgoing messages."""
+
+    def append(
+        self,
+        body: dict[str, typing.Any],
+        metadata: dict[str, str],
+    ) -> None:
+        """Store message."""
+        ...  # pragma: no cover
+
+    def fetch(self, limit: int) -> list[OutboxEntry]:
+        """Get oldest stored messages."""
+        ...  # pragma: no cover
+
+    def delete(self, entry_ids: collections.abc.Sequence[int]) -> None:
+        """Delete published messages."""
+        ...  # pragma: no cover
+
+    def retry_later(
+        self,
+        prepared_messages: collections.abc.Mapping[
+            int,
+            prepared.PreparedMessage,
+        ],
+        count_attempt: bool = True,
+    ) -> None:
+        """Keep prepared form of messages counting failed attempt."""
+        ...  # pragma: no cover
+
+    def dead_letter(self, errors: collections.abc.Mapping[int, str]) -> None:
+        """Move messages which can't be published to dead letters."""
+        ...  # pragma: no cover
+
+
+@dataclasses.dataclass(frozen=True)
+class SQLiteOutboxStore:
+    """Outbox store which keeps messages in sqlite database.
+
+    To store message in the same transaction as application's changes, pass
+    application's connection to `append`, then message is committed (or
+    rolled back) along with them.
+
+    """
+
+    path: pathlib.Path
+
+    def __post_init__(self) -> None:
+        """Create outbox tables adding columns missing in older ones."""
+        with self.connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS sns_sqs_outbox ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "body TEXT NOT NULL, "
+                "metadata TEXT NOT NULL, "
+                "attempts INTEGER NOT NULL DEFAULT 0, "
+                "prepared TEXT"
+                ")",
+            )
+            columns = {
+                row[1]
+                for row in connection.execute(
+                    "PRAGMA table_info(sns_sqs_outbox)",
+                )
+            }
+            if "attempts" not in columns:
+                connection.execute(
+                    "ALTER TABLE sns_sqs_outbox "
+                    "ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0",
+                )
+            if "prepared" not in columns:
+                connection.execute(
+                    "ALTER TABLE sns_sqs_outbox ADD COLUMN prepared TEXT",
+                )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS sns_sqs_outbox_dead_letter ("
+                "id INTEGER PRIMARY KEY, "
+                "body TEXT NOT NULL, "
+                "metadata TEXT NOT NULL, "
+                "attempts INTEGER NOT NULL, "
+                "prepared TEXT, "
+                "error TEXT NOT NULL"
+                ")",
+            )
+
+    @contextlib.contextmanager
+    def connect(self) -> collections.abc.Iterator[sqlite3.Connection]:
+        """Open connection and commit changes made with it."""
+        with (
+            contextlib.closing(sqlite3.connect(self.path)) as connection,
+            connection,
+        ):
+            yield connection
+
+    def append(
+        self,
+        body: dict[str, typing.Any],
+        metadata: dict[str, str],
+        connection: sqlite3.Connection | None = None,
+    ) -> None:
+        """Store message, in transaction of `connection` if it's passed."""
+        with contextlib.ExitStack() as stack:
+            if not connection:
+                connection = stack.enter_context(self.connect())
+            connection.execute(
+                "INSERT INTO sns_sqs_outbox (body, metadata) VALUES (?, ?)",
+                (ujson.dumps(body), ujson.dumps(metadata)),
+            )
+
+    def fetch(self, limit: int) -> list[OutboxEntry]:
+        """Get oldest stored messages."""
+        with self.connect() as connection:
+            rows = connection.execute(
+                "SELECT id, body, metadata, attempts, prepared "
+                "FROM sns_sqs_outbox ORDER BY id LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [self.load_entry(*row) for row in rows]
+
+    def fetch_dead_letters(self, limit: int) -> list[OutboxDeadLetter]:
+        """Get oldest messages which have been given up on."""
+        with self.connect() as connection:
+            rows = connection.execute(
+                "SELECT id, body, metadata, attempts, prepared, error "
+                "FROM sns_sqs_outbox_dead_letter ORDER BY id LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [
+            OutboxDeadLetter(entry=self.load_entry(*row), error=error)
+            for *row, error in rows
+        ]
+
+    def delete(self, entry_ids: collections.abc.Sequence[int]) -> None:
+        """Delete published messages."""
+        with self.connect() as connection:
+            connection.executemany(
+                "DELETE FROM sns_sqs_outbox WHERE id = ?",
+                [(entry_id,) for entry_id in entry_ids],
+            )
+
+    def retry_later(
+        self,
+        prepared_messages: collections.abc.Mapping[
+            int,
+            prepared.PreparedMessage,
+        ],
+        count_attempt: bool = True,
+    ) -> None:
+        """Keep prepared form of messages counting failed attempt."""
+        with self.connect() as connection:
+            connection.executemany(
+                "UPDATE sns_sqs_outbox "
+                "SET attempts = attempts + ?, prepared = ? WHERE id = ?",
+                [
+                    (
+                        int(count_attempt),
+                        ujson.dumps(dataclasses.asdict(prepared_message)),
+                        entry_id,
+                    )
+                    for entry_id, prepared_message in prepared_messages.items()
+                ],
+            )
+
+    def dead_letter(self, errors: collections.abc.Mapping[int, str]) -> None:
+        """Move messages which can't be published to dead letters."""
+        with self.connect() as connection:
+            connection.executemany(
+                "INSERT INTO sns_sqs_outbox_dead_letter "
+                "(id, body, metadata, attempts, prepared, error) "
+                "SELECT id, body, metadata, attempts + 1, prepared, ? "
+                "FROM sns_sqs_outbox WHERE id = ?",
+                [(error, entry_id) for entry_id, error in errors.items()],
+            )
+            connection.executemany(
+                "DELETE FROM sns_sqs_outbox WHERE id = ?",
+                [(entry_id,) for entry_id in errors],
+            )
+
+    @staticmethod
+    def load_entry(
+        entry_id: int,
+        body: str,
+        metadata: str,
+        attempts: int,
+        prepared_message: str | None,
+    ) -> OutboxEntry:
+        """Load entry from row."""
+        return OutboxEntry(
+            id=entry_id,
+            body=ujson.loads(body),
+            metadata=ujson.loads(metadata),
+            attempts=attempts,
+            prepared_message=(
+                prepared.PreparedMessage(**ujson.loads(prepared_message))
+                if prepared_message
+                else None
+            ),
+        )
+
+
+class Outbox:
+    """Outbox which decouples publishing of messages from requests.
+
+    Messages are appended to durable store and published to topic by
+    background flusher in batches. Message is deleted from store only after
+    it has been published, so every message is published at least once,
+    even if process crashes in between. Messages rejected as invalid or
+    failed `max_attempts` times are moved to dead letters, so they don't
+    block the rest of outbox. Failures of the whole call, like outage or
+    throttling of SNS, don't count as attempts, flusher backs off instead.
+
+    Usage:
+        ```python
+        outbox = Outbox(store=SQLiteOutboxStore(path), topic=topic)
+        # In request handler
+        outbox.store.append(body, metadata, connection=connection)
+        # In background task
+        await outbox.run(logger=logger)
+        ```
+
+    """
+
+    def __init__(
+        self,
+        store: OutboxStoreProtocol,
+        topic: topic.SNSTopic,
+        batch_size: int = 100,
+        poll_interval_seconds: float = 1.0,
+        max_attempts: int = 5,
+        max_backoff_seconds: float = 60.0,
+    ) -> None:
+        self.store = store
+        self.topic = topic
+        self.batch_size = batch_size
+        self.poll_interval_seconds = poll_interval_seconds
+        self.max_attempts = max_attempts
+        self.max_backoff_seconds = max_backoff_seconds
+
+    @metrics.tracker
+    async def put(
+        self,
+        body: dict[str, typing.Any],
+        metadata: dict[str, str] | None = None,
+    ) -> None:
+        """Append message to outbox."""
+        await anyio.to_thread.run_sync(
+            self.store.append,
+            body,
+            metadata or {},
+        )
+
+    @metrics.tracker
+    async def flush(self) -> int:
+        """Publish oldest messages from outbox.
+
+        Returns number of published messages. Oldest messages are fetched
+        first, so messages which failed to be published are retried before
+        newer ones, until they run out of attempts. If the whole call fails,
+        the rest of messages isn't sent and its error is raised, while
+        attempts of messages stay the same.
+
+        """
+        entries = await anyio.to_thread.run_sync(
+            self.store.fetch,
+            self.batch_size,
+        )
+        if not entries:
+            return 0
+        prepared_messages = [
+            entry.prepared_message
+            or await self.topic.prepare(entry.body, entry.metadata)
+            for entry in entries
+        ]
+        published_entry_ids: list[int] = []
+        retried: dict[int, prepared.PreparedMessage] = {}
+        dead_letters: dict[int, str] = {}
+        call_error: Exception | None = None
+        # Send batches one by one, so messages of batch aren't published
+        # before the ones of previous batch
+        for batch in batching.split_into_batches(prepared_messages):
+            results = await batching.send_batch(
+                send=self.topic.publish_prepared_batch,
+                prepared_messages=batch,
+            )
+            for entry_index, result in results.items():
+                entry = entries[int(entry_index)]
+                if not isinstance(result, Exception):
+                    published_entry_ids.append(entry.id)
+                elif not isinstance(result, batching.BatchEntryError):
+                    call_error = result
+                elif (
+                    result.sender_fault
+                    or entry.attempts + 1 >= self.max_attempts
+                ):
+                    dead_letters[entry.id] = str(result)
+                else:
+                    retried[entry.id] = batch[entry_index]
+            if call_error:
+                break
+        await self._store_results(
+            published_entry_ids=published_entry_ids,
+            retried=retried,
+            dead_letters=dead_letters,
+        )
+        if call_error:
+            await self._keep_unsent(
+                entries=entries,
+                prepared_messages=prepared_messages,
+                handled_entry_ids={
+                    *published_entry_ids,
+                    *retried,
+                    *dead_letters,
+                },
+            )
+            raise call_error
+        return len(published_entry_ids)
+
+    async def _store_results(
+        self,
+        published_entry_ids: list[int],
+        retried: dict[int, prepared.PreparedMessage],
+        dead_letters: dict[int, str],
+    ) -> None:
+        """Delete published messages and count attempts of failed ones."""
+        await anyio.to_thread.run_sync(
+            self.store.delete,
+            published_entry_ids,
+        )
+        if retried:
+            await anyio.to_thread.run_sync(self.store.retry_later, retried)
+        if dead_letters:
+            await anyio.to_thread.run_sync(
+                self.store.dead_letter,
+                dead_letters,
+            )
+            metrics.counter(
+                "sns_sqs_communicator.outbox.dead_letters",
+                value=len(dead_letters),
+                topic_arn=self.topic.topic_arn,
+            )
+
+    async def _keep_unsent(
+        self,
+        entries: list[OutboxEntry],
+        prepared_messages: list[prepared.PreparedMessage],
+        handled_entry_ids: set[int],
+    ) -> None:
+        """Keep prepared messages which haven't been sent without attempt.
+
+        Their bodies aren't offloaded again on next flush.
+
+        """
+        await anyio.to_thread.run_sync(
+            functools.partial(
+                self.store.retry_later,
+                {
+                    entry.id: prepared_message
+                    for entry, prepared_message in zip(
+                        entries,
+                        prepared_messages,
+                        strict=True,
+                    )
+                    if entry.id not in handled_entry_ids
+                },
+                count_attempt=False,
+            ),
+        )
+
+    async def run(self, logger: logging.Logger) -> None:  # pragma: no cover
+        """Flush outbox until cancelled.
+
+        Flusher backs off exponentially while flushes fail.
+
+        """
+        failures_count = 0
+        while True:
+            try:
+                published_count = await self.flush()
+            except Exception:
+                logger.exception("Failed to flush outbox")
+                failures_count += 1
+                await anyio.sleep(
+                    min(
+                        self.poll_interval_seconds * 2**failures_count,
+                        self.max_backoff_seconds,
+                    ),
+                )
+                continue
+            failures_count = 0
+            if published_count < self.batch_size:
+                await anyio.sleep(self.poll_interval_seconds)
@@ -1,9 +1,14 @@
+from .batch import ParsedEnvelope, ParsingResult, parse_many
 from .protocol import ParserProtocol
 from .sns import SNSParser
-from .sqs import SQSParser
+from .sqs import SNSRawDeliveryParser, SQSParser
 
 __all__ = (
+    "ParsedEnvelope",
     "ParserProtocol",
+    "ParsingResult",
     "SNSParser",
+    "SNSRawDeliveryParser",
     "SQSParser",
+    "parse_many",
 )
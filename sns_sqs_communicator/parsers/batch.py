@@ -0,0 +1,158 @@
+import collections
+import collections.abc
+import dataclasses
+import functools
+import typing
+
+import pydantic
+import ujson
+
+from .. import messages, metrics, schemas
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    from . import protocol
+
+
+@dataclasses.dataclass(frozen=True)
+class ParsedEnvelope:
+    """Attributes of raw message which are read before its body."""
+
+    type: str
+    action: str
+    body_loader: collections.abc.Callable[[], str]
+    schema_version: int = schemas.DEFAULT_SCHEMA_VERSION
+
+
+@dataclasses.dataclass(frozen=True)
+class ParsingResult(typing.Generic[messages.MessageActionT]):
+    """Result of parsing of single message from batch."""
+
+    raw_message: typing.Any
+    message: (
+        messages.BaseMessage[
+            schemas.QueueBodySchema,
+            messages.MessageActionT,
+        ]
+        | None
+    ) = None
+    exception: Exception | None = None
+
+    @property
+    def is_ok(self) -> bool:
+        """Check if message has been parsed."""
+        return self.exception is None
+
+
+@functools.cache
+def get_list_adapter(
+    schema_class: type[schemas.QueueBodySchema],
+) -> pydantic.TypeAdapter[list[schemas.QueueBodySchema]]:
+    """Get cached adapter which validates list of bodies of schema."""
+    return pydantic.TypeAdapter(list[schema_class])  # type: ignore
+
+
+@metrics.tracker
+def validate_bodies(
+    schema_class: type[schemas.QueueBodySchema],
+    bodies: collections.abc.Sequence[typing.Any],
+) -> list[schemas.QueueBodySchema | Exception]:
+    """Validate decoded bodies of the same schema in one step.
+
+    If any of bodies is invalid, falls back to validation of bodies one by
+    one to find out which of them have failed.
+
+    """
+    try:
+        return list(get_list_adapter(schema_class).validate_python(bodies))
+    except pydantic.ValidationError:
+        pass
+    results: list[schemas.QueueBodySchema | Exception] = []
+    for body in bodies:
+        try:
+            results.append(schema_class.model_validate(body))
+        except pydantic.ValidationError as error:
+            results.append(error)
+    return results
+
+
+@metrics.tracker
+def parse_many(
+    parser: type["protocol.ParserProtocol[messages.MessageActionT]"],
+    raw_messages: collections.abc.Sequence[typing.Any],
+) -> list[ParsingResult[messages.MessageActionT]]:
+    """Parse batch of raw messages.
+
+    Messages are grouped by type and bodies of each group are validated
+    at once. Failures are reported per message, so one broken message
+    doesn't affect the rest of batch. Results keep order of `raw_messages`.
+
+    """
+    results: dict[int, ParsingResult[messages.MessageActionT]] = {}
+    groups: collections.defaultdict[
+        str,
+        list[tuple[int, messages.MessageActionT, typing.Any]],
+    ] = collections.defaultdict(list)
+    for index, raw_message in enumerate(raw_messages):
+        try:
+            envelope = parser.parse_envelope(raw_message)
+            schema_class = schemas.QueueBodySchema.get_schema_by_message_type(
+                message_type=envelope.type,
+            )
+            action = parser.message_action_enum(  # type: ignore
+                envelope.action,
+            )
+            if parser.lazy_body:
+                results[index] = ParsingResult(
+                    raw_message=raw_message,
+                    message=messages.LazyMessage(
+                        body_loader=envelope.body_loader,
+                        schema_class=schema_class,
+                        action=action,
+                        type=envelope.type,
+                        body_schema_version=envelope.schema_version,
+                    ),
+                )
+                continue
+            groups[envelope.type].append(
+                (
+                    index,
+                    action,
+                    schema_class.upgrade_body(
+                        ujson.loads(envelope.body_loader()),
+                        from_version=envelope.schema_version,
+                    ),
+                ),
+            )
+        except Exception as exception:  # noqa: BLE001
+            results[index] = ParsingResult(
+                raw_message=raw_message,
+                exception=exception,
+            )
+
+    for message_type, group in groups.items():
+        body_schemas = validate_bodies(
+            schema_class=schemas.QueueBodySchema.get_schema_by_message_type(
+                message_type=message_type,
+            ),
+            bodies=[body for _, _, body in group],
+        )
+        for (index, action, _), body_schema in zip(
+            group,
+            body_schemas,
+            strict=True,
+        ):
+            if isinstance(body_schema, Exception):
+                results[index] = ParsingResult(
+                    raw_message=raw_messages[index],
+                    exception=body_schema,
+                )
+                continue
+            results[index] = ParsingResult(
+                raw_message=raw_messages[index],
+                message=messages.Message(
+                    body_schema=body_schema,
+                    action=action,
+                    type=message_type,
+                ),
+            )
+    return [results[index] for index in range(len(raw_messages))]
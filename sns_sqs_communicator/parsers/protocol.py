@@ -1,6 +1,8 @@
+import collections.abc
 import typing
 
-from .. import messages, schemas
+from .. import claim_check, messages, schemas
+from . import batch
 
 
 class ParserProtocol(
@@ -15,18 +17,38 @@ class ParserProtocol(
     """
 
     message_action_enum: type[messages.MessageActionT]
+    # Defer decoding and validation of body until `body_schema` is accessed
+    lazy_body: bool
+    # Retrieves bodies which were offloaded to blob store
+    claim_check_config: claim_check.ClaimCheckConfig | None = None
 
     @classmethod
     def parse(
         cls,
         raw_message: typing.Any,
-    ) -> messages.Message[
+    ) -> messages.BaseMessage[
         schemas.QueueBodySchema,
         messages.MessageActionT,
     ]:
         """Parse message."""
         ...  # pragma: no cover
 
+    @classmethod
+    def parse_many(
+        cls,
+        raw_messages: collections.abc.Sequence[typing.Any],
+    ) -> list[batch.ParsingResult[messages.MessageActionT]]:
+        """Parse batch of messages reporting failures per message."""
+        ...  # pragma: no cover
+
+    @classmethod
+    def parse_envelope(
+        cls,
+        raw_message: typing.Any,
+    ) -> batch.ParsedEnvelope:
+        """Parse attributes of message deferring reading of body."""
+        ...  # pragma: no cover
+
     @classmethod
     def get_raw_body(
         cls,
@@ -34,3 +56,19 @@ class ParserProtocol(
     ) -> dict[str, typing.Any]:
         """Retrieve body from raw message."""
         ...  # pragma: no cover
+
+    @classmethod
+    def get_claim_check_key(
+        cls,
+        raw_message: typing.Any,
+    ) -> str | None:
+        """Retrieve key of offloaded body if message has it."""
+        return None
+
+    @classmethod
+    def get_metadata(
+        cls,
+        raw_message: typing.Any,
+    ) -> dict[str, str]:
+        """Retrieve string attributes of message."""
+        return {}
@@ -1,11 +1,13 @@
+import collections.abc
+import functools
 import typing
 
 import ujson
 
 import mypy_boto3_sqs.type_defs
 
-from .. import messages, metrics, schemas
-from . import protocol
+from .. import claim_check, compression, messages, metrics, schemas
+from . import batch, protocol
 
 
 class SNSParser(
@@ -14,16 +16,59 @@ class SNSParser(
 ):
     """Parser for SQS messages sent by SNS."""
 
+    lazy_body: bool = False
+    claim_check_config: claim_check.ClaimCheckConfig | None = None
+
     @classmethod
     @metrics.tracker
     def parse(
         cls,
         raw_message: mypy_boto3_sqs.type_defs.MessageTypeDef,
-    ) -> messages.Message[
+    ) -> messages.BaseMessage[
         schemas.QueueBodySchema,
         messages.MessageActionT,
     ]:
         """Deserialize message."""
+        envelope = cls.parse_envelope(raw_message)
+        schema_class = schemas.QueueBodySchema.get_schema_by_message_type(
+            message_type=envelope.type,
+        )
+        action = cls.message_action_enum(envelope.action)  # type: ignore
+        if cls.lazy_body:
+            return messages.LazyMessage(
+                body_loader=envelope.body_loader,
+                schema_class=schema_class,
+                action=action,
+                type=envelope.type,
+                body_schema_version=envelope.schema_version,
+            )
+        return messages.Message(
+            body_schema=schema_class.validate_body(
+                envelope.body_loader(),
+                from_version=envelope.schema_version,
+            ),
+            action=action,
+            type=envelope.type,
+        )
+
+    @classmethod
+    @metrics.tracker
+    def parse_many(
+        cls,
+        raw_messages: collections.abc.Sequence[
+            mypy_boto3_sqs.type_defs.MessageTypeDef
+        ],
+    ) -> list[batch.ParsingResult[messages.MessageActionT]]:
+        """Parse batch of messages validating bodies by groups."""
+        return batch.parse_many(cls, raw_messages)
+
+    @classmethod
+    @metrics.tracker
+    def parse_envelope(
+        cls,
+        raw_message: mypy_boto3_sqs.type_defs.MessageTypeDef,
+    ) -> batch.ParsedEnvelope:
+        """Parse attributes of message deferring reading of body."""
         if not (body := raw_message.get("Body")):
             raise KeyError(
                 "No body has been found in message",
@@ -32,24 +77,23 @@ class SNSParser(
         # SNS wraps actual body into another one, but we need this outer body
         # to parse attributes from it.
         wrapping_sns_body: dict[str, typing.Any] = ujson.loads(body)
-        message_type = cls.get_message_attribute_value(
-            wrapping_sns_body,
-            "type",
-        )
-        schema_class = schemas.QueueBodySchema.get_schema_by_message_type(
-            message_type=message_type,
-        )
-        return messages.Message(
-            body_schema=schema_class(
-                **ujson.loads(cls.get_raw_body(raw_message)),
+        return batch.ParsedEnvelope(
+            type=cls.get_message_attribute_value(wrapping_sns_body, "type"),
+            action=cls.get_message_attribute_value(
+                wrapping_sns_body,
+                "action",
+            ),
+            body_loader=functools.partial(
+                cls.get_body_content,
+                wrapping_sns_body,
             ),
-            action=cls.message_action_enum(  # type: ignore
-                cls.get_message_attribute_value(
+            schema_version=int(
+                cls.get_optional_message_attribute_value(
                     wrapping_sns_body,
-                    "action",
-                ),
+                    schemas.SCHEMA_VERSION_ATTRIBUTE,
+                )
+                or schemas.DEFAULT_SCHEMA_VERSION,
             ),
-            type=message_type,
         )
 
     @classmethod
@@ -64,7 +108,76 @@ class SNSParser(
                 "No body has been found in message",
             )  # pragma: no cover
 
-        return ujson.loads(body)["Message"]
+        return cls.get_body_content(ujson.loads(body))
+
+    @classmethod
+    @metrics.tracker
+    def get_body_content(
+        cls,
+        wrapping_sns_body: dict[str, typing.Any],
+    ) -> str:
+        """Retrieve body content from SNS wrapping body decompressing it."""
+        body: str = wrapping_sns_body["Message"]
+        if claim_check_key := cls.get_optional_message_attribute_value(
+            wrapping_sns_body,
+            claim_check.CLAIM_CHECK_ATTRIBUTE,
+        ):
+            body = cls.retrieve_claim_check(claim_check_key)
+        if content_encoding := cls.get_optional_message_attribute_value(
+            wrapping_sns_body,
+            compression.CONTENT_ENCODING_ATTRIBUTE,
+        ):
+            return compression.decompress(body, content_encoding)
+        return body
+
+    @classmethod
+    def get_claim_check_key(
+        cls,
+        raw_message: mypy_boto3_sqs.type_defs.MessageTypeDef,
+    ) -> str | None:
+        """Retrieve key of offloaded body if message has it."""
+        if not (body := raw_message.get("Body")):
+            raise KeyError(
+                "No body has been found in message",
+            )  # pragma: no cover
+
+        return cls.get_optional_message_attribute_value(
+            ujson.loads(body),
+            claim_check.CLAIM_CHECK_ATTRIBUTE,
+        )
+
+    @classmethod
+    def get_metadata(
+        cls,
+        raw_message: mypy_boto3_sqs.type_defs.MessageTypeDef,
+    ) -> dict[str, str]:
+        """Retrieve string attributes of message from SNS wrapping body."""
+        if not (body := raw_message.get("Body")):
+            raise KeyError(
+                "No body has been found in message",
+            )  # pragma: no cover
+
+        return {
+            key: attr["Value"]
+            for key, attr in ujson.loads(body)
+            .get("MessageAttributes", {})
+            .items()
+            if attr.get("Type") == "String"
+        }
+
+    @classmethod
+    @metrics.tracker
+    def retrieve_claim_check(
+        cls,
+        claim_check_key: str,
+    ) -> str:
+        """Retrieve offloaded body from blob store."""
+        if not cls.claim_check_config:
+            raise claim_check.ClaimCheckNotConfiguredError(
+                f"Unable to retrieve {claim_check_key}, since "
+                "`claim_check_config` is not set",
+            )
+        return cls.claim_check_config.retrieve(claim_check_key)
 
     @staticmethod
     @metrics.tracker
@@ -89,3 +202,14 @@ class SNSParser(
             )  # pragma: no cover
 
         return attr_string_value
+
+    @staticmethod
+    def get_optional_message_attribute_value(
+        raw_message: dict[str, typing.Any],
+        attr_name: str,
+    ) -> str | None:
+        """Retrieve message attribute value by name if it's present."""
+        message_attrs = raw_message.get("MessageAttributes", {})
+        if attr := message_attrs.get(attr_name):
+            return attr.get("Value")
+        return None
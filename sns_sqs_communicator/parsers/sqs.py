@@ -1,11 +1,13 @@
+import collections.abc
+import functools
 import typing
 
 import ujson
 
 import mypy_boto3_sqs.type_defs
 
-from .. import messages, metrics, schemas
-from . import protocol
+from .. import claim_check, compression, messages, metrics, schemas
+from . import batch, protocol
 
 
 class SQSParser(
@@ -14,27 +16,73 @@ class SQSParser(
 ):
     """Parser for SQS messages sent by service directly."""
 
+    lazy_body: bool = False
+    claim_check_config: claim_check.ClaimCheckConfig | None = None
+
     @classmethod
     @metrics.tracker
     def parse(
         cls,
         raw_message: mypy_boto3_sqs.type_defs.MessageTypeDef,
-    ) -> messages.Message[
+    ) -> messages.BaseMessage[
         schemas.QueueBodySchema,
         messages.MessageActionT,
     ]:
         """Parse message."""
-        parsed_body: dict[str, typing.Any] = cls.get_raw_body(raw_message)
-        message_type = cls.get_message_attribute_value(raw_message, "type")
+        envelope = cls.parse_envelope(raw_message)
         schema_class = schemas.QueueBodySchema.get_schema_by_message_type(
-            message_type=message_type,
+            message_type=envelope.type,
         )
+        action = cls.message_action_enum(envelope.action)  # type: ignore
+        if cls.lazy_body:
+            return messages.LazyMessage(
+                body_loader=envelope.body_loader,
+                schema_class=schema_class,
+                action=action,
+                type=envelope.type,
+                body_schema_version=envelope.schema_version,
+            )
         return messages.Message(
-            body_schema=schema_class(**parsed_body),
-            action=cls.message_action_enum(  # type: ignore
-                cls.get_message_attribute_value(raw_message, "action"),
+            body_schema=schema_class.validate_body(
+                envelope.body_loader(),
+                from_version=envelope.schema_version,
+            ),
+            action=action,
+            type=envelope.type,
+        )
+
+    @classmethod
+    @metrics.tracker
+    def parse_many(
+        cls,
+        raw_messages: collections.abc.Sequence[
+            mypy_boto3_sqs.type_defs.MessageTypeDef
+        ],
+    ) -> list[batch.ParsingResult[messages.MessageActionT]]:
+        """Parse batch of messages validating bodies by groups."""
+        return batch.parse_many(cls, raw_messages)
+
+    @classmethod
+    @metrics.tracker
+    def parse_envelope(
+        cls,
+        raw_message: mypy_boto3_sqs.type_defs.MessageTypeDef,
+    ) -> batch.ParsedEnvelope:
+        """Parse attributes of message deferring reading of body."""
+        return batch.ParsedEnvelope(
+            type=cls.get_message_attribute_value(raw_message, "type"),
+            action=cls.get_message_attribute_value(raw_message, "action"),
+            body_loader=functools.partial(
+                cls.get_body_content,
+                raw_message,
+            ),
+            schema_version=int(
+                cls.get_optional_message_attribute_value(
+                    raw_message,
+                    schemas.SCHEMA_VERSION_ATTRIBUTE,
+                )
+                or schemas.DEFAULT_SCHEMA_VERSION,
             ),
-            type=message_type,
         )
 
     @classmethod
@@ -44,12 +92,65 @@ class SQSParser(
         raw_message: mypy_boto3_sqs.type_defs.MessageTypeDef,
     ) -> typing.Any:
         """Retrieve body from raw message."""
+        return ujson.loads(cls.get_body_content(raw_message))
+
+    @classmethod
+    @metrics.tracker
+    def get_body_content(
+        cls,
+        raw_message: mypy_boto3_sqs.type_defs.MessageTypeDef,
+    ) -> str:
+        """Retrieve body content from raw message decompressing it."""
         if not (body := raw_message.get("Body")):
             raise KeyError(
                 "No body has been found in message",
             )  # pragma: no cover
 
-        return ujson.loads(body)
+        if claim_check_key := cls.get_claim_check_key(raw_message):
+            body = cls.retrieve_claim_check(claim_check_key)
+        if content_encoding := cls.get_optional_message_attribute_value(
+            raw_message,
+            compression.CONTENT_ENCODING_ATTRIBUTE,
+        ):
+            return compression.decompress(body, content_encoding)
+        return body
+
+    @classmethod
+    def get_claim_check_key(
+        cls,
+        raw_message: mypy_boto3_sqs.type_defs.MessageTypeDef,
+    ) -> str | None:
+        """Retrieve key of offloaded body if message has it."""
+        return cls.get_optional_message_attribute_value(
+            raw_message,
+            claim_check.CLAIM_CHECK_ATTRIBUTE,
+        )
+
+    @classmethod
+    def get_metadata(
+        cls,
+        raw_message: mypy_boto3_sqs.type_defs.MessageTypeDef,
+    ) -> dict[str, str]:
+        """Retrieve string attributes of message."""
+        return {
+            key: attr["StringValue"]
+            for key, attr in raw_message.get("MessageAttributes", {}).items()
+            if "StringValue" in attr
+        }
+
+    @classmethod
+    @metrics.tracker
+    def retrieve_claim_check(
+        cls,
+        claim_check_key: str,
+    ) -> str:
+        """Retrieve offloaded body from blob store."""
+        if not cls.claim_check_config:
+            raise claim_check.ClaimCheckNotConfiguredError(
+                f"Unable to retrieve {claim_check_key}, since "
+                "`claim_check_config` is not set",
+            )
+        return cls.claim_check_config.retrieve(claim_check_key)
 
     @staticmethod
     @metrics.tracker
@@ -74,3 +175,28 @@ class SQSParser(
             )  # pragma: no cover
 
         return attr_string_value
+
+    @staticmethod
+    def get_optional_message_attribute_value(
+        raw_message: mypy_boto3_sqs.type_defs.MessageTypeDef,
+        attr_name: str,
+    ) -> str | None:
+        """Retrieve message attribute value by name if it's present."""
+        message_attrs = raw_message.get("MessageAttributes", {})
+        if attr := message_attrs.get(attr_name):
+            return attr.get("StringValue")
+        return None
+
+
+class SNSRawDeliveryParser(
+    SQSParser[messages.MessageActionT],
+    typing.Generic[messages.MessageActionT],
+):
+    """Parser for SQS messages sent by SNS with raw message delivery.
+
+    With `RawMessageDelivery` enabled for subscription, SNS sends message
+    body as is and converts its attributes into native SQS message
+    attributes, so such messages have the same format as messages sent to
+    SQS directly and skip decoding of SNS envelope.
+
+    """
@@ -0,0 +1,91 @@
+import dataclasses
+import typing
+
+import anyio
+import ujson
+
+from . import (
+    claim_check,
+    compression,
+    fifo_attributes_creator,
+    metrics,
+    tracing,
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class PreparedMessage:
+    """Message which body is serialized and ready to be sent.
+
+    It could be sent to several queues and topics without serializing it
+    again, as long as they use the same FIFO attributes creator. Offloaded
+    bodies are shared between all receivers, so claim check config should
+    not delete them after acknowledgment in such case.
+
+    """
+
+    body: str
+    metadata: dict[str, str]
+    # MessageGroupId and MessageDeduplicationId for FIFO queues and topics
+    fifo_attributes: dict[str, str] = dataclasses.field(default_factory=dict)
+
+
+@metrics.tracker
+async def prepare_message(
+    body: dict[str, typing.Any],
+    metadata: dict[str, str],
+    fifo_attrs_creator: (
+        fifo_attributes_creator.FifoAttributesCreatorProtocol | None
+    ) = None,
+    compression_config: compression.CompressionConfig | None = None,
+    claim_check_config: claim_check.ClaimCheckConfig | None = None,
+) -> PreparedMessage:
+    """Serialize body once and build everything needed to send it.
+
+    FIFO deduplication id is computed over the same serialized body which is
+    sent, so body is never serialized twice. Context of current trace is
+    added to metadata after FIFO attributes are computed, so it doesn't
+    affect deduplication.
+
+    """
+    message_body = ujson.dumps(body)
+    fifo_attributes = {}
+    if fifo_attrs_creator:
+        fifo_attributes["MessageGroupId"] = (
+            fifo_attrs_creator.get_message_group_id(
+                body,
+                metadata,
+            )
+        )
+        # Creators written before bodies were serialized once have to
+        # serialize it again
+        get_encoded_deduplication_id = getattr(
+            fifo_attrs_creator,
+            "get_encoded_message_deduplication_id",
+            None,
+        )
+        fifo_attributes["MessageDeduplicationId"] = (
+            get_encoded_deduplication_id(message_body.encode(), metadata)
+            if get_encoded_deduplication_id
+            else fifo_attrs_creator.get_message_deduplication_id(
+                body,
+                metadata,
+            )
+        )
+    message_metadata = tracing.tracer.inject(metadata)
+    if compression_config:
+        message_body, message_metadata = compression_config.compress(
+            message_body,
+            message_metadata,
+        )
+    if claim_check_config:
+        message_body, message_metadata = await anyio.to_thread.run_sync(
+            claim_check_config.offload,
+            message_body,
+            message_metadata,
+        )
+    return PreparedMessage(
+        body=message_body,
+        metadata=message_metadata,
+        fifo_attributes=fifo_attributes,
+    )
@@ -1,5 +1,7 @@
 from .core import (
+    ActionHandler,
     CancelProcessingError,
+    DispatchTableReport,
     ProcessingResult,
     ProcessingResultReturnT,
     ProcessingResultStatus,
@@ -8,7 +10,9 @@ from .core import (
 )
 
 __all__ = (
+    "ActionHandler",
     "CancelProcessingError",
+    "DispatchTableReport",
     "ProcessingResult",
     "ProcessingResultReturnT",
     "ProcessingResultStatus",
@@ -1,15 +1,18 @@
 import collections
 import collections.abc
 import contextlib
+import dataclasses
 import enum
+import inspect
 import logging
+import types
 import typing
 
 import pydantic
 
 import mypy_boto3_sqs.type_defs
 
-from .. import messages, metrics, parsers, schemas
+from .. import lifecycle, messages, metrics, parsers, schemas, tracing
 
 ProcessorT = typing.TypeVar(
     "ProcessorT",
@@ -88,6 +91,30 @@ class ProcessingResult(
         raise self.exception
 
 
+ActionHandler: typing.TypeAlias = collections.abc.Callable[
+    ...,
+    collections.abc.Awaitable[typing.Any],
+]
+
+
+@dataclasses.dataclass(frozen=True)
+class DispatchTableReport:
+    """Report of issues found during dispatch table compilation."""
+
+    # Pairs of (type, action) which have no method defined in processor
+    missing_actions: tuple[tuple[str, str], ...] = ()
+    # Types of processors which have no registered schema, so their
+    # messages are always cancelled before reaching processor
+    unreachable_processors: tuple[str, ...] = ()
+    # Types of schemas which have no registered processor
+    missing_processors: tuple[str, ...] = ()
+
+    @property
+    def is_complete(self) -> bool:
+        """Check that every registered type could be processed."""
+        return not (self.unreachable_processors or self.missing_processors)
+
+
 class Processor(
     typing.Generic[
         schemas.QueueBodySchemaT,
@@ -103,6 +130,13 @@ class Processor(
             "Processor[typing.Any, typing.Any]",
         ]
     ] = {}
+    # Unbound action methods keyed by (class of processor, action)
+    dispatch_table: typing.ClassVar[
+        dict[
+            tuple[type["Processor[typing.Any, typing.Any]"], str],
+            ActionHandler,
+        ]
+    ] = {}
 
     def init_other(
         self,
@@ -144,22 +178,51 @@ class Processor(
         parser: type[parsers.ParserProtocol[messages.MessageActionT]],
         logger: logging.Logger,
     ) -> ProcessingResult[typing.Any]:
-        """Process raw message."""
-        try:
-            message = parser.parse(raw_message)
-        except schemas.QueueBodySchemaNotRegisteredError as not_found_error:
-            logger.info(f"Cancelled, reason: {not_found_error!s}")
-            return ProcessingResult[typing.Any](
-                status=ProcessingResultStatus.canceled,
-                message=str(not_found_error),
-                result=None,
-                exception=not_found_error,
-            )
-        processor = cls.get(message_type=message.type)
-        return await processor(
-            message=message,
-            logger=logger,
-        )
+        """Process raw message.
+
+        Offloaded body is fetched beforehand, so neither parsing nor lazy
+        loading of body in handler blocks event loop.
+
+        """
+        async with cls.prefetch_claim_check(raw_message, parser):
+            try:
+                with (
+                    tracing.tracer.start_span("parse"),
+                    lifecycle.measure(lifecycle.Stage.parse),
+                ):
+                    message = parser.parse(raw_message)
+            except schemas.QueueBodySchemaNotRegisteredError as error:
+                logger.info(f"Cancelled, reason: {error!s}")
+                return ProcessingResult[typing.Any](
+                    status=ProcessingResultStatus.canceled,
+                    message=str(error),
+                    result=None,
+                    exception=error,
+                )
+            lifecycle.set_labels(message.type, message.action)
+            processor = cls.get(message_type=message.type)
+            with tracing.tracer.start_span(
+                "dispatch",
+                attributes={"type": message.type, "action": message.action},
+            ):
+                return await processor(
+                    message=message,
+                    logger=logger,
+                )
+
+    @staticmethod
+    def prefetch_claim_check(
+        raw_message: mypy_boto3_sqs.type_defs.MessageTypeDef,
+        parser: type[parsers.ParserProtocol[messages.MessageActionT]],
+    ) -> contextlib.AbstractAsyncContextManager[None]:
+        """Fetch offloaded body of message while it's processed."""
+        # Parsers written before claim checks don't have config
+        claim_check_config = getattr(parser, "claim_check_config", None)
+        if claim_check_config and (
+            claim_check_key := parser.get_claim_check_key(raw_message)
+        ):
+            return claim_check_config.prefetch(claim_check_key)
+        return contextlib.nullcontext()
 
     @classmethod
     def get(
@@ -174,10 +237,68 @@ class Processor(
             f"No event processors are registered for key {registry_key}",
         )
 
+    @classmethod
+    def compile_dispatch_table(
+        cls,
+        message_action_enum: type[enum.StrEnum],
+    ) -> DispatchTableReport:
+        """Precompute action methods of registered processors.
+
+        Once compiled, processors resolve actions with a single dict lookup
+        instead of `getattr` and all gaps in registry are reported up front.
+        Methods are stored unbound, so they are bound to processor which
+        handles message, and only plain methods are stored.
+
+        """
+        dispatch_table: dict[
+            tuple[type[Processor[typing.Any, typing.Any]], str],
+            ActionHandler,
+        ] = {}
+        missing_actions: list[tuple[str, str]] = []
+        for for_type, processor in cls.registry.items():
+            processor_class = type(processor)
+            for action in message_action_enum:
+                handler = inspect.getattr_static(
+                    processor_class,
+                    action.value,
+                    None,
+                )
+                if isinstance(handler, types.FunctionType):
+                    dispatch_table[(processor_class, action.value)] = handler
+                elif handler is None:
+                    missing_actions.append((for_type, action.value))
+        # Mutate in place, since table is shared between all subclasses
+        cls.dispatch_table.clear()
+        cls.dispatch_table.update(dispatch_table)
+        schema_types = schemas.QueueBodySchema.registry.keys()
+        return DispatchTableReport(
+            missing_actions=tuple(missing_actions),
+            unreachable_processors=tuple(
+                sorted(cls.registry.keys() - schema_types),
+            ),
+            missing_processors=tuple(
+                sorted(schema_types - cls.registry.keys()),
+            ),
+        )
+
+    def get_action_handler(
+        self,
+        action: str,
+    ) -> ActionHandler | None:
+        """Get method for action bound to processor.
+
+        Falls back to `getattr` for actions which aren't in dispatch table,
+        like ones of processors registered after compilation.
+
+        """
+        if handler := self.dispatch_table.get((type(self), action)):
+            return types.MethodType(handler, self)
+        return getattr(self, action, None)
+
     @metrics.tracker
     async def __call__(
         self,
-        message: messages.Message[
+        message: messages.BaseMessage[
             schemas.QueueBodySchemaT,
             messages.MessageActionT,
         ],
@@ -188,21 +309,34 @@ class Processor(
             f"Starting to process <{message.action}: "
             f"{self.for_type}> with processor {self.__class__}.",
         )
-        logger.debug(
-            "Body:\n" f"{message.serialize_body()}\n",
-        )
         try:
-            action = getattr(self, message.action, None)
+            action = self.get_action_handler(message.action)
             if not action:
                 raise CancelProcessingError(
                     f"No method defined for {message.action} action",
                 )
-            async with self.prepare_context(message) as context:
-                result = await action(
-                    message=message,
-                    logger=logger,
-                    **context,
+            # Body is logged only once handler is found, so lazy bodies of
+            # cancelled messages aren't parsed
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Body:\n{message.serialize_body()}\n",
                 )
+            async with contextlib.AsyncExitStack() as stack:
+                with tracing.tracer.start_span("prepare_context"):
+                    context = await stack.enter_async_context(
+                        self.prepare_context(message),
+                    )
+                with (
+                    tracing.tracer.start_span(
+                        f"{message.type}.{message.action}",
+                    ),
+                    lifecycle.measure(lifecycle.Stage.handler),
+                ):
+                    result = await action(
+                        message=message,
+                        logger=logger,
+                        **context,
+                    )
         except CancelProcessingError as cancel_exception:
             logger.info(f"Cancelled, reason: {cancel_exception.reason}")
             return ProcessingResult[typing.Any](
@@ -215,9 +349,10 @@ class Processor(
             f"Finished to process <{message.action}: "
             f"{self.for_type}> with processor {self.__class__}.",
         )
-        logger.debug(
-            "Body:\n" f"{message.serialize_body()}\n",
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Body:\n{message.serialize_body()}\n",
+            )
         return ProcessingResult[typing.Any](
             status=ProcessingResultStatus.success,
             message="",
@@ -229,7 +364,7 @@ class Processor(
     @metrics.tracker
     async def prepare_context(
         self,
-        message: messages.Message[
+        message: messages.BaseMessage[
             schemas.QueueBodySchemaT,
             messages.MessageActionT,
         ],
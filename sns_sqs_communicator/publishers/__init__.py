@@ -0,0 +1,16 @@
+from .fanout import FanoutPublisher, FanoutResult
+from .sns import BatchingSNSPublisher
+from .sync import (
+    PublisherBufferFullError,
+    PublisherClosedError,
+    SyncSNSPublisher,
+)
+
+__all__ = (
+    "BatchingSNSPublisher",
+    "FanoutPublisher",
+    "FanoutResult",
+    "PublisherBufferFullError",
+    "PublisherClosedError",
+    "SyncSNSPublisher",
+)
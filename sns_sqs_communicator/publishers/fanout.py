@@ -0,0 +1,140 @@
+import collections.abc
+import dataclasses
+import typing
+
+import anyio
+
+from .. import metrics, prepared, queue, topic
+
+PreparedMessageSender: typing.TypeAlias = collections.abc.Callable[
+    [prepared.PreparedMessage],
+    collections.abc.Awaitable[None],
+]
+
+
+@dataclasses.dataclass(frozen=True)
+class FanoutResult:
+    """Result of sending message to several destinations."""
+
+    # Topic arns and queue urls message has been sent to
+    succeeded: tuple[str, ...] = ()
+    # Errors keyed by topic arn or queue url
+    errors: dict[str, Exception] = dataclasses.field(default_factory=dict)
+
+    @property
+    def is_ok(self) -> bool:
+        """Check if message has been sent to all destinations."""
+        return not self.errors
+
+    def raise_on_failure(self) -> None:
+        """Raise errors of all failed destinations."""
+        if self.is_ok:
+            return
+        raise ExceptionGroup(
+            f"Failed to send message to {', '.join(self.errors)}",
+            list(self.errors.values()),
+        )
+
+
+class FanoutPublisher:
+    """Publisher which sends the same message to several destinations.
+
+    Body is serialized once for all destinations which share FIFO and
+    compression configs, and up to `max_concurrency` destinations are sent
+    to at once. Destinations with claim check get their own offloaded body,
+    since consumer of each of them deletes it after acknowledgement.
+
+    """
+
+    def __init__(
+        self,
+        topics: collections.abc.Sequence[topic.SNSTopic] = (),
+        queues: collections.abc.Sequence[queue.SQSQueue] = (),
+        max_concurrency: int = 8,
+    ) -> None:
+        self.topics = topics
+        self.queues = queues
+        self.max_concurrency = max_concurrency
+
+    @metrics.tracker
+    async def publish(
+        self,
+        body: dict[str, typing.Any],
+        metadata: dict[str, str] | None = None,
+    ) -> FanoutResult:
+        """Send message to all destinations."""
+        succeeded: list[str] = []
+        errors: dict[str, Exception] = {}
+        limiter = anyio.CapacityLimiter(self.max_concurrency)
+
+        async def send(
+            destination_id: str,
+            send_prepared: PreparedMessageSender,
+            prepared_message: prepared.PreparedMessage,
+        ) -> None:
+            async with limiter:
+                try:
+                    await send_prepared(prepared_message)
+                except Exception as exception:  # noqa: BLE001
+                    errors[destination_id] = exception
+                else:
+                    succeeded.append(destination_id)
+
+        sends = await self.prepare(body, metadata)
+        async with anyio.create_task_group() as task_group:
+            for destination_id, send_prepared, prepared_message in sends:
+                task_group.start_soon(
+                    send,
+                    destination_id,
+                    send_prepared,
+                    prepared_message,
+                )
+        return FanoutResult(succeeded=tuple(succeeded), errors=errors)
+
+    @metrics.tracker
+    async def prepare(
+        self,
+        body: dict[str, typing.Any],
+        metadata: dict[str, str] | None = None,
+    ) -> list[tuple[str, PreparedMessageSender, prepared.PreparedMessage]]:
+        """Prepare message for each destination along with its sender.
+
+        Destinations with the same configs and without claim check share
+        prepared message.
+
+        """
+        prepared_messages: dict[
+            tuple[int, int, int, int],
+            prepared.PreparedMessage,
+        ] = {}
+        sends: list[
+            tuple[str, PreparedMessageSender, prepared.PreparedMessage]
+        ] = []
+        destinations: list[
+            tuple[str, PreparedMessageSender, topic.SNSTopic | queue.SQSQueue]
+        ] = [
+            *(
+                (sns_topic.topic_arn, sns_topic.publish_prepared, sns_topic)
+                for sns_topic in self.topics
+            ),
+            *(
+                (sqs_queue.queue_url, sqs_queue.send_prepared, sqs_queue)
+                for sqs_queue in self.queues
+            ),
+        ]
+        for destination_id, send_prepared, destination in destinations:
+            config_key = (
+                id(destination.fifo_attrs_creator),
+                id(destination.compression_config),
+                id(destination.claim_check_config),
+                id(destination) if destination.claim_check_config else 0,
+            )
+            if config_key not in prepared_messages:
+                prepared_messages[config_key] = await destination.prepare(
+                    body,
+                    metadata,
+                )
+            sends.append(
+                (destination_id, send_prepared, prepared_messages[config_key]),
+            )
+        return sends
@@ -0,0 +1,170 @@
+import asyncio
+import types
+import typing
+
+from .. import batching, metrics, prepared, topic
+
+
+class BatchingSNSPublisher:
+    """Publisher which buffers messages and sends them with PublishBatch.
+
+    Buffer is flushed when it has 10 entries, when next message would exceed
+    batch size limit or when `linger_seconds` passed since first buffered
+    message. Entries failed on AWS side are retried up to `max_retries`
+    times, entries rejected as invalid are failed right away with
+    `BatchEntryError`. Batches of FIFO topics are sent one at a time, so
+    retries don't reorder messages of the same group.
+
+    Unlike the rest of the package, publisher works only on asyncio: it
+    hands out `asyncio.Future`s and sends batches in tasks which outlive
+    `publish` calls, which anyio allows only inside of task group owned by
+    caller.
+
+    Usage:
+        ```python
+        async with BatchingSNSPublisher(topic=topic) as publisher:
+            future = await publisher.publish(body, metadata)
+            ...
+        message_id = await future
+        ```
+
+    """
+
+    def __init__(
+        self,
+        topic: topic.SNSTopic,
+        linger_seconds: float = 0.05,
+        max_retries: int = 3,
+        retry_delay_seconds: float = 0.1,
+    ) -> None:
+        self.topic = topic
+        self.linger_seconds = linger_seconds
+        self.max_retries = max_retries
+        self.retry_delay_seconds = retry_delay_seconds
+        self._buffer: list[
+            tuple[prepared.PreparedMessage, asyncio.Future[str]]
+        ] = []
+        self._buffer_size = 0
+        self._linger_task: asyncio.Task[None] | None = None
+        self._in_flight: set[asyncio.Task[None]] = set()
+        self._fifo_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> typing.Self:
+        """Start publishing."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: types.TracebackType | None,
+    ) -> None:
+        """Publish messages left in buffer."""
+        await self.flush()
+
+    @metrics.tracker
+    async def publish(
+        self,
+        body: dict[str, typing.Any],
+        metadata: dict[str, str] | None = None,
+    ) -> asyncio.Future[str]:
+        """Buffer message for publishing.
+
+        Returns future which resolves into message id once message is
+        published or raises error if publishing failed.
+
+        """
+        loop = self.get_running_loop()
+        prepared_message = await self.topic.prepare(body, metadata)
+        message_size = batching.get_message_size(prepared_message)
+        if self._buffer_size + message_size > batching.MAX_BATCH_SIZE:
+            await self._send_buffer()
+        future: asyncio.Future[str] = loop.create_future()
+        self._buffer.append((prepared_message, future))
+        self._buffer_size += message_size
+        if len(self._buffer) >= batching.MAX_BATCH_ENTRIES:
+            await self._send_buffer()
+        elif not self._linger_task:
+            self._linger_task = asyncio.create_task(self._flush_on_linger())
+        return future
+
+    @metrics.tracker
+    async def flush(self) -> None:
+        """Publish all buffered messages and wait for batches in flight."""
+        await self._send_buffer()
+        if self._in_flight:
+            await asyncio.wait(set(self._in_flight))
+
+    def get_running_loop(self) -> asyncio.AbstractEventLoop:
+        """Get running asyncio loop, since publisher doesn't support trio."""
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError as error:
+            raise RuntimeError(
+                f"{self.__class__.__name__} works only on asyncio backend",
+            ) from error
+
+    async def _send_buffer(self) -> None:
+        """Send buffered messages as batch and wait for it.
+
+        Batch is sent in separate task, so cancelling of linger timer
+        never interrupts sending.
+
+        """
+        if self._linger_task and (
+            self._linger_task is not asyncio.current_task()
+        ):
+            self._linger_task.cancel()
+        self._linger_task = None
+        entries, self._buffer, self._buffer_size = self._buffer, [], 0
+        if not entries:
+            return
+        task = asyncio.create_task(self._publish_batch(entries))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+        await asyncio.wait({task})
+
+    async def _flush_on_linger(self) -> None:
+        """Send buffer once linger time passed."""
+        await asyncio.sleep(self.linger_seconds)
+        await self._send_buffer()
+
+    @metrics.tracker
+    async def _publish_batch(
+        self,
+        entries: list[tuple[prepared.PreparedMessage, asyncio.Future[str]]],
+    ) -> None:
+        """Publish batch and resolve futures of its messages."""
+        try:
+            if self.topic.fifo_attrs_creator:
+                async with self._fifo_lock:
+                    results = await self._send_batch(entries)
+            else:
+                results = await self._send_batch(entries)
+        except Exception as exception:  # noqa: BLE001
+            results = {
+                str(entry_id): exception for entry_id in range(len(entries))
+            }
+        for entry_id, (_, future) in enumerate(entries):
+            if future.done():
+                continue
+            result = results[str(entry_id)]
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def _send_batch(
+        self,
+        entries: list[tuple[prepared.PreparedMessage, asyncio.Future[str]]],
+    ) -> dict[str, str | Exception]:
+        """Send batch retrying entries failed on AWS side."""
+        return await batching.send_batch(
+            send=self.topic.publish_prepared_batch,
+            prepared_messages={
+                str(entry_id): prepared_message
+                for entry_id, (prepared_message, _) in enumerate(entries)
+            },
+            max_retries=self.max_retries,
+            retry_delay_seconds=self.retry_delay_seconds,
+        )
@@ -0,0 +1,123 @@
+import asyncio
+import concurrent.futures
+import threading
+import typing
+
+from .. import metrics, topic
+from . import sns
+
+
+class PublisherBufferFullError(Exception):
+    """Exception when publisher has too many messages in flight."""
+
+
+class PublisherClosedError(Exception):
+    """Exception when message is published after publisher was closed."""
+
+
+class SyncSNSPublisher:
+    """Thread-safe publisher for code which isn't async.
+
+    Owns background thread with long-lived event loop, where messages are
+    batched by `BatchingSNSPublisher`. `publish` doesn't wait for message to
+    be sent, but blocks (applying backpressure) once
+    `max_pending_messages` messages are in flight.
+
+    Usage:
+        ```python
+        publisher = SyncSNSPublisher(topic=topic)
+        future = publisher.publish(body, metadata)
+        ...
+        publisher.close(timeout=5)
+        ```
+
+    """
+
+    def __init__(
+        self,
+        topic: topic.SNSTopic,
+        max_pending_messages: int = 10_000,
+        linger_seconds: float = 0.05,
+        max_retries: int = 3,
+    ) -> None:
+        self._pending_slots = threading.BoundedSemaphore(max_pending_messages)
+        self._in_flight: set[asyncio.Task[str]] = set()
+        self._closed = False
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name=f"{self.__class__.__name__}-loop",
+            daemon=True,
+        )
+        self._thread.start()
+        self._publisher = sns.BatchingSNSPublisher(
+            topic=topic,
+            linger_seconds=linger_seconds,
+            max_retries=max_retries,
+        )
+
+    @metrics.tracker
+    def publish(
+        self,
+        body: dict[str, typing.Any],
+        metadata: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> concurrent.futures.Future[str]:
+        """Schedule message for publishing.
+
+        Returns future which resolves into message id. If there is no room
+        for message, waits up to `timeout` seconds (forever by default).
+
+        """
+        if self._closed:
+            raise PublisherClosedError("Publisher has been closed")
+        if not self._pending_slots.acquire(timeout=timeout):
+            raise PublisherBufferFullError(
+                "Too many messages are waiting to be published",
+            )
+        future = asyncio.run_coroutine_threadsafe(
+            self._publish(body, metadata),
+            self._loop,
+        )
+        future.add_done_callback(lambda _: self._pending_slots.release())
+        return future
+
+    @metrics.tracker
+    def flush(self, timeout: float | None = None) -> None:
+        """Wait until all scheduled messages are published."""
+        asyncio.run_coroutine_threadsafe(
+            self._flush(),
+            self._loop,
+        ).result(timeout=timeout)
+
+    @metrics.tracker
+    def close(self, timeout: float | None = None) -> None:
+        """Publish scheduled messages and stop background loop."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self.flush(timeout=timeout)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=timeout)
+            if not self._thread.is_alive():
+                self._loop.close()
+
+    async def _publish(
+        self,
+        body: dict[str, typing.Any],
+        metadata: dict[str, str] | None,
+    ) -> str:
+        """Buffer message and wait until it's published."""
+        task = asyncio.current_task()
+        if task:  # pragma: no branch
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+        return await (await self._publisher.publish(body, metadata))
+
+    async def _flush(self) -> None:
+        """Flush buffer and wait for messages which are still in flight."""
+        await self._publisher.flush()
+        if self._in_flight:
+            await asyncio.wait(set(self._in_flight))
@@ -1,9 +1,24 @@
 import collections.abc
+import logging
 import typing
 
+import anyio
+
 import mypy_boto3_sqs.type_defs
 
-from . import clients, fifo_attributes_creator, metrics, types
+from . import (
+    batching,
+    claim_check,
+    clients,
+    compression,
+    fifo_attributes_creator,
+    metrics,
+    prepared,
+    tracing,
+    types,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class SQSQueue:
@@ -17,11 +32,15 @@ class SQSQueue:
             fifo_attributes_creator.FifoAttributesCreatorProtocol | None
         ) = None,
         wait_time_seconds: int = 0,
+        compression_config: compression.CompressionConfig | None = None,
+        claim_check_config: claim_check.ClaimCheckConfig | None = None,
     ) -> None:
         self.client = client
         self.queue_url = queue_url
         self.fifo_attrs_creator = fifo_attrs_creator
         self.wait_time_seconds = wait_time_seconds
+        self.compression_config = compression_config
+        self.claim_check_config = claim_check_config
 
     @metrics.tracker
     async def put(
@@ -30,38 +49,138 @@ class SQSQueue:
         metadata: dict[str, str] | None = None,
     ) -> None:
         """Put sync message to queue."""
-        metadata = metadata or {}
-        additional_attrs = {}
-        if self.fifo_attrs_creator:
-            additional_attrs["MessageGroupId"] = (
-                self.fifo_attrs_creator.get_message_group_id(
-                    body,
-                    metadata,
-                )
-            )
-            additional_attrs["MessageDeduplicationId"] = (
-                self.fifo_attrs_creator.get_message_deduplication_id(
-                    body,
-                    metadata,
-                )
-            )
+        with tracing.tracer.start_span(
+            "send",
+            kind=tracing.SpanKind.producer,
+            attributes={
+                "messaging.system": "aws_sqs",
+                "messaging.destination.name": self.queue_url,
+            },
+        ):
+            await self.send_prepared(await self.prepare(body, metadata))
+
+    @metrics.tracker
+    async def prepare(
+        self,
+        body: dict[str, typing.Any],
+        metadata: dict[str, str] | None = None,
+    ) -> prepared.PreparedMessage:
+        """Serialize message, so it could be sent without extra work."""
+        return await prepared.prepare_message(
+            body=body,
+            metadata=metadata or {},
+            fifo_attrs_creator=self.fifo_attrs_creator,
+            compression_config=self.compression_config,
+            claim_check_config=self.claim_check_config,
+        )
+
+    @metrics.tracker
+    async def send_prepared(
+        self,
+        prepared_message: prepared.PreparedMessage,
+    ) -> None:
+        """Send already prepared message."""
         await self.client.send_message(
             queue_url=self.queue_url,
-            metadata_attributes=self._prepare_metadata(metadata),
-            body=body,
-            **additional_attrs,
+            metadata_attributes=self._prepare_metadata(
+                prepared_message.metadata,
+            ),
+            body=prepared_message.body,
+            **prepared_message.fifo_attributes,
+        )
+
+    @metrics.tracker
+    async def put_many(
+        self,
+        messages: collections.abc.Sequence[
+            tuple[dict[str, typing.Any], dict[str, str] | None]
+        ],
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        retry_delay_seconds: float = 0.1,
+    ) -> list[str | Exception]:
+        """Put messages (pairs of body and metadata) to queue in batches.
+
+        Messages are split into batches which fit into AWS limits and up to
+        `max_concurrency` batches are sent at once. Returns message id or
+        error for each message in the same order.
+
+        """
+        prepared_messages = [
+            await self.prepare(body, metadata) for body, metadata in messages
+        ]
+        results: dict[str, str | Exception] = {}
+        limiter = anyio.CapacityLimiter(max_concurrency)
+
+        async def send_batch(
+            batch: dict[str, prepared.PreparedMessage],
+        ) -> None:
+            async with limiter:
+                results.update(
+                    await batching.send_batch(
+                        send=self.send_prepared_batch,
+                        prepared_messages=batch,
+                        max_retries=max_retries,
+                        retry_delay_seconds=retry_delay_seconds,
+                    ),
+                )
+
+        async with anyio.create_task_group() as task_group:
+            for batch in batching.split_into_batches(prepared_messages):
+                task_group.start_soon(send_batch, batch)
+        return [results[str(index)] for index in range(len(messages))]
+
+    @metrics.tracker
+    async def send_prepared_batch(
+        self,
+        prepared_messages: collections.abc.Mapping[
+            str,
+            prepared.PreparedMessage,
+        ],
+    ) -> mypy_boto3_sqs.type_defs.SendMessageBatchResultTypeDef:
+        """Send up to 10 prepared messages keyed by batch entry id."""
+        return await self.client.send_message_batch(
+            queue_url=self.queue_url,
+            entries=[
+                {
+                    "Id": entry_id,
+                    "MessageBody": prepared_message.body,
+                    "MessageAttributes": self._prepare_metadata(
+                        prepared_message.metadata,
+                    ),
+                    **prepared_message.fifo_attributes,  # type: ignore
+                }
+                for entry_id, prepared_message in prepared_messages.items()
+            ],
         )
 
     @metrics.tracker
     async def receive(
         self,
+        on_deleted: (
+            collections.abc.Callable[
+                [list[mypy_boto3_sqs.type_defs.MessageTypeDef]],
+                None,
+            ]
+            | None
+        ) = None,
+        should_delete: (
+            collections.abc.Callable[
+                [mypy_boto3_sqs.type_defs.MessageTypeDef],
+                bool,
+            ]
+            | None
+        ) = None,
     ) -> collections.abc.AsyncIterator[
         mypy_boto3_sqs.type_defs.MessageTypeDef,
     ]:
         """Receive message from queue.
 
         It could be a single message or a batch depending on queue type, so
-        this method returns list in general to handle both cases.
+        this method returns list in general to handle both cases. Messages
+        are deleted once all of them are consumed, unless `should_delete`
+        rejects them, and the ones which have been deleted are passed to
+        `on_deleted`.
 
         """
         response = await self.client.receive_messages(
@@ -72,7 +191,23 @@ class SQSQueue:
         if raw_messages := response.get("Messages"):
             for raw_message in raw_messages:
                 yield raw_message
-            await self.delete_messages(raw_messages)
+            if should_delete:
+                raw_messages = [
+                    raw_message
+                    for raw_message in raw_messages
+                    if should_delete(raw_message)
+                ]
+            with tracing.tracer.start_span("ack"):
+                errors = await self.delete_messages(raw_messages)
+            if on_deleted:
+                on_deleted(
+                    [
+                        raw_message
+                        for index, raw_message in enumerate(raw_messages)
+                        if "ReceiptHandle" in raw_message
+                        and str(index) not in errors
+                    ],
+                )
 
     @metrics.tracker
     async def receive_all(
@@ -102,11 +237,67 @@ class SQSQueue:
         messages_to_delete: collections.abc.Sequence[
             mypy_boto3_sqs.type_defs.MessageTypeDef
         ],
+        max_retries: int = 3,
+        retry_delay_seconds: float = 0.1,
+    ) -> dict[str, Exception]:
+        """Delete given messages from sqs.
+
+        Messages are deleted in batches of 10 and entries failed on AWS side
+        are retried with backoff. Returns errors of messages which haven't
+        been deleted keyed by their index. Such messages come back after
+        visibility timeout, so failures are logged and counted.
+
+        """
+        receipt_handles = {
+            str(index): message["ReceiptHandle"]
+            for index, message in enumerate(messages_to_delete)
+            if "ReceiptHandle" in message
+        }
+        entry_ids = list(receipt_handles)
+        errors: dict[str, Exception] = {}
+        for start in range(0, len(entry_ids), batching.MAX_BATCH_ENTRIES):
+            results = await batching.send_batch(
+                send=self.delete_message_batch,
+                prepared_messages={
+                    entry_id: receipt_handles[entry_id]
+                    for entry_id in entry_ids[
+                        start : start + batching.MAX_BATCH_ENTRIES
+                    ]
+                },
+                max_retries=max_retries,
+                retry_delay_seconds=retry_delay_seconds,
+            )
+            errors.update(
+                (entry_id, result)
+                for entry_id, result in results.items()
+                if isinstance(result, Exception)
+            )
+        if errors:
+            metrics.counter(
+                "sns_sqs_communicator.queue.delete_failures",
+                value=len(errors),
+                queue_url=self.queue_url,
+            )
+            logger.error(
+                "Failed to delete %d messages from %s: %s",
+                len(errors),
+                self.queue_url,
+                "; ".join(str(error) for error in errors.values()),
+            )
+        return errors
+
+    @metrics.tracker
+    async def delete_message_batch(
+        self,
+        receipt_handles: collections.abc.Mapping[str, str],
     ) -> mypy_boto3_sqs.type_defs.DeleteMessageBatchResultTypeDef:
-        """Delete given messages from sqs."""
-        return await self.client.delete_messages(
+        """Delete up to 10 messages by receipt handles keyed by entry ids."""
+        return await self.client.delete_message_batch(
             queue_url=self.queue_url,
-            messages_to_delete=messages_to_delete,
+            entries=[
+                {"Id": entry_id, "ReceiptHandle": receipt_handle}
+                for entry_id, receipt_handle in receipt_handles.items()
+            ],
         )
 
     @staticmethod
@@ -1,13 +1,30 @@
+import collections.abc
+import functools
 import typing
 
 import pydantic
 import typing_extensions
+import ujson
+
+# Name of message attribute which holds version of body schema
+SCHEMA_VERSION_ATTRIBUTE = "schema-version"
+# Version of messages sent without version attribute
+DEFAULT_SCHEMA_VERSION = 1
+
+BodyUpgrader: typing.TypeAlias = collections.abc.Callable[
+    [dict[str, typing.Any]],
+    dict[str, typing.Any],
+]
 
 
 class QueueBodySchemaNotRegisteredError(Exception):
     """Exception we're unable to find schema for type."""
 
 
+class SchemaUpgraderNotRegisteredError(Exception):
+    """Exception when body can't be upgraded to current schema version."""
+
+
 class QueueBodySchema(pydantic.BaseModel):
     """Base schema for serialization message body for queue message."""
 
@@ -15,7 +32,11 @@ class QueueBodySchema(pydantic.BaseModel):
         from_attributes=True,
     )
     for_type: typing.ClassVar[str]
+    # Bump it along with registering upgrader from previous version
+    schema_version: typing.ClassVar[int] = DEFAULT_SCHEMA_VERSION
     registry: typing.ClassVar[dict[str, type["QueueBodySchema"]]] = {}
+    # Upgraders of raw bodies keyed by (type, version they upgrade from)
+    upgraders: typing.ClassVar[dict[tuple[str, int], BodyUpgrader]] = {}
 
     def __init_subclass__(
         cls,
@@ -54,5 +75,110 @@ class QueueBodySchema(pydantic.BaseModel):
             f"Schema for message type {message_type} is not registered",
         )
 
+    @classmethod
+    def upgrader(
+        cls,
+        from_version: int,
+    ) -> collections.abc.Callable[[BodyUpgrader], BodyUpgrader]:
+        """Register function which upgrades raw body to next version.
+
+        Usage:
+            ```python
+            class SomeQueueBodySchema(
+                BaseQueueBodySchema,
+                for_type="some_type",
+            ):
+                schema_version = 2
+                currency: str
+
+            @SomeQueueBodySchema.upgrader(from_version=1)
+            def add_currency(body: dict[str, Any]) -> dict[str, Any]:
+                return {**body, "currency": "USD"}
+            ```
+
+        """
+
+        def register(upgrader: BodyUpgrader) -> BodyUpgrader:
+            registry_key = (cls.for_type, from_version)
+            if registry_key in cls.upgraders:
+                raise KeyError(
+                    f"{registry_key} upgrader is already registered({cls})",
+                )
+            cls.upgraders[registry_key] = upgrader
+            get_upgrade_chain.cache_clear()
+            return upgrader
+
+        return register
+
+    @classmethod
+    def validate_body(
+        cls,
+        raw_body: str,
+        from_version: int = DEFAULT_SCHEMA_VERSION,
+    ) -> typing.Self:
+        """Decode, upgrade and validate raw body of `from_version`.
+
+        Eager and lazy messages are validated by it, so the same body is
+        accepted or rejected regardless of `lazy_body` of parser.
+
+        """
+        return cls.model_validate(
+            cls.upgrade_body(ujson.loads(raw_body), from_version=from_version),
+        )
+
+    @classmethod
+    def upgrade_body(
+        cls,
+        body: dict[str, typing.Any],
+        from_version: int,
+    ) -> dict[str, typing.Any]:
+        """Upgrade raw body of `from_version` to current schema version."""
+        if from_version == cls.schema_version:
+            return body
+        return get_upgrade_chain(
+            message_type=cls.for_type,
+            from_version=from_version,
+            to_version=cls.schema_version,
+        )(body)
+
+
+@functools.cache
+def get_upgrade_chain(
+    message_type: str,
+    from_version: int,
+    to_version: int,
+) -> BodyUpgrader:
+    """Compose upgraders between versions into single function.
+
+    Intermediate bodies are plain dicts, so only the final one is validated
+    by schema. Composed chains are cached for each set of versions.
+
+    """
+    if from_version > to_version:
+        raise SchemaUpgraderNotRegisteredError(
+            f"Version {from_version} of {message_type} is newer than "
+            f"current {to_version}",
+        )
+    steps: list[BodyUpgrader] = []
+    for version in range(from_version, to_version):
+        upgrader = QueueBodySchema.upgraders.get((message_type, version))
+        if not upgrader:
+            raise SchemaUpgraderNotRegisteredError(
+                f"No upgrader of {message_type} from version {version} is "
+                "registered",
+            )
+        steps.append(upgrader)
+    return functools.partial(apply_upgraders, tuple(steps))
+
+
+def apply_upgraders(
+    steps: tuple[BodyUpgrader, ...],
+    body: dict[str, typing.Any],
+) -> dict[str, typing.Any]:
+    """Apply upgraders to body one after another."""
+    for step in steps:
+        body = step(body)
+    return body
+
 
 QueueBodySchemaT = typing.TypeVar("QueueBodySchemaT", bound=QueueBodySchema)
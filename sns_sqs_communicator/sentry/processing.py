@@ -21,7 +21,7 @@ class SentryProcessor(
 
     async def __call__(
         self,
-        message: messages.Message[
+        message: messages.BaseMessage[
             schemas.QueueBodySchemaT,
             messages.MessageActionT,
         ],
@@ -34,10 +34,7 @@ class SentryProcessor(
         ) as transaction:
             transaction.set_tag("type", message.type)
             transaction.set_tag("action", message.action)
-            sentry_sdk.set_context(
-                "Body Schema",
-                message.body_schema.model_dump(mode="json"),
-            )
+            self.set_body_schema_context(message)
             try:
                 result = await super().__call__(message=message, logger=logger)
                 if result.status == processing.ProcessingResultStatus.canceled:
@@ -47,7 +44,31 @@ class SentryProcessor(
                         {"reason": result.message},
                     )
             except Exception as error:
+                self.set_body_schema_context(message)
                 transaction.set_status("internal_error")
                 raise error
             transaction.set_status("ok")
             return result
+
+    def set_body_schema_context(
+        self,
+        message: messages.BaseMessage[
+            schemas.QueueBodySchemaT,
+            messages.MessageActionT,
+        ],
+    ) -> None:
+        """Attach body to sentry context.
+
+        Lazy messages are attached only if body has been already loaded, so
+        sentry won't force body parsing for messages that got cancelled.
+
+        """
+        if (
+            isinstance(message, messages.LazyMessage)
+            and not message.is_body_loaded
+        ):
+            return
+        sentry_sdk.set_context(
+            "Body Schema",
+            message.body_schema.model_dump(mode="json"),
+        )
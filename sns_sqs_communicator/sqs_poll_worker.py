@@ -1,20 +1,26 @@
 import asyncio
 import collections.abc
+import contextlib
 import logging
 import threading
+import time
 import traceback
 import typing
 
+import anyio
+
 import mypy_boto3_sqs.type_defs
 
 from . import (
     clients,
     fifo_attributes_creator,
+    lifecycle,
     messages,
     metrics,
     parsers,
     processing,
     queue,
+    tracing,
 )
 
 
@@ -135,10 +141,32 @@ class SQSPollWorker(
         """Set up handler for logger."""
         return logging.Formatter()  # pragma: no cover
 
+    @classmethod
+    @metrics.tracker
+    def setup_dispatch_table(
+        cls,
+        logger: logging.Logger,
+    ) -> processing.DispatchTableReport:
+        """Compile dispatch table of processors and report its gaps."""
+        report = cls.core_processor_class.compile_dispatch_table(
+            message_action_enum=cls.setup_parser().message_action_enum,
+        )
+        for for_type, action in report.missing_actions:
+            logger.debug(f"No method defined for <{action}: {for_type}>")
+        for for_type in report.unreachable_processors:
+            logger.warning(
+                f"Processor for {for_type} is unreachable, "
+                "since no schema is registered for it",
+            )
+        for for_type in report.missing_processors:
+            logger.warning(f"No processor is registered for {for_type}")
+        return report
+
     @classmethod
     async def run(cls) -> None:  # pragma: no cover
         """Start infinite loop that handles event messages."""
         logger = cls.setup_logger()
+        cls.setup_dispatch_table(logger=logger)
         logger.info(f"{cls.__name__} started")
         while True:
             sqs_client = cls.setup_sqs_client()
@@ -163,35 +191,145 @@ class SQSPollWorker(
         parser: type[parsers.ParserProtocol[messages.MessageActionT]],
         logger: logging.Logger,
     ) -> collections.abc.Sequence[processing.ProcessingResult[typing.Any]]:
-        """Pull for messages and process them."""
+        """Pull for messages and process them.
+
+        Messages are received in single call, so the whole batch is received
+        when the first message arrives. Messages are deleted once the batch
+        is processed, so acknowledgement of each message lasts until then.
+
+        """
         results = []
-        async for raw_message in queue.receive():
-            try:
-                results.append(
-                    await cls.process_message(
-                        raw_message=raw_message,
-                        parser=parser,
-                        logger=logger,
-                    ),
-                )
-            except Exception as exception:
-                results.append(
-                    processing.ProcessingResult[typing.Any](
-                        status=processing.ProcessingResultStatus.failed,
-                        message=str(exception),
-                        result=None,
-                        exception=exception,
-                    ),
-                )
-                await cls.handle_processing_error(
+        deleted_messages: list[mypy_boto3_sqs.type_defs.MessageTypeDef] = []
+        # Keyed by ids of received messages
+        message_lifecycles: dict[int, lifecycle.MessageLifecycle] = {}
+        failed_message_ids: set[int] = set()
+        # Messages which couldn't be sent to dead letter queue come back
+        # after visibility timeout
+        kept_message_ids: set[int] = set()
+        received_at: float | None = None
+        async for raw_message in queue.receive(
+            on_deleted=deleted_messages.extend,
+            should_delete=lambda raw_message: (
+                id(raw_message) not in kept_message_ids
+            ),
+        ):
+            if received_at is None:
+                received_at = time.perf_counter()
+            message_lifecycle = lifecycle.MessageLifecycle.from_raw_message(
+                raw_message=raw_message,
+                received_at=received_at,
+            )
+            message_lifecycles[id(raw_message)] = message_lifecycle
+            with (
+                lifecycle.track(message_lifecycle),
+                cls.start_processing_span(
                     raw_message=raw_message,
-                    error=exception,
                     parser=parser,
-                    dead_letter_queue=dead_letter_queue,
-                    logger=logger,
-                )
+                    queue=queue,
+                ) as span,
+            ):
+                try:
+                    results.append(
+                        await cls.process_message(
+                            raw_message=raw_message,
+                            parser=parser,
+                            logger=logger,
+                        ),
+                    )
+                except Exception as exception:
+                    span.record_exception(exception)
+                    failed_message_ids.add(id(raw_message))
+                    results.append(
+                        processing.ProcessingResult[typing.Any](
+                            status=processing.ProcessingResultStatus.failed,
+                            message=str(exception),
+                            result=None,
+                            exception=exception,
+                        ),
+                    )
+                    try:
+                        await cls.handle_processing_error(
+                            raw_message=raw_message,
+                            error=exception,
+                            parser=parser,
+                            dead_letter_queue=dead_letter_queue,
+                            logger=logger,
+                        )
+                    except Exception:
+                        kept_message_ids.add(id(raw_message))
+                        logger.exception(
+                            "Failed to send message "
+                            f"{raw_message.get('MessageId', '')} "
+                            "to dead letter queue, it's kept in queue",
+                        )
+        acked_at = time.perf_counter()
+        # Messages which haven't been deleted aren't acknowledged
+        for raw_message in deleted_messages:
+            message_lifecycles[id(raw_message)].finish_ack(acked_at)
+        for message_lifecycle in message_lifecycles.values():
+            message_lifecycle.record()
+        # Messages which haven't been deleted come back, and dead letters
+        # are sent with the same claim checks, so their bodies should stay
+        # in store
+        await cls.release_claim_checks(
+            raw_messages=[
+                raw_message
+                for raw_message in deleted_messages
+                if id(raw_message) not in failed_message_ids
+            ],
+            parser=parser,
+        )
         return results
 
+    @classmethod
+    def start_processing_span(
+        cls,
+        raw_message: mypy_boto3_sqs.type_defs.MessageTypeDef,
+        parser: type[parsers.ParserProtocol[messages.MessageActionT]],
+        queue: queue.SQSQueue,
+    ) -> contextlib.AbstractContextManager[tracing.SpanProtocol]:
+        """Start consumer span continuing trace of producer."""
+        if not tracing.tracer.is_enabled:
+            return tracing.NOOP_SPAN
+        # Parsers written before tracing can't extract context of producer
+        get_metadata = getattr(parser, "get_metadata", None)
+        return tracing.tracer.start_span(
+            "process",
+            kind=tracing.SpanKind.consumer,
+            metadata=get_metadata(raw_message) if get_metadata else None,
+            attributes={
+                "messaging.system": "aws_sqs",
+                "messaging.destination.name": queue.queue_url,
+                "messaging.message.id": raw_message.get("MessageId", ""),
+            },
+        )
+
+    @classmethod
+    @metrics.tracker
+    async def release_claim_checks(
+        cls,
+        raw_messages: collections.abc.Sequence[
+            mypy_boto3_sqs.type_defs.MessageTypeDef
+        ],
+        parser: type[parsers.ParserProtocol[messages.MessageActionT]],
+    ) -> None:
+        """Delete offloaded bodies of messages deleted from queue."""
+        # Parsers written before claim checks don't have config
+        if not (
+            claim_check_config := getattr(parser, "claim_check_config", None)
+        ):
+            return
+        claim_check_keys = [
+            claim_check_key
+            for raw_message in raw_messages
+            if (claim_check_key := parser.get_claim_check_key(raw_message))
+        ]
+        if claim_check_keys:
+            await anyio.to_thread.run_sync(
+                claim_check_config.release,
+                claim_check_keys,
+            )
+
     @classmethod
     @metrics.tracker
     async def process_message(
@@ -217,7 +355,12 @@ class SQSPollWorker(
         dead_letter_queue: queue.SQSQueue,
         logger: logging.Logger,
     ) -> None:
-        """Handle error during message processing."""
+        """Handle error during message processing.
+
+        Body and attributes are forwarded as they were received, since
+        decoding them again could fail the same way processing has.
+
+        """
         logger.error(
             f"Error during message processing: {error}\n"
             f"{traceback.format_exc()}",
@@ -225,12 +368,12 @@ class SQSPollWorker(
         failed_message = messages.DeadLetterMessage(
             message_id=raw_message.get("MessageId", ""),
             receipt_handle=raw_message.get("ReceiptHandle", ""),
-            raw_message=parser.get_raw_body(
-                raw_message=raw_message,
-            ),
+            raw_message=raw_message.get("Body", ""),
+            message_attributes=dict(raw_message.get("MessageAttributes", {})),
             error_details=traceback.format_exc(),
         )
-        await dead_letter_queue.put(
-            body=failed_message.to_dict(),
-            metadata=failed_message.to_dict(),
-        )
+        with tracing.tracer.start_span("dead_letter"):
+            await dead_letter_queue.put(
+                body=failed_message.to_dict(),
+                metadata=failed_message.metadata,
+            )
@@ -210,6 +210,16 @@ def factory_topic_attributes() -> typing.Mapping[str, str] | None:
     return None  # pragma: no cover
 
 
+@pytest.fixture(scope="session")
+def factory_raw_message_delivery() -> bool:
+    """Get whether topic should be subscribed with raw message delivery.
+
+    If enabled, `sns_parser` should be `SNSRawDeliveryParser`.
+
+    """
+    return False
+
+
 @pytest.fixture(scope="session")
 def sqs_queue_name(
     request: pytest.FixtureRequest,
@@ -421,6 +431,7 @@ def sns_topic_factory(
     factory_fifo_attrs_creator: fifo_attributes_creator.FifoAttributesCreatorProtocol  # noqa: E501
     | None,
     factory_topic_attributes: typing.Mapping[str, str] | None,
+    factory_raw_message_delivery: bool,
 ) -> functools.partial[
     contextlib._AsyncGeneratorContextManager[topic_module.SNSTopic]
 ]:
@@ -434,6 +445,7 @@ def sns_topic_factory(
         topic_class=sns_topic_class,
         fifo_attrs_creator=factory_fifo_attrs_creator,
         attributes=factory_topic_attributes,
+        raw_message_delivery=factory_raw_message_delivery,
     )
 
 
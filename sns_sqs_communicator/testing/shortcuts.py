@@ -144,6 +144,7 @@ async def topic_factory(
     fifo_attrs_creator: (
         fifo_attributes_creator.FifoAttributesCreatorProtocol | None
     ) = None,
+    raw_message_delivery: bool = False,
 ) -> collections.abc.AsyncIterator[topic.SNSTopic]:
     """Create topic, subtribe it to queue and delete it after using it."""
     queue_url = await sqs_client.get_queue_url(name=queue_name)
@@ -156,6 +157,7 @@ async def topic_factory(
     await sns_client.subscribe(
         topic_arn=topic_arn,
         endpoint=queue_arn,
+        raw_message_delivery=raw_message_delivery,
     )
     yield topic_class(
         client=sns_client,
@@ -28,6 +28,7 @@ class TestWorker(typing.Generic[messages.MessageActionT]):
         self.parser = parser
         self.logger = logger
         self.wait_before_pull = wait_before_pull
+        self.sqs_poll_worker_class.setup_dispatch_table(logger=logger)
 
     async def publish_and_pull(
         self,
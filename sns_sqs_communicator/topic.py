@@ -1,6 +1,18 @@
+import collections.abc
 import typing
 
-from . import clients, fifo_attributes_creator, metrics, types
+import mypy_boto3_sns.type_defs
+
+from . import (
+    claim_check,
+    clients,
+    compression,
+    fifo_attributes_creator,
+    metrics,
+    prepared,
+    tracing,
+    types,
+)
 
 
 class SNSTopic:
@@ -13,10 +25,14 @@ class SNSTopic:
         fifo_attrs_creator: (
             fifo_attributes_creator.FifoAttributesCreatorProtocol | None
         ),
+        compression_config: compression.CompressionConfig | None = None,
+        claim_check_config: claim_check.ClaimCheckConfig | None = None,
     ) -> None:
         self.client = client
         self.topic_arn = topic_arn
         self.fifo_attrs_creator = fifo_attrs_creator
+        self.compression_config = compression_config
+        self.claim_check_config = claim_check_config
 
     @metrics.tracker
     async def publish(
@@ -25,27 +41,68 @@ class SNSTopic:
         metadata: dict[str, str] | None = None,
     ) -> None:
         """Publish message to sns topic."""
-        metadata = metadata or {}
-        additional_attrs = {}
-        if self.fifo_attrs_creator:
-            additional_attrs["MessageGroupId"] = (
-                self.fifo_attrs_creator.get_message_group_id(
-                    body,
-                    metadata,
-                )
-            )
-            additional_attrs["MessageDeduplicationId"] = (
-                self.fifo_attrs_creator.get_message_deduplication_id(
-                    body,
-                    metadata,
-                )
-            )
+        with tracing.tracer.start_span(
+            "publish",
+            kind=tracing.SpanKind.producer,
+            attributes={
+                "messaging.system": "aws_sns",
+                "messaging.destination.name": self.topic_arn,
+            },
+        ):
+            await self.publish_prepared(await self.prepare(body, metadata))
 
+    @metrics.tracker
+    async def prepare(
+        self,
+        body: dict[str, typing.Any],
+        metadata: dict[str, str] | None = None,
+    ) -> prepared.PreparedMessage:
+        """Serialize message, so it could be sent without extra work."""
+        return await prepared.prepare_message(
+            body=body,
+            metadata=metadata or {},
+            fifo_attrs_creator=self.fifo_attrs_creator,
+            compression_config=self.compression_config,
+            claim_check_config=self.claim_check_config,
+        )
+
+    @metrics.tracker
+    async def publish_prepared(
+        self,
+        prepared_message: prepared.PreparedMessage,
+    ) -> None:
+        """Send already prepared message."""
         await self.client.publish(
             topic_arn=self.topic_arn,
-            message_attributes=self._prepare_metadata(metadata),
-            body=body,
-            **additional_attrs,
+            message_attributes=self._prepare_metadata(
+                prepared_message.metadata,
+            ),
+            body=prepared_message.body,
+            **prepared_message.fifo_attributes,
+        )
+
+    @metrics.tracker
+    async def publish_prepared_batch(
+        self,
+        prepared_messages: collections.abc.Mapping[
+            str,
+            prepared.PreparedMessage,
+        ],
+    ) -> mypy_boto3_sns.type_defs.PublishBatchResponseTypeDef:
+        """Publish up to 10 prepared messages keyed by batch entry id."""
+        return await self.client.publish_batch(
+            topic_arn=self.topic_arn,
+            entries=[
+                {
+                    "Id": entry_id,
+                    "Message": prepared_message.body,
+                    "MessageAttributes": self._prepare_metadata(
+                        prepared_message.metadata,
+                    ),
+                    **prepared_message.fifo_attributes,  # type: ignore
+                }
+                for entry_id, prepared_message in prepared_messages.items()
+            ],
         )
 
     @staticmethod
@@ -0,0 +1,115 @@
+import collections.abc
+import contextlib
+import enum
+import types
+import typing
+
+# Types of attribute values spans accept
+AttributeValue: typing.TypeAlias = str | bool | int | float
+
+
+class SpanKind(enum.StrEnum):
+    """Role of span in trace."""
+
+    internal = "internal"
+    producer = "producer"
+    consumer = "consumer"
+
+
+class SpanProtocol(typing.Protocol):
+    """Protocol of span returned by tracer."""
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        """Attach attribute to span."""
+        ...  # pragma: no cover
+
+    def record_exception(self, exception: BaseException) -> None:
+        """Mark span as failed with exception."""
+        ...  # pragma: no cover
+
+
+class TracerProtocol(typing.Protocol):
+    """Protocol of tracing backend."""
+
+    # Disabled tracer lets callers skip preparing data for spans
+    is_enabled: bool
+
+    def inject(self, metadata: dict[str, str]) -> dict[str, str]:
+        """Get metadata with context of current span added to it."""
+        ...  # pragma: no cover
+
+    def start_span(
+        self,
+        name: str,
+        kind: SpanKind = SpanKind.internal,
+        metadata: collections.abc.Mapping[str, str] | None = None,
+        attributes: collections.abc.Mapping[str, AttributeValue] | None = None,
+    ) -> contextlib.AbstractContextManager[SpanProtocol]:
+        """Start span, which continues trace from metadata if it's passed."""
+        ...  # pragma: no cover
+
+
+class NoopSpan:
+    """Span which records nothing."""
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        """Ignore attribute."""
+
+    def record_exception(self, exception: BaseException) -> None:
+        """Ignore exception."""
+
+    def __enter__(self) -> typing.Self:
+        """Enter span."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: types.TracebackType | None,
+    ) -> None:
+        """Exit span."""
+
+
+NOOP_SPAN = NoopSpan()
+
+
+class NoopTracer:
+    """Tracer used when tracing is disabled.
+
+    It returns the same span for all calls, so tracing costs only a couple
+    of calls per span.
+
+    """
+
+    is_enabled = False
+
+    def inject(self, metadata: dict[str, str]) -> dict[str, str]:
+        """Return metadata as is."""
+        return metadata
+
+    def start_span(
+        self,
+        name: str,
+        kind: SpanKind = SpanKind.internal,
+        metadata: collections.abc.Mapping[str, str] | None = None,
+        attributes: collections.abc.Mapping[str, AttributeValue] | None = None,
+    ) -> NoopSpan:
+        """Return span which records nothing."""
+        return NOOP_SPAN
+
+
+tracer: TracerProtocol = NoopTracer()
+
+
+def set_tracer(new_tracer: TracerProtocol | None) -> None:
+    """Set tracing backend, `None` disables tracing.
+
+    Usage:
+        ```python
+        tracing.set_tracer(otel.OpenTelemetryTracer())
+        ```
+
+    """
+    global tracer
+    tracer = new_tracer or NoopTracer()
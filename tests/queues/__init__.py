@@ -1,11 +1,20 @@
 from .messages import Message, MessageAction
-from .parsers import SNSParser, SQSParser
-from .processors import MathProcessor, Processor
+from .parsers import (
+    LazySNSParser,
+    LazySQSParser,
+    SNSParser,
+    SNSRawDeliveryParser,
+    SQSParser,
+)
+from .processors import MathProcessor, Processor, VersionedMathProcessor
+from .raw_messages import prepare_sns_raw_message, prepare_sqs_raw_message
 from .schemas import (
     BaseTestSchema,
     CancelQueueBodySchema,
     FailQueueBodySchema,
     MathQueueBodySchema,
     UnknownQueueBodySchema,
+    VersionedMathQueueBodySchema,
 )
+from .transport import FakeSQSTransport, prepare_queue
 from .worker import SQSPollWorker
@@ -17,3 +17,23 @@ class SNSParser(
     """Implement SNSParser."""
 
     message_action_enum = messages.MessageAction
+
+
+class LazySQSParser(SQSParser):
+    """Implement SQSParser with lazy body."""
+
+    lazy_body = True
+
+
+class LazySNSParser(SNSParser):
+    """Implement SNSParser with lazy body."""
+
+    lazy_body = True
+
+
+class SNSRawDeliveryParser(
+    sns_sqs_communicator.parsers.SNSRawDeliveryParser[messages.MessageAction],
+):
+    """Implement SNSRawDeliveryParser."""
+
+    message_action_enum = messages.MessageAction
@@ -38,6 +38,21 @@ class MathProcessor(
         return message.body_schema.a - message.body_schema.b
 
 
+class VersionedMathProcessor(
+    Processor[schemas.VersionedMathQueueBodySchema],
+    for_type="versioned_math_calc",
+):
+    """Processor for math calculations with versioned schema."""
+
+    async def plus(
+        self,
+        message: messages.Message[schemas.VersionedMathQueueBodySchema],
+        **kwargs,
+    ) -> int:
+        """Perform action."""
+        return message.body_schema.a + message.body_schema.b
+
+
 class CanceledProcessor(
     Processor[schemas.CancelQueueBodySchema],
     for_type="canceled",
@@ -0,0 +1,54 @@
+import typing
+
+import ujson
+
+from . import messages
+
+
+def prepare_sqs_raw_message(
+    body: str,
+    message_type: str = "math_calc",
+    action: str = messages.MessageAction.plus,
+    **attributes: str,
+) -> typing.Any:
+    """Prepare raw message as if it was sent directly to SQS."""
+    return {
+        "MessageId": "message-id",
+        "ReceiptHandle": "receipt-handle",
+        "Body": body,
+        "MessageAttributes": {
+            key: {"DataType": "String", "StringValue": value}
+            for key, value in {
+                "type": message_type,
+                "action": action,
+                **attributes,
+            }.items()
+        },
+    }
+
+
+def prepare_sns_raw_message(
+    body: str,
+    message_type: str = "math_calc",
+    action: str = messages.MessageAction.plus,
+    **attributes: str,
+) -> typing.Any:
+    """Prepare raw message as if it was delivered to SQS by SNS."""
+    return {
+        "MessageId": "message-id",
+        "ReceiptHandle": "receipt-handle",
+        "Body": ujson.dumps(
+            {
+                "Type": "Notification",
+                "Message": body,
+                "MessageAttributes": {
+                    key: {"Type": "String", "Value": value}
+                    for key, value in {
+                        "type": message_type,
+                        "action": action,
+                        **attributes,
+                    }.items()
+                },
+            },
+        ),
+    }
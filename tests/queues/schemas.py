@@ -1,3 +1,5 @@
+import typing
+
 import sns_sqs_communicator
 
 
@@ -42,3 +44,28 @@ class FailQueueBodySchema(
     """Schema for representation test queue messages."""
 
     error: str
+
+
+class VersionedMathQueueBodySchema(
+    BaseTestSchema,
+    for_type="versioned_math_calc",
+):
+    """Schema which has been changed twice since first version."""
+
+    schema_version = 3
+
+    a: int
+    b: int
+    precision: int
+
+
+@VersionedMathQueueBodySchema.upgrader(from_version=1)
+def rename_operands(body: dict[str, typing.Any]) -> dict[str, typing.Any]:
+    """Rename operands from `x` and `y` to `a` and `b`."""
+    return {"a": body["x"], "b": body["y"]}
+
+
+@VersionedMathQueueBodySchema.upgrader(from_version=2)
+def add_precision(body: dict[str, typing.Any]) -> dict[str, typing.Any]:
+    """Add default precision."""
+    return {**body, "precision": 0}
@@ -0,0 +1,146 @@
+import collections
+import collections.abc
+import time
+import typing
+
+import sns_sqs_communicator
+
+
+class FakeSQSTransport:
+    """Fake boto3 SQS client which keeps queue in memory.
+
+    Sent messages are delivered on receiving along with the given ones.
+    Deletion of `failed_receipt_handles` is always rejected, while deletion
+    of `flaky_receipt_handles` fails once.
+
+    """
+
+    def __init__(
+        self,
+        raw_messages: collections.abc.Iterable[typing.Any] = (),
+        send_errors: collections.abc.Iterable[Exception] = (),
+        failed_receipt_handles: collections.abc.Collection[str] = (),
+        flaky_receipt_handles: collections.abc.Collection[str] = (),
+        # Max number of messages delivered by single receive
+        receive_batch_size: int = 10,
+        # Delays of receives, they are taken one by one
+        receive_delays: collections.abc.Iterable[float] = (),
+        delete_delay_seconds: float = 0,
+        # System attributes of messages delivered after sending
+        attributes: dict[str, str] | None = None,
+    ) -> None:
+        self.raw_messages = list(raw_messages)
+        self.send_errors = list(send_errors)
+        self.failed_receipt_handles = failed_receipt_handles
+        self.flaky_receipt_handles = set(flaky_receipt_handles)
+        self.receive_batch_size = receive_batch_size
+        self.receive_delays = list(receive_delays)
+        self.delete_delay_seconds = delete_delay_seconds
+        self.attributes = attributes or {}
+        self.calls: collections.Counter[str] = collections.Counter()
+        self.sent_messages: list[dict[str, typing.Any]] = []
+        self.receive_kwargs: dict[str, typing.Any] = {}
+        self.deleted_entries: list[dict[str, str]] = []
+        self.visibility_changes: list[dict[str, typing.Any]] = []
+
+    def send_message(self, **kwargs: typing.Any) -> dict[str, str]:
+        """Put message into queue or raise next error."""
+        self.calls["send_message"] += 1
+        if self.send_errors:
+            raise self.send_errors.pop(0)
+        index = len(self.sent_messages)
+        self.sent_messages.append(kwargs)
+        self.raw_messages.append(
+            {
+                "MessageId": f"message-{index}",
+                "ReceiptHandle": f"receipt-handle-{index}",
+                "Body": kwargs["MessageBody"],
+                "MessageAttributes": kwargs["MessageAttributes"],
+                "Attributes": self.attributes,
+            },
+        )
+        return {"MessageId": f"message-{index}"}
+
+    def receive_message(self, **kwargs: typing.Any) -> dict[str, typing.Any]:
+        """Deliver messages waiting in queue."""
+        self.calls["receive_message"] += 1
+        self.receive_kwargs = kwargs
+        raw_messages = self.raw_messages[: self.receive_batch_size]
+        del self.raw_messages[: self.receive_batch_size]
+        if self.receive_delays:
+            time.sleep(self.receive_delays.pop(0))
+        return {"Messages": raw_messages}
+
+    def delete_message_batch(
+        self,
+        Entries: list[dict[str, str]],  # noqa: N803
+        **kwargs: typing.Any,
+    ) -> dict[str, typing.Any]:
+        """Delete messages rejecting failed and flaky ones."""
+        self.calls["delete_message_batch"] += 1
+        time.sleep(self.delete_delay_seconds)
+        successful: list[dict[str, str]] = []
+        failed: list[dict[str, typing.Any]] = []
+        for entry in Entries:
+            receipt_handle = entry["ReceiptHandle"]
+            if receipt_handle in self.failed_receipt_handles:
+                failed.append(
+                    {
+                        "Id": entry["Id"],
+                        "SenderFault": True,
+                        "Code": "Invalid",
+                    },
+                )
+            elif receipt_handle in self.flaky_receipt_handles:
+                self.flaky_receipt_handles.discard(receipt_handle)
+                failed.append(
+                    {
+                        "Id": entry["Id"],
+                        "SenderFault": False,
+                        "Code": "Internal",
+                    },
+                )
+            else:
+                self.deleted_entries.append(entry)
+                successful.append({"Id": entry["Id"]})
+        return {"Successful": successful, "Failed": failed}
+
+    def change_message_visibility_batch(
+        self,
+        **kwargs: typing.Any,
+    ) -> dict[str, typing.Any]:
+        """Remember changed visibility."""
+        self.visibility_changes.append(kwargs)
+        return {"Successful": [], "Failed": []}
+
+    def get_queue_url(self, QueueName: str) -> dict[str, str]:  # noqa: N803
+        """Return url of queue."""
+        self.calls["get_queue_url"] += 1
+        return {"QueueUrl": f"http://localhost/000000000000/{QueueName}"}
+
+    def get_queue_attributes(
+        self,
+        QueueUrl: str,  # noqa: N803
+        **kwargs: typing.Any,
+    ) -> dict[str, dict[str, str]]:
+        """Return arn of queue."""
+        self.calls["get_queue_attributes"] += 1
+        name = QueueUrl.rsplit("/", 1)[-1]
+        return {"Attributes": {"QueueArn": f"arn:sqs:{name}"}}
+
+    def delete_queue(self, QueueUrl: str) -> dict[str, typing.Any]:  # noqa: N803
+        """Pretend that queue is deleted."""
+        return {}
+
+
+def prepare_queue(
+    transport: FakeSQSTransport,
+    queue_url: str = "queue-url",
+) -> sns_sqs_communicator.queue.SQSQueue:
+    """Prepare queue with fake transport."""
+    return sns_sqs_communicator.queue.SQSQueue(
+        client=sns_sqs_communicator.clients.SQSClient(
+            client=transport,  # type: ignore
+        ),
+        queue_url=queue_url,
+    )
@@ -0,0 +1,82 @@
+import typing
+import unittest.mock
+
+import sns_sqs_communicator
+
+
+async def test_split_into_batches() -> None:
+    """Test that batches respect both entries and size limits."""
+    small_message = sns_sqs_communicator.prepared.PreparedMessage(
+        body="x",
+        metadata={"type": "math_calc"},
+    )
+    large_message = sns_sqs_communicator.prepared.PreparedMessage(
+        body="x" * 100 * 1024,
+        metadata={"type": "math_calc"},
+    )
+    batches = sns_sqs_communicator.batching.split_into_batches(
+        [small_message] * 15 + [large_message] * 3,
+    )
+    assert [list(batch) for batch in batches] == [
+        [str(index) for index in range(10)],
+        [str(index) for index in range(10, 17)],
+        ["17"],
+    ]
+
+
+async def test_put_many() -> None:
+    """Test that messages are sent in batches and failed ones retried."""
+    attempts: dict[str, int] = {}
+
+    async def send_message_batch(
+        entries: list[dict[str, typing.Any]],
+        queue_url: str,
+    ) -> dict[str, typing.Any]:
+        """Fail every entry on its first attempt and body `3` always."""
+        successful, failed = [], []
+        for entry in entries:
+            attempts[entry["Id"]] = attempts.get(entry["Id"], 0) + 1
+            if entry["MessageBody"] == '{"index":3}':
+                failed.append(
+                    {
+                        "Id": entry["Id"],
+                        "Code": "InvalidParameterValue",
+                        "SenderFault": True,
+                    },
+                )
+            elif attempts[entry["Id"]] == 1:
+                failed.append(
+                    {
+                        "Id": entry["Id"],
+                        "Code": "InternalError",
+                        "SenderFault": False,
+                    },
+                )
+            else:
+                successful.append(
+                    {"Id": entry["Id"], "MessageId": f"message-{entry['Id']}"},
+                )
+        return {"Successful": successful, "Failed": failed}
+
+    sqs_client = unittest.mock.create_autospec(
+        sns_sqs_communicator.clients.SQSClient,
+        instance=True,
+    )
+    sqs_client.send_message_batch.side_effect = send_message_batch
+    queue = sns_sqs_communicator.queue.SQSQueue(
+        client=sqs_client,
+        queue_url="queue-url",
+    )
+    results = await queue.put_many(
+        [({"index": index}, {"type": "math_calc"}) for index in range(25)],
+        retry_delay_seconds=0,
+    )
+    assert sqs_client.send_message_batch.call_count == 6
+    assert [result for index, result in enumerate(results) if index != 3] == [
+        f"message-{index}" for index in range(25) if index != 3
+    ]
+    assert isinstance(
+        results[3],
+        sns_sqs_communicator.batching.BatchEntryError,
+    )
+    assert attempts["3"] == 1
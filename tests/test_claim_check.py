@@ -0,0 +1,299 @@
+import collections.abc
+import logging
+import pathlib
+import threading
+import typing
+
+import pytest
+import ujson
+
+import sns_sqs_communicator
+
+from . import queues
+
+
+@pytest.fixture
+def claim_check_config(
+    tmp_path: pathlib.Path,
+) -> sns_sqs_communicator.claim_check.ClaimCheckConfig:
+    """Prepare claim check config with local blob store."""
+    return sns_sqs_communicator.claim_check.ClaimCheckConfig(
+        store=sns_sqs_communicator.claim_check.LocalBlobStore(
+            directory=tmp_path,
+        ),
+        threshold=1024,
+    )
+
+
+async def test_offload_below_threshold(
+    claim_check_config: sns_sqs_communicator.claim_check.ClaimCheckConfig,
+    tmp_path: pathlib.Path,
+) -> None:
+    """Test that small messages are sent as is."""
+    body = ujson.dumps({"a": 1, "b": 2})
+    metadata = {"type": "math_calc"}
+    assert claim_check_config.offload(body, metadata) == (body, metadata)
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.parametrize(
+    ["parser", "prepare_raw_message"],
+    [
+        [queues.SQSParser, queues.prepare_sqs_raw_message],
+        [queues.SNSParser, queues.prepare_sns_raw_message],
+        [queues.LazySQSParser, queues.prepare_sqs_raw_message],
+        [queues.LazySNSParser, queues.prepare_sns_raw_message],
+    ],
+)
+async def test_claim_check_roundtrip(
+    claim_check_config: sns_sqs_communicator.claim_check.ClaimCheckConfig,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    parser: type[sns_sqs_communicator.parsers.ParserProtocol[typing.Any]],
+    prepare_raw_message: collections.abc.Callable[..., typing.Any],
+) -> None:
+    """Test that large bodies are offloaded, retrieved and released."""
+    monkeypatch.setattr(parser, "claim_check_config", claim_check_config)
+    body, metadata = claim_check_config.offload(
+        ujson.dumps({"a": 1, "b": 2, "padding": "ab" * 1000}),
+        {},
+    )
+    assert (tmp_path / body).exists()
+    assert metadata == {"claim-check": body}
+
+    raw_message = prepare_raw_message(body, **metadata)
+    assert parser.get_claim_check_key(raw_message) == body
+    assert parser.parse(raw_message).body_schema == (
+        queues.MathQueueBodySchema(a=1, b=2)
+    )
+
+    await queues.SQSPollWorker.release_claim_checks(
+        raw_messages=[raw_message],
+        parser=parser,
+    )
+    assert not (tmp_path / body).exists()
+
+
+async def test_claim_check_with_compression(
+    claim_check_config: sns_sqs_communicator.claim_check.ClaimCheckConfig,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that compressed bodies could be offloaded as well."""
+    monkeypatch.setattr(
+        queues.SQSParser,
+        "claim_check_config",
+        claim_check_config,
+    )
+    body, metadata = sns_sqs_communicator.compression.CompressionConfig(
+        threshold=0,
+    ).compress(
+        ujson.dumps(
+            {"a": 1, "b": 2, "padding": [str(i) for i in range(1000)]},
+        ),
+        {},
+    )
+    body, metadata = claim_check_config.offload(body, metadata)
+    assert set(metadata) == {"claim-check", "content-encoding"}
+    raw_message = queues.prepare_sqs_raw_message(body, **metadata)
+    assert queues.SQSParser.parse(raw_message).body_schema == (
+        queues.MathQueueBodySchema(a=1, b=2)
+    )
+
+
+async def test_claim_check_not_configured(
+    claim_check_config: sns_sqs_communicator.claim_check.ClaimCheckConfig,
+) -> None:
+    """Test that missing claim check config is reported."""
+    body, metadata = claim_check_config.offload("a" * 2048, {})
+    with pytest.raises(
+        sns_sqs_communicator.claim_check.ClaimCheckNotConfiguredError,
+    ):
+        queues.SQSParser.parse(
+            queues.prepare_sqs_raw_message(body, **metadata),
+        )
+
+
+@pytest.mark.parametrize("key", ["../outside", "nested/key", "not-a-uuid"])
+async def test_invalid_claim_check_key(
+    claim_check_config: sns_sqs_communicator.claim_check.ClaimCheckConfig,
+    key: str,
+) -> None:
+    """Test that keys which weren't generated on offloading are rejected."""
+    with pytest.raises(
+        sns_sqs_communicator.claim_check.InvalidClaimCheckKeyError,
+    ):
+        claim_check_config.retrieve(key)
+    with pytest.raises(
+        sns_sqs_communicator.claim_check.InvalidClaimCheckKeyError,
+    ):
+        claim_check_config.store.get(f"../{key}")
+    # Invalid keys are skipped on release
+    claim_check_config.release([key])
+
+
+async def test_claim_check_cache(tmp_path: pathlib.Path) -> None:
+    """Test that cache is bounded by bytes and released bodies dropped."""
+    claim_check_config = sns_sqs_communicator.claim_check.ClaimCheckConfig(
+        store=sns_sqs_communicator.claim_check.LocalBlobStore(
+            directory=tmp_path,
+        ),
+        threshold=0,
+        cache_max_bytes=1024,
+        delete_after_ack=False,
+    )
+    keys = [claim_check_config.offload("a" * 400, {})[0] for _ in range(3)]
+    for key in keys:
+        assert claim_check_config.retrieve(key) == "a" * 400
+    # Only the last two bodies fit into cache
+    assert list(claim_check_config._cache) == keys[1:]
+    claim_check_config.release(keys[1:2])
+    assert list(claim_check_config._cache) == keys[2:]
+
+
+async def test_claim_check_kept_on_failed_delete(
+    claim_check_config: sns_sqs_communicator.claim_check.ClaimCheckConfig,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    logger: logging.Logger,
+) -> None:
+    """Test that bodies of messages which weren't deleted are kept."""
+    monkeypatch.setattr(
+        queues.SQSParser,
+        "claim_check_config",
+        claim_check_config,
+    )
+    raw_messages = []
+    for index in range(2):
+        body, metadata = claim_check_config.offload(
+            ujson.dumps({"a": index, "b": 2, "padding": "ab" * 1000}),
+            {},
+        )
+        raw_message = queues.prepare_sqs_raw_message(body, **metadata)
+        raw_message["ReceiptHandle"] = f"receipt-handle-{index}"
+        raw_messages.append(raw_message)
+    message_queue = queues.prepare_queue(
+        queues.FakeSQSTransport(
+            raw_messages=raw_messages,
+            failed_receipt_handles=["receipt-handle-0"],
+        ),
+    )
+    results = await queues.SQSPollWorker.pull_messages(
+        queue=message_queue,
+        dead_letter_queue=message_queue,
+        parser=queues.SQSParser,
+        logger=logger,
+    )
+    assert [result.result for result in results] == [2, 3]
+    assert [
+        (tmp_path / raw_message["Body"]).exists()
+        for raw_message in raw_messages
+    ] == [True, False]
+
+
+async def test_claim_check_kept_on_dead_letter(
+    claim_check_config: sns_sqs_communicator.claim_check.ClaimCheckConfig,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    logger: logging.Logger,
+) -> None:
+    """Test that body of dead-lettered message could still be redriven."""
+    monkeypatch.setattr(
+        queues.SQSParser,
+        "claim_check_config",
+        claim_check_config,
+    )
+    body, metadata = claim_check_config.offload(
+        ujson.dumps({"error": "Failed", "padding": "ab" * 1000}),
+        {},
+    )
+    dead_letter_transport = queues.FakeSQSTransport()
+    (result,) = await queues.SQSPollWorker.pull_messages(
+        queue=queues.prepare_queue(
+            queues.FakeSQSTransport(
+                raw_messages=[
+                    queues.prepare_sqs_raw_message(
+                        body,
+                        message_type="fail",
+                        action="fail",
+                        **metadata,
+                    ),
+                ],
+            ),
+        ),
+        dead_letter_queue=queues.prepare_queue(dead_letter_transport),
+        parser=queues.SQSParser,
+        logger=logger,
+    )
+    assert result.is_failed
+    (dead_letter,) = dead_letter_transport.sent_messages
+    assert ujson.loads(dead_letter["MessageBody"])["raw_message"] == body
+    assert (tmp_path / body).exists()
+
+
+class ThreadRecordingBlobStore(
+    sns_sqs_communicator.claim_check.LocalBlobStore,
+):
+    """Local blob store which remembers threads bodies are read in."""
+
+    def __init__(self, directory: pathlib.Path) -> None:
+        super().__init__(directory=directory)
+        self.get_thread_ids: list[int] = []
+
+    def get(self, key: str) -> bytes:
+        """Remember thread and read body."""
+        self.get_thread_ids.append(threading.get_ident())
+        return super().get(key)
+
+
+@pytest.mark.parametrize("parser", [queues.SQSParser, queues.LazySQSParser])
+async def test_claim_check_retrieved_in_thread(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    logger: logging.Logger,
+    parser: type[sns_sqs_communicator.parsers.ParserProtocol[typing.Any]],
+) -> None:
+    """Test that offloaded bodies aren't read on event loop."""
+    store = ThreadRecordingBlobStore(directory=tmp_path)
+    claim_check_config = sns_sqs_communicator.claim_check.ClaimCheckConfig(
+        store=store,
+        threshold=0,
+        cache_max_bytes=0,
+    )
+    monkeypatch.setattr(parser, "claim_check_config", claim_check_config)
+    body, metadata = claim_check_config.offload(
+        ujson.dumps({"a": 1, "b": 2}),
+        {},
+    )
+    (result,) = await queues.SQSPollWorker.pull_messages(
+        queue=queues.prepare_queue(
+            queues.FakeSQSTransport(
+                raw_messages=[
+                    queues.prepare_sqs_raw_message(body, **metadata),
+                ],
+            ),
+        ),
+        dead_letter_queue=queues.prepare_queue(queues.FakeSQSTransport()),
+        parser=parser,
+        logger=logger,
+    )
+    assert result.result == 3
+    (get_thread_id,) = store.get_thread_ids
+    assert get_thread_id != threading.get_ident()
+    assert not claim_check_config._prefetched
+
+
+class LegacyParser:
+    """Parser implemented before claim checks and tracing."""
+
+    @classmethod
+    def parse(cls, raw_message: typing.Any) -> typing.Any:
+        """Parse message."""
+        return queues.SQSParser.parse(raw_message)
+
+
+async def test_legacy_parser() -> None:
+    """Test that parsers without claim check support still work."""
+    await queues.SQSPollWorker.release_claim_checks(
+        raw_messages=[queues.prepare_sqs_raw_message("{}")],
+        parser=LegacyParser,  # type: ignore
+    )
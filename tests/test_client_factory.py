@@ -0,0 +1,70 @@
+import anyio.to_thread
+
+import botocore.config
+import botocore.credentials
+
+import sns_sqs_communicator
+
+
+def get_credentials() -> botocore.credentials.Credentials:
+    """Get fake credentials."""
+    return botocore.credentials.Credentials(
+        access_key="access-key",
+        secret_key="secret-key",
+    )
+
+
+async def test_clients_cached() -> None:
+    """Test that clients are created once per region and endpoint."""
+    sqs_client = sns_sqs_communicator.clients.get_boto3_sqs_client(
+        access_key_getter=get_credentials,
+        region="us-east-1",
+    )
+    assert sqs_client is sns_sqs_communicator.clients.get_boto3_sqs_client(
+        access_key_getter=get_credentials,
+        region="us-east-1",
+    )
+    assert sqs_client is not (
+        sns_sqs_communicator.clients.get_boto3_sqs_client(
+            access_key_getter=get_credentials,
+            region="eu-west-1",
+        )
+    )
+    sns_client = sns_sqs_communicator.clients.get_boto3_sns_client(
+        access_key_getter=get_credentials,
+        region="us-east-1",
+        config=sns_sqs_communicator.clients.ClientConfig(read_timeout=5),
+    )
+    assert sns_client.meta.config.read_timeout == 5
+    # Pool size matches number of threads boto3 calls are run in
+    assert sns_client.meta.config.max_pool_connections == (
+        sns_sqs_communicator.clients.factory.DEFAULT_THREADS_LIMIT
+    )
+
+
+def test_client_config_keeps_botocore_defaults() -> None:
+    """Test that only configured settings are passed to botocore."""
+    default_config = botocore.config.Config()
+    config = sns_sqs_communicator.clients.ClientConfig().to_botocore_config()
+    assert config.retries == default_config.retries
+    assert config.connect_timeout == default_config.connect_timeout
+    assert config.read_timeout == default_config.read_timeout
+    config = sns_sqs_communicator.clients.ClientConfig(
+        max_attempts=1,
+    ).to_botocore_config()
+    assert config.retries == {"max_attempts": 1}
+
+
+async def test_client_pool_size_follows_threads_limit() -> None:
+    """Test that pool size isn't fixed by first created client."""
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    total_tokens = limiter.total_tokens
+    limiter.total_tokens = 7
+    try:
+        sqs_client = sns_sqs_communicator.clients.get_boto3_sqs_client(
+            access_key_getter=get_credentials,
+            region="us-east-1",
+        )
+    finally:
+        limiter.total_tokens = total_tokens
+    assert sqs_client.meta.config.max_pool_connections == 7
@@ -0,0 +1,136 @@
+import collections.abc
+import logging
+import typing
+
+import pytest
+import ujson
+
+import sns_sqs_communicator
+
+from . import queues
+
+
+@pytest.fixture(
+    params=[
+        sns_sqs_communicator.compression.GzipCodec(),
+        sns_sqs_communicator.compression.ZstdCodec(),
+    ],
+    ids=["gzip", "zstd"],
+)
+def compression_config(
+    request: pytest.FixtureRequest,
+) -> sns_sqs_communicator.compression.CompressionConfig:
+    """Prepare compression config with small threshold."""
+    return sns_sqs_communicator.compression.CompressionConfig(
+        codec=request.param,
+        threshold=64,
+    )
+
+
+async def test_compression_below_threshold(
+    compression_config: sns_sqs_communicator.compression.CompressionConfig,
+) -> None:
+    """Test that small bodies are sent as is."""
+    body = ujson.dumps({"a": 1, "b": 2})
+    metadata = {"type": "math_calc"}
+    assert compression_config.compress(body, metadata) == (body, metadata)
+
+
+async def test_compression_roundtrip(
+    compression_config: sns_sqs_communicator.compression.CompressionConfig,
+) -> None:
+    """Test that large bodies are compressed and marked in metadata."""
+    body = ujson.dumps({"a": 1, "b": 2, "padding": "ab" * 1000})
+    metadata = {"type": "math_calc"}
+    compressed_body, compressed_metadata = compression_config.compress(
+        body,
+        metadata,
+    )
+    assert len(compressed_body) < len(body)
+    assert compressed_metadata == {
+        "type": "math_calc",
+        "content-encoding": compression_config.codec.name,
+    }
+    assert metadata == {"type": "math_calc"}
+    assert (
+        sns_sqs_communicator.compression.decompress(
+            compressed_body,
+            compression_config.codec.name,
+        )
+        == body
+    )
+
+
+async def test_decompression_unknown_encoding() -> None:
+    """Test that unknown content encoding is reported."""
+    with pytest.raises(
+        sns_sqs_communicator.compression.UnknownContentEncodingError,
+    ):
+        sns_sqs_communicator.compression.decompress("body", "unknown")
+
+
+@pytest.mark.parametrize(
+    ["parser", "prepare_raw_message"],
+    [
+        [queues.SQSParser, queues.prepare_sqs_raw_message],
+        [queues.SNSParser, queues.prepare_sns_raw_message],
+        [queues.LazySQSParser, queues.prepare_sqs_raw_message],
+        [queues.LazySNSParser, queues.prepare_sns_raw_message],
+    ],
+)
+async def test_parsing_compressed_message(
+    compression_config: sns_sqs_communicator.compression.CompressionConfig,
+    parser: type[sns_sqs_communicator.parsers.ParserProtocol[typing.Any]],
+    prepare_raw_message: collections.abc.Callable[..., typing.Any],
+) -> None:
+    """Test that parsers decompress bodies transparently."""
+    body = {"a": 1, "b": 2, "padding": "ab" * 1000}
+    compressed_body, metadata = compression_config.compress(
+        ujson.dumps(body),
+        {},
+    )
+    raw_message = prepare_raw_message(compressed_body, **metadata)
+    assert parser.parse(raw_message).body_schema == (
+        queues.MathQueueBodySchema(a=1, b=2)
+    )
+
+
+@pytest.mark.parametrize(
+    "send_error",
+    [None, RuntimeError("Dead letter queue is unavailable")],
+    ids=["dead_lettered", "dead_letter_failed"],
+)
+async def test_unknown_encoding_dead_lettered(
+    send_error: Exception | None,
+    logger: logging.Logger,
+) -> None:
+    """Test that message with unknown encoding doesn't break worker."""
+    raw_message = queues.prepare_sqs_raw_message(
+        "compressed",
+        **{sns_sqs_communicator.compression.CONTENT_ENCODING_ATTRIBUTE: "br"},
+    )
+    transport = queues.FakeSQSTransport(raw_messages=[raw_message])
+    dead_letter_transport = queues.FakeSQSTransport(
+        send_errors=[send_error] if send_error else [],
+    )
+    (result,) = await queues.SQSPollWorker.pull_messages(
+        queue=queues.prepare_queue(transport),
+        dead_letter_queue=queues.prepare_queue(dead_letter_transport),
+        parser=queues.SQSParser,
+        logger=logger,
+    )
+    assert result.is_failed
+    if send_error:
+        # Message comes back after visibility timeout
+        assert not transport.deleted_entries
+        return
+    assert transport.deleted_entries == [
+        {"Id": "0", "ReceiptHandle": "receipt-handle"},
+    ]
+    (dead_letter,) = dead_letter_transport.sent_messages
+    dead_letter_body = ujson.loads(dead_letter["MessageBody"])
+    assert dead_letter_body["raw_message"] == "compressed"
+    assert (
+        dead_letter_body["message_attributes"]
+        == raw_message["MessageAttributes"]
+    )
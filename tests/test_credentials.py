@@ -0,0 +1,47 @@
+import threading
+import unittest.mock
+
+import botocore.credentials
+
+import sns_sqs_communicator
+
+
+async def test_caching_access_key_getter() -> None:
+    """Test that credentials are cached and refreshed in background."""
+    refreshed = threading.Event()
+    access_key_getter = unittest.mock.Mock(
+        side_effect=[
+            botocore.credentials.Credentials(
+                access_key=f"access-key-{index}",
+                secret_key="secret-key",
+            )
+            for index in range(1, 3)
+        ],
+    )
+    caching_access_key_getter = (
+        sns_sqs_communicator.clients.CachingAccessKeyGetter(
+            access_key_getter=access_key_getter,
+            ttl_seconds=60,
+            refresh_ahead_seconds=0,
+            jitter_seconds=0,
+        )
+    )
+    assert caching_access_key_getter().access_key == "access-key-1"
+    assert caching_access_key_getter().access_key == "access-key-1"
+    assert access_key_getter.call_count == 1
+
+    # Make credentials due to refresh, but not expired yet
+    caching_access_key_getter._refresh_at = 0
+    refresh = caching_access_key_getter.refresh
+
+    def refresh_and_notify() -> botocore.credentials.Credentials:
+        """Refresh credentials and notify test about it."""
+        credentials = refresh()
+        refreshed.set()
+        return credentials
+
+    caching_access_key_getter.refresh = refresh_and_notify  # type: ignore
+    # Cached credentials are returned without waiting for refresh
+    assert caching_access_key_getter().access_key == "access-key-1"
+    assert refreshed.wait(timeout=5)
+    assert caching_access_key_getter().access_key == "access-key-2"
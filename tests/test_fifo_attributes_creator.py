@@ -0,0 +1,57 @@
+import sns_sqs_communicator
+
+
+class OrderFifoAttributesCreator(
+    sns_sqs_communicator.fifo_attributes_creator.EntityFifoAttributesCreator,
+):
+    """Group messages by order."""
+
+    entity_key_path = ("order", "id")
+
+
+class ShardedOrderFifoAttributesCreator(
+    sns_sqs_communicator.fifo_attributes_creator.ShardedFifoAttributesCreator,
+):
+    """Group messages by order into shards."""
+
+    entity_key_path = ("order", "id")
+    shards_count = 4
+
+
+async def test_entity_message_group_id() -> None:
+    """Test that messages are grouped by entity."""
+    metadata = {"action": "plus", "type": "order"}
+    assert (
+        OrderFifoAttributesCreator.get_message_group_id(
+            {"order": {"id": 1}},
+            metadata,
+        )
+        == "order:1"
+    )
+    message_group_id = OrderFifoAttributesCreator.get_message_group_id(
+        {"order": {"id": "x" * 200}},
+        metadata,
+    )
+    assert len(message_group_id) <= (
+        sns_sqs_communicator.fifo_attributes_creator.MAX_MESSAGE_GROUP_ID_LENGTH
+    )
+
+
+async def test_sharded_message_group_id() -> None:
+    """Test that entities are spread over fixed number of shards."""
+    metadata = {"action": "plus", "type": "order"}
+    message_group_ids = {
+        ShardedOrderFifoAttributesCreator.get_message_group_id(
+            {"order": {"id": order_id}},
+            metadata,
+        )
+        for order_id in range(100)
+    }
+    assert message_group_ids == {f"order:{shard}" for shard in range(4)}
+    assert ShardedOrderFifoAttributesCreator.get_message_group_id(
+        {"order": {"id": 42}},
+        metadata,
+    ) == ShardedOrderFifoAttributesCreator.get_message_group_id(
+        {"order": {"id": 42}},
+        metadata,
+    )
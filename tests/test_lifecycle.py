@@ -0,0 +1,106 @@
+import logging
+import typing
+
+import pytest
+
+import sns_sqs_communicator
+
+from . import queues
+
+# Message has been waiting in queue for 2 seconds before receiving
+SENT_TIMESTAMP = 1_700_000_000_000
+FIRST_RECEIVE_TIMESTAMP = SENT_TIMESTAMP + 2_000
+
+
+@pytest.fixture
+def registry() -> typing.Generator[
+    sns_sqs_communicator.metrics.builtin.MetricsRegistry,
+    None,
+    None,
+]:
+    """Get built-in registry cleaned after test."""
+    registry = sns_sqs_communicator.metrics.builtin.registry
+    registry.reset()
+    yield registry
+    registry.reset()
+
+
+async def test_lifecycle_timings(
+    registry: sns_sqs_communicator.metrics.builtin.MetricsRegistry,
+) -> None:
+    """Test that stages of messages are recorded by type and action.
+
+    Deletion of the failed message is rejected, so it isn't acknowledged.
+
+    """
+    transport = queues.FakeSQSTransport(
+        failed_receipt_handles=["receipt-handle-1"],
+        delete_delay_seconds=0.01,
+        attributes={
+            "SentTimestamp": str(SENT_TIMESTAMP),
+            "ApproximateFirstReceiveTimestamp": str(FIRST_RECEIVE_TIMESTAMP),
+        },
+    )
+    message_queue = queues.prepare_queue(transport)
+    await message_queue.put(
+        body={"a": 1, "b": 2},
+        metadata={"type": "math_calc", "action": "plus"},
+    )
+    await message_queue.put(
+        body={"error": "Failed"},
+        metadata={"type": "fail", "action": "fail"},
+    )
+    await queues.SQSPollWorker.pull_messages(
+        queue=message_queue,
+        dead_letter_queue=queues.prepare_queue(
+            queues.FakeSQSTransport(),
+            queue_url="dead-letter-queue-url",
+        ),
+        parser=queues.SQSParser,
+        logger=logging.getLogger(__name__),
+    )
+    assert transport.receive_kwargs["MessageSystemAttributeNames"] == [
+        "SentTimestamp",
+        "ApproximateFirstReceiveTimestamp",
+    ]
+
+    durations = registry.snapshot().durations
+    stages = set(sns_sqs_communicator.lifecycle.Stage)
+    for labels, recorded_stages in (
+        (
+            (("action", "fail"), ("type", "fail")),
+            stages - {sns_sqs_communicator.lifecycle.Stage.ack},
+        ),
+        ((("action", "plus"), ("type", "math_calc")), stages),
+    ):
+        assert {name for name, tags in durations if tags == labels} == {
+            f"sns_sqs_communicator.message.{stage}"
+            for stage in recorded_stages
+        }
+    labels = (("action", "plus"), ("type", "math_calc"))
+    queue_wait = durations[("sns_sqs_communicator.message.queue_wait", labels)]
+    assert queue_wait.sum_seconds == 2
+    ack = durations[("sns_sqs_communicator.message.ack", labels)]
+    assert 0.01 <= ack.sum_seconds < 1
+    # First message waits in batch while nothing is processed before it
+    receive_to_dispatch = durations[
+        ("sns_sqs_communicator.message.receive_to_dispatch", labels)
+    ]
+    assert receive_to_dispatch.sum_seconds < 0.01
+
+    rendered = sns_sqs_communicator.metrics.prometheus.render()
+    assert (
+        "sns_sqs_communicator_message_queue_wait_seconds_count"
+        '{action="plus",type="math_calc"} 1'
+    ) in rendered
+
+
+def test_lifecycle_without_timestamps() -> None:
+    """Test that messages without timestamps aren't measured in queue."""
+    message_lifecycle = (
+        sns_sqs_communicator.lifecycle.MessageLifecycle.from_raw_message(
+            raw_message={"MessageId": "message-id"},
+        )
+    )
+    assert message_lifecycle.durations == {}
+    assert message_lifecycle.message_type == "unknown"
@@ -0,0 +1,238 @@
+import contextlib
+import os
+import signal
+import time
+import typing
+
+import anyio
+import pytest
+
+import sns_sqs_communicator
+
+
+@pytest.fixture
+def registry() -> typing.Generator[
+    sns_sqs_communicator.metrics.builtin.MetricsRegistry,
+    None,
+    None,
+]:
+    """Get built-in registry cleaned after test."""
+    registry = sns_sqs_communicator.metrics.builtin.registry
+    registry.reset()
+    yield registry
+    registry.reset()
+
+
+@sns_sqs_communicator.metrics.builtin.tracker
+def sleep(seconds: float) -> None:
+    """Sleep and fail if it's asked to sleep for no time."""
+    if not seconds:
+        raise ValueError("Nothing to do")
+    time.sleep(seconds)
+
+
+def test_histogram_buckets() -> None:
+    """Test that values fall into buckets with bounded relative error."""
+    histogram = sns_sqs_communicator.metrics.histograms.LogLinearHistogram()
+    for value in (*range(1000), 12_345, 2**20, 2**20 + 1):
+        upper_bound = histogram.get_bucket_upper_bound(
+            histogram.get_bucket_index(value),
+        )
+        assert value < upper_bound <= max(value + 1, value * 1.125 + 1)
+
+
+def test_builtin_tracker(
+    registry: sns_sqs_communicator.metrics.builtin.MetricsRegistry,
+) -> None:
+    """Test that calls, errors, latencies and counters are recorded."""
+    sleep(0.01)
+    sleep(0.01)
+    with pytest.raises(ValueError, match="Nothing to do"):
+        sleep(0)
+    sns_sqs_communicator.metrics.builtin.counter("retries", operation="put")
+    sns_sqs_communicator.metrics.builtin.counter("retries", operation="put")
+
+    snapshot = registry.snapshot()
+    stats = snapshot.functions[f"{__name__}:sleep"]
+    assert stats.calls == 3
+    assert stats.errors == 1
+    assert 0.01 <= stats.latency.quantile(0.9) < 0.1
+    assert snapshot.counters == {("retries", (("operation", "put"),)): 2}
+
+    exported = sns_sqs_communicator.metrics.prometheus.render(snapshot)
+    labels = f'function="{__name__}:sleep"'
+    duration = "sns_sqs_communicator_duration_seconds"
+    assert f"sns_sqs_communicator_calls_total{{{labels}}} 3" in exported
+    assert f"sns_sqs_communicator_errors_total{{{labels}}} 1" in exported
+    assert f'{duration}_bucket{{{labels},le="0.001"}} 1' in exported
+    assert f'{duration}_bucket{{{labels},le="+Inf"}} 3' in exported
+    assert 'retries_total{operation="put"} 2' in exported
+
+
+def test_default_counter_and_histogram(
+    registry: sns_sqs_communicator.metrics.builtin.MetricsRegistry,
+) -> None:
+    """Test that events and durations are recorded into built-in registry."""
+    sns_sqs_communicator.metrics.counter("hedges", operation="receive")
+    sns_sqs_communicator.metrics.histogram("ack", 0.5, type="math_calc")
+    snapshot = registry.snapshot()
+    assert snapshot.counters == {("hedges", (("operation", "receive"),)): 1}
+    assert snapshot.durations[("ack", (("type", "math_calc"),))].count == 1
+
+
+def test_snapshot_skips_unfinished_calls(
+    registry: sns_sqs_communicator.metrics.builtin.MetricsRegistry,
+) -> None:
+    """Test that functions without finished calls aren't exported."""
+    registry.get_function_stats(f"{__name__}:sleep")
+    assert registry.snapshot().functions == {}
+
+
+@sns_sqs_communicator.metrics.builtin.tracker
+async def async_sleep(seconds: float) -> None:
+    """Sleep asynchronously."""
+    await anyio.sleep(seconds)
+
+
+@sns_sqs_communicator.metrics.builtin.tracker
+async def generate_items(
+    count: int,
+    seconds: float,
+) -> typing.AsyncGenerator[int, None]:
+    """Generate items sleeping before each of them."""
+    for item in range(count):
+        await anyio.sleep(seconds)
+        yield item
+    raise ValueError("No more items")
+
+
+async def test_async_tracker(
+    registry: sns_sqs_communicator.metrics.builtin.MetricsRegistry,
+) -> None:
+    """Test that awaited execution of coroutines and generators is tracked."""
+    await async_sleep(0.02)
+    items = []
+
+    async def consume() -> None:
+        async for item in generate_items(count=2, seconds=0.01):
+            items.append(item)
+            await anyio.sleep(0.02)
+
+    with pytest.raises(ValueError, match="No more items"):
+        await consume()
+    assert items == [0, 1]
+
+    snapshot = registry.snapshot()
+    coroutine_stats = snapshot.functions[f"{__name__}:async_sleep"]
+    assert coroutine_stats.calls == 1
+    assert coroutine_stats.latency.quantile(1) >= 0.02
+    generator_stats = snapshot.functions[f"{__name__}:generate_items"]
+    assert generator_stats.calls == 1
+    assert generator_stats.errors == 1
+    assert generator_stats.latency.quantile(1) >= 0.06
+    assert generator_stats.item_latency
+    assert generator_stats.item_latency.count == 2
+    assert 0.01 <= generator_stats.item_latency.quantile(1) < 0.05
+
+
+class Tracked:
+    """Class with tracked methods of all kinds."""
+
+    @sns_sqs_communicator.metrics.tracker
+    def method(self) -> str:
+        """Return name of method."""
+        return "method"
+
+    @classmethod
+    @sns_sqs_communicator.metrics.tracker
+    def class_method(cls) -> str:
+        """Return name of method."""
+        return "class_method"
+
+    @contextlib.asynccontextmanager
+    @sns_sqs_communicator.metrics.tracker
+    async def context(self) -> typing.AsyncGenerator[str, None]:
+        """Provide name of method."""
+        yield "context"
+
+
+@sns_sqs_communicator.metrics.builtin.tracker
+async def open_transaction(
+    events: list[str],
+) -> typing.AsyncGenerator[str, None]:
+    """Provide transaction rolling it back on error."""
+    events.append("begin")
+    try:
+        yield "transaction"
+    except Exception:
+        events.append("rollback")
+        raise
+    events.append("commit")
+
+
+async def test_tracked_context_manager(
+    registry: sns_sqs_communicator.metrics.builtin.MetricsRegistry,
+) -> None:
+    """Test that errors reach tracked generator of context manager."""
+    transaction = contextlib.asynccontextmanager(open_transaction)
+    events: list[str] = []
+    async with transaction(events) as name:
+        assert name == "transaction"
+    with pytest.raises(ValueError, match="Failed"):
+        async with transaction(events):
+            raise ValueError("Failed")
+    assert events == ["begin", "commit", "begin", "rollback"]
+    stats = registry.snapshot().functions[f"{__name__}:open_transaction"]
+    assert stats.calls == 2
+    assert stats.errors == 1
+
+
+async def test_instrumentation_toggling(
+    registry: sns_sqs_communicator.metrics.builtin.MetricsRegistry,
+) -> None:
+    """Test that tracking of sites is enabled and disabled at runtime."""
+    instrumentation = sns_sqs_communicator.metrics.instrumentation.registry
+    original_method = Tracked.method
+    assert not hasattr(original_method, "__wrapped__")
+
+    async def call_all() -> None:
+        tracked = Tracked()
+        assert tracked.method() == "method"
+        assert Tracked.class_method() == "class_method"
+        async with tracked.context() as name:
+            assert name == "context"
+
+    try:
+        assert len(instrumentation.enable(f"{__name__}:Tracked.*")) == 3
+        assert Tracked.method.__wrapped__ is original_method  # type: ignore
+        await call_all()
+    finally:
+        instrumentation.disable(f"{__name__}:Tracked.*")
+    assert Tracked.method is original_method
+    await call_all()
+
+    functions = registry.snapshot().functions
+    assert {
+        name: stats.calls
+        for name, stats in functions.items()
+        if name.startswith(f"{__name__}:Tracked.")
+    } == {
+        f"{__name__}:Tracked.method": 1,
+        f"{__name__}:Tracked.class_method": 1,
+        f"{__name__}:Tracked.context": 1,
+    }
+
+
+def test_instrumentation_signal() -> None:
+    """Test that signal toggles tracking."""
+    instrumentation = sns_sqs_communicator.metrics.instrumentation.registry
+    previous_handler = signal.getsignal(signal.SIGUSR2)
+    try:
+        instrumentation.install_signal_handler()
+        os.kill(os.getpid(), signal.SIGUSR2)
+        assert hasattr(Tracked.method, "__wrapped__")
+        os.kill(os.getpid(), signal.SIGUSR2)
+        assert not hasattr(Tracked.method, "__wrapped__")
+    finally:
+        instrumentation.disable()
+        signal.signal(signal.SIGUSR2, previous_handler)
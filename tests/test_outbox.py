@@ -0,0 +1,171 @@
+import pathlib
+import typing
+import unittest.mock
+
+import pytest
+
+import sns_sqs_communicator
+
+
+async def test_outbox_flush(tmp_path: pathlib.Path) -> None:
+    """Test that rejected messages are moved to dead letters."""
+
+    async def publish_batch(
+        entries: list[dict[str, typing.Any]],
+        topic_arn: str,
+    ) -> dict[str, typing.Any]:
+        """Reject message with index 1."""
+        return {
+            "Successful": [
+                {"Id": entry["Id"], "MessageId": entry["Id"]}
+                for entry in entries
+                if entry["Message"] != '{"index":1}'
+            ],
+            "Failed": [
+                {"Id": entry["Id"], "Code": "Invalid", "SenderFault": True}
+                for entry in entries
+                if entry["Message"] == '{"index":1}'
+            ],
+        }
+
+    sns_client = unittest.mock.create_autospec(
+        sns_sqs_communicator.clients.SNSClient,
+        instance=True,
+    )
+    sns_client.publish_batch.side_effect = publish_batch
+    store = sns_sqs_communicator.outbox.SQLiteOutboxStore(
+        path=tmp_path / "outbox.sqlite",
+    )
+    outbox = sns_sqs_communicator.outbox.Outbox(
+        store=store,
+        topic=sns_sqs_communicator.topic.SNSTopic(
+            client=sns_client,
+            topic_arn="topic-arn",
+            fifo_attrs_creator=None,
+        ),
+    )
+    for index in range(3):
+        await outbox.put({"index": index}, {"type": "math_calc"})
+
+    assert await outbox.flush() == 2
+    assert not store.fetch(limit=10)
+    (dead_letter,) = store.fetch_dead_letters(limit=10)
+    assert dead_letter.entry.body == {"index": 1}
+    assert dead_letter.entry.metadata == {"type": "math_calc"}
+    assert dead_letter.entry.attempts == 1
+    assert "Invalid" in dead_letter.error
+
+
+async def test_outbox_retry(tmp_path: pathlib.Path) -> None:
+    """Test that failed messages are retried until they run out of attempts.
+
+    Body is offloaded only on first attempt and prepared message is reused
+    on next ones.
+
+    """
+
+    async def publish_batch(
+        entries: list[dict[str, typing.Any]],
+        topic_arn: str,
+    ) -> dict[str, typing.Any]:
+        """Fail every message because of service."""
+        sent_messages.extend(entry["Message"] for entry in entries)
+        return {
+            "Successful": [],
+            "Failed": [
+                {"Id": entry["Id"], "Code": "Throttled", "SenderFault": False}
+                for entry in entries
+            ],
+        }
+
+    sent_messages: list[str] = []
+    sns_client = unittest.mock.create_autospec(
+        sns_sqs_communicator.clients.SNSClient,
+        instance=True,
+    )
+    sns_client.publish_batch.side_effect = publish_batch
+    store = sns_sqs_communicator.outbox.SQLiteOutboxStore(
+        path=tmp_path / "outbox.sqlite",
+    )
+    claim_check_config = sns_sqs_communicator.claim_check.ClaimCheckConfig(
+        store=sns_sqs_communicator.claim_check.LocalBlobStore(
+            directory=tmp_path / "blobs",
+        ),
+        threshold=0,
+    )
+    outbox = sns_sqs_communicator.outbox.Outbox(
+        store=store,
+        topic=sns_sqs_communicator.topic.SNSTopic(
+            client=sns_client,
+            topic_arn="topic-arn",
+            fifo_attrs_creator=None,
+            claim_check_config=claim_check_config,
+        ),
+        max_attempts=3,
+    )
+    await outbox.put({"index": 0}, {"type": "math_calc"})
+
+    for attempt in range(1, 3):
+        assert await outbox.flush() == 0
+        (entry,) = store.fetch(limit=10)
+        assert entry.attempts == attempt
+        assert entry.prepared_message
+        assert entry.prepared_message.body == sent_messages[0]
+    assert await outbox.flush() == 0
+    assert not store.fetch(limit=10)
+    (dead_letter,) = store.fetch_dead_letters(limit=10)
+    assert dead_letter.entry.attempts == 3
+    assert len(set(sent_messages)) == 1
+    assert len(list((tmp_path / "blobs").iterdir())) == 1
+
+
+async def test_outbox_transaction(tmp_path: pathlib.Path) -> None:
+    """Test that message is stored only if transaction is committed."""
+    store = sns_sqs_communicator.outbox.SQLiteOutboxStore(
+        path=tmp_path / "outbox.sqlite",
+    )
+    with store.connect() as connection:
+        store.append({"index": 0}, {}, connection=connection)
+        connection.rollback()
+    assert not store.fetch(limit=10)
+    with store.connect() as connection:
+        store.append({"index": 1}, {}, connection=connection)
+    assert [entry.body for entry in store.fetch(limit=10)] == [{"index": 1}]
+
+
+async def test_outbox_outage(tmp_path: pathlib.Path) -> None:
+    """Test that failures of the whole call don't use up attempts."""
+    sns_client = unittest.mock.create_autospec(
+        sns_sqs_communicator.clients.SNSClient,
+        instance=True,
+    )
+    sns_client.publish_batch.side_effect = RuntimeError("SNS is unavailable")
+    store = sns_sqs_communicator.outbox.SQLiteOutboxStore(
+        path=tmp_path / "outbox.sqlite",
+    )
+    claim_check_config = sns_sqs_communicator.claim_check.ClaimCheckConfig(
+        store=sns_sqs_communicator.claim_check.LocalBlobStore(
+            directory=tmp_path / "blobs",
+        ),
+        threshold=0,
+    )
+    outbox = sns_sqs_communicator.outbox.Outbox(
+        store=store,
+        topic=sns_sqs_communicator.topic.SNSTopic(
+            client=sns_client,
+            topic_arn="topic-arn",
+            fifo_attrs_creator=None,
+            claim_check_config=claim_check_config,
+        ),
+        max_attempts=1,
+    )
+    await outbox.put({"index": 0}, {"type": "math_calc"})
+
+    for _ in range(3):
+        with pytest.raises(RuntimeError, match="SNS is unavailable"):
+            await outbox.flush()
+    (entry,) = store.fetch(limit=10)
+    assert entry.attempts == 0
+    assert entry.prepared_message
+    assert not store.fetch_dead_letters(limit=10)
+    assert len(list((tmp_path / "blobs").iterdir())) == 1
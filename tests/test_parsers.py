@@ -0,0 +1,193 @@
+import collections.abc
+import logging
+import typing
+
+import pydantic
+import pytest
+import ujson
+
+import sns_sqs_communicator
+
+from . import queues
+
+
+@pytest.mark.parametrize(
+    ["parser", "prepare_raw_message"],
+    [
+        [queues.LazySQSParser, queues.prepare_sqs_raw_message],
+        [queues.LazySNSParser, queues.prepare_sns_raw_message],
+    ],
+)
+async def test_lazy_parsing(
+    parser: type[sns_sqs_communicator.parsers.ParserProtocol[typing.Any]],
+    prepare_raw_message: collections.abc.Callable[..., typing.Any],
+) -> None:
+    """Test that lazy parsers validate body only on access."""
+    message = parser.parse(prepare_raw_message(ujson.dumps({"a": 1, "b": 2})))
+    assert isinstance(message, sns_sqs_communicator.messages.LazyMessage)
+    assert not message.is_body_loaded
+    assert message.metadata == {"action": "plus", "type": "math_calc"}
+    assert message.body_schema == queues.MathQueueBodySchema(a=1, b=2)
+    assert message.is_body_loaded
+
+
+@pytest.mark.parametrize(
+    ["parser", "prepare_raw_message"],
+    [
+        [queues.LazySQSParser, queues.prepare_sqs_raw_message],
+        [queues.LazySNSParser, queues.prepare_sns_raw_message],
+    ],
+)
+async def test_lazy_parsing_invalid_body(
+    parser: type[sns_sqs_communicator.parsers.ParserProtocol[typing.Any]],
+    prepare_raw_message: collections.abc.Callable[..., typing.Any],
+) -> None:
+    """Test that invalid body is reported only on access."""
+    message = parser.parse(prepare_raw_message(ujson.dumps({"a": "a"})))
+    with pytest.raises(pydantic.ValidationError):
+        message.body_schema  # noqa: B018
+
+
+@pytest.mark.parametrize(
+    ["parser", "prepare_raw_message"],
+    [
+        [queues.SQSParser, queues.prepare_sqs_raw_message],
+        [queues.SNSParser, queues.prepare_sns_raw_message],
+        [queues.SNSRawDeliveryParser, queues.prepare_sqs_raw_message],
+    ],
+)
+async def test_eager_parsing(
+    parser: type[sns_sqs_communicator.parsers.ParserProtocol[typing.Any]],
+    prepare_raw_message: collections.abc.Callable[..., typing.Any],
+) -> None:
+    """Test that eager parsers validate body right away."""
+    message = parser.parse(prepare_raw_message(ujson.dumps({"a": 1, "b": 2})))
+    assert isinstance(message, sns_sqs_communicator.messages.Message)
+    assert message.body_schema == queues.MathQueueBodySchema(a=1, b=2)
+
+
+@pytest.mark.parametrize(
+    ["parser", "prepare_raw_message"],
+    [
+        [queues.SQSParser, queues.prepare_sqs_raw_message],
+        [queues.SNSParser, queues.prepare_sns_raw_message],
+    ],
+)
+async def test_parse_many(
+    parser: type[sns_sqs_communicator.parsers.ParserProtocol[typing.Any]],
+    prepare_raw_message: collections.abc.Callable[..., typing.Any],
+) -> None:
+    """Test that batch parsing reports failures per message."""
+    results = parser.parse_many(
+        [
+            prepare_raw_message(ujson.dumps({"a": 1, "b": 2})),
+            prepare_raw_message(ujson.dumps({"a": "not a number", "b": 2})),
+            prepare_raw_message(
+                ujson.dumps({"message": "test"}),
+                message_type="canceled",
+            ),
+            prepare_raw_message("not a json"),
+            prepare_raw_message(
+                ujson.dumps({"message": "test"}),
+                message_type="unknown_schema",
+            ),
+            prepare_raw_message(ujson.dumps({"a": 3, "b": 4})),
+        ],
+    )
+    assert [result.is_ok for result in results] == [
+        True,
+        False,
+        True,
+        False,
+        False,
+        True,
+    ]
+    assert [
+        result.message.body_schema for result in results if result.message
+    ] == [
+        queues.MathQueueBodySchema(a=1, b=2),
+        queues.CancelQueueBodySchema(message="test"),
+        queues.MathQueueBodySchema(a=3, b=4),
+    ]
+    assert isinstance(results[1].exception, pydantic.ValidationError)
+    assert isinstance(
+        results[4].exception,
+        sns_sqs_communicator.schemas.QueueBodySchemaNotRegisteredError,
+    )
+
+
+async def test_parse_many_lazy() -> None:
+    """Test that lazy parsers don't validate bodies in batch."""
+    (result,) = queues.LazySQSParser.parse_many(
+        [queues.prepare_sqs_raw_message("not a json")],
+    )
+    assert result.is_ok
+    assert isinstance(
+        result.message,
+        sns_sqs_communicator.messages.LazyMessage,
+    )
+    assert not result.message.is_body_loaded
+
+
+def get_validation_result(
+    parser: type[sns_sqs_communicator.parsers.ParserProtocol[typing.Any]],
+    raw_message: typing.Any,
+) -> typing.Any:
+    """Get validated body or validation errors of message."""
+    try:
+        return parser.parse(raw_message).body_schema
+    except pydantic.ValidationError as error:
+        return error.errors()
+
+
+@pytest.mark.parametrize(
+    "body",
+    [{"a": "1", "b": 2.0}, {"a": "a", "b": 2}],
+    ids=["coerced", "invalid"],
+)
+async def test_lazy_and_eager_validation_match(
+    body: dict[str, typing.Any],
+) -> None:
+    """Test that lazy and eager parsers validate bodies the same way."""
+    raw_message = queues.prepare_sqs_raw_message(ujson.dumps(body))
+    assert get_validation_result(
+        queues.LazySQSParser,
+        raw_message,
+    ) == get_validation_result(queues.SQSParser, raw_message)
+
+
+async def test_lazy_message_canceled_without_parsing(
+    logger: logging.Logger,
+) -> None:
+    """Test that not found action is cancelled without parsing body."""
+    logger.setLevel(logging.DEBUG)
+    message = queues.LazySQSParser.parse(
+        queues.prepare_sqs_raw_message(
+            "not a json",
+            action=queues.MessageAction.not_found_action,
+        ),
+    )
+    processor = queues.Processor.get(message_type=message.type)
+    result = await processor(message=message, logger=logger)
+    assert result.is_canceled
+    assert not message.is_body_loaded
+
+
+@pytest.mark.parametrize(
+    ["raw_message_delivery", "expected_attributes"],
+    [
+        [False, {}],
+        [True, {"RawMessageDelivery": "true"}],
+    ],
+)
+async def test_subscription_attributes(
+    raw_message_delivery: bool,
+    expected_attributes: dict[str, str],
+) -> None:
+    """Test that raw message delivery is set in subscription attributes."""
+    assert (
+        sns_sqs_communicator.clients.get_subscription_attributes(
+            raw_message_delivery=raw_message_delivery,
+        )
+        == expected_attributes
+    )
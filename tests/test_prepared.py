@@ -0,0 +1,72 @@
+import typing
+import unittest.mock
+
+import pytest
+import ujson
+
+import sns_sqs_communicator
+
+
+async def test_prepare_message_serializes_once(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that body is serialized once for both dedup id and sending."""
+    body = {"a": 1, "b": 2}
+    metadata = {"action": "plus", "type": "math_calc"}
+    fifo_attrs_creator = (
+        sns_sqs_communicator.fifo_attributes_creator.FifoAttributesCreator
+    )
+    expected_deduplication_id = (
+        fifo_attrs_creator.get_message_deduplication_id(body, metadata)
+    )
+    dumps = unittest.mock.Mock(wraps=ujson.dumps)
+    monkeypatch.setattr(ujson, "dumps", dumps)
+
+    prepared_message = await sns_sqs_communicator.prepared.prepare_message(
+        body=body,
+        metadata=metadata,
+        fifo_attrs_creator=fifo_attrs_creator,
+    )
+
+    dumps.assert_called_once_with(body)
+    assert prepared_message.body == ujson.dumps(body)
+    assert prepared_message.metadata == metadata
+    assert prepared_message.fifo_attributes == {
+        "MessageGroupId": "math_calc",
+        "MessageDeduplicationId": expected_deduplication_id,
+    }
+
+
+class LegacyFifoAttributesCreator:
+    """FIFO attributes creator written against the original protocol."""
+
+    @classmethod
+    def get_message_deduplication_id(
+        cls,
+        body: dict[str, typing.Any],
+        metadata: dict[str, str],
+    ) -> str:
+        """Construct message deduplication id."""
+        return f"{metadata['action']}:{body['a']}"
+
+    @classmethod
+    def get_message_group_id(
+        cls,
+        body: dict[str, typing.Any],
+        metadata: dict[str, str],
+    ) -> str:
+        """Construct message group id."""
+        return metadata["type"]
+
+
+async def test_prepare_message_legacy_fifo_attrs_creator() -> None:
+    """Test that creators without serialized body support still work."""
+    prepared_message = await sns_sqs_communicator.prepared.prepare_message(
+        body={"a": 1},
+        metadata={"action": "plus", "type": "math_calc"},
+        fifo_attrs_creator=LegacyFifoAttributesCreator,
+    )
+    assert prepared_message.fifo_attributes == {
+        "MessageGroupId": "math_calc",
+        "MessageDeduplicationId": "plus:1",
+    }
@@ -1,10 +1,26 @@
 import re
+import typing
 
 import pytest
 
+import sns_sqs_communicator
+
 from . import queues
 
 
+@pytest.fixture
+def dispatch_table_report() -> typing.Generator[
+    sns_sqs_communicator.processing.DispatchTableReport,
+    None,
+    None,
+]:
+    """Compile dispatch table and clear it after test."""
+    yield queues.Processor.compile_dispatch_table(
+        message_action_enum=queues.MessageAction,
+    )
+    queues.Processor.dispatch_table.clear()
+
+
 async def test_duplicate_processor() -> None:
     """Test that it's impossible to create duplicated processor."""
     with pytest.raises(
@@ -24,3 +40,53 @@ async def test_duplicate_processor() -> None:
 async def test_init_other() -> None:
     """Test that we can init processor from other."""
     queues.Processor().init_other(event_processor_class=queues.MathProcessor)
+
+
+async def test_compile_dispatch_table(
+    dispatch_table_report: sns_sqs_communicator.processing.DispatchTableReport,
+) -> None:
+    """Test that dispatch table is compiled and gaps are reported."""
+    report = dispatch_table_report
+    processor = queues.Processor.get(message_type="math_calc")
+    assert processor.get_action_handler(queues.MessageAction.plus) == (
+        processor.plus
+    )
+    assert processor.get_action_handler(queues.MessageAction.fail) is None
+    assert ("math_calc", "fail") in report.missing_actions
+    assert ("math_calc", "plus") not in report.missing_actions
+    assert report.missing_processors == ("unknown",)
+    assert not report.unreachable_processors
+    assert not report.is_complete
+
+
+async def test_dispatch_table_binds_handlers(
+    dispatch_table_report: sns_sqs_communicator.processing.DispatchTableReport,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that handlers are bound to processor they are looked up on."""
+    processor = queues.Processor().init_other(
+        event_processor_class=queues.MathProcessor,
+    )
+    handler = processor.get_action_handler(queues.MessageAction.plus)
+    assert getattr(handler, "__self__", None) is processor
+
+    # Processors registered later are resolved without recompilation
+    monkeypatch.setattr(
+        queues.Processor,
+        "registry",
+        dict(queues.Processor.registry),
+    )
+
+    class LateProcessor(
+        queues.Processor[queues.MathQueueBodySchema],
+        for_type="late_math_calc",
+    ):
+        """Processor registered after compilation."""
+
+        async def plus(self, **kwargs: typing.Any) -> None:
+            """Perform action."""
+
+    late_processor = queues.Processor.get(message_type="late_math_calc")
+    assert late_processor.get_action_handler(queues.MessageAction.plus) == (
+        late_processor.plus
+    )
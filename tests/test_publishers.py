@@ -0,0 +1,296 @@
+import asyncio
+import functools
+import pathlib
+import typing
+import unittest.mock
+
+import pytest
+
+import sns_sqs_communicator
+
+
+def prepare_publish_batch_response(
+    topic_arn: str,
+    entries: list[dict[str, typing.Any]],
+    failed: dict[str, bool] | None = None,
+) -> dict[str, typing.Any]:
+    """Prepare response of PublishBatch failing entries from `failed`.
+
+    Values of `failed` show whether entry failed due to sender's fault.
+
+    """
+    failed = failed or {}
+    return {
+        "Successful": [
+            {"Id": entry["Id"], "MessageId": f"message-{entry['Message']}"}
+            for entry in entries
+            if entry["Message"] not in failed
+        ],
+        "Failed": [
+            {
+                "Id": entry["Id"],
+                "Code": "InvalidParameter" if sender_fault else "Internal",
+                "SenderFault": sender_fault,
+            }
+            for entry in entries
+            if (sender_fault := failed.get(entry["Message"])) is not None
+        ],
+    }
+
+
+@pytest.fixture
+def sns_client() -> unittest.mock.Mock:
+    """Prepare SNS client which publishes every entry successfully."""
+    sns_client = unittest.mock.create_autospec(
+        sns_sqs_communicator.clients.SNSClient,
+        instance=True,
+    )
+    sns_client.publish_batch.side_effect = prepare_publish_batch_response
+    return sns_client
+
+
+@pytest.fixture
+def publisher(
+    sns_client: unittest.mock.Mock,
+) -> sns_sqs_communicator.publishers.BatchingSNSPublisher:
+    """Prepare batching publisher."""
+    return sns_sqs_communicator.publishers.BatchingSNSPublisher(
+        topic=sns_sqs_communicator.topic.SNSTopic(
+            client=sns_client,
+            topic_arn="topic-arn",
+            fifo_attrs_creator=None,
+        ),
+        linger_seconds=0.01,
+        retry_delay_seconds=0,
+    )
+
+
+async def test_batching_publisher(
+    publisher: sns_sqs_communicator.publishers.BatchingSNSPublisher,
+    sns_client: unittest.mock.Mock,
+) -> None:
+    """Test that messages are published in batches of 10."""
+    async with publisher:
+        futures = [
+            await publisher.publish({"index": index}) for index in range(25)
+        ]
+    assert [
+        len(call.kwargs["entries"])
+        for call in sns_client.publish_batch.call_args_list
+    ] == [10, 10, 5]
+    assert await asyncio.gather(*futures) == [
+        f'message-{{"index":{index}}}' for index in range(25)
+    ]
+
+
+async def test_batching_publisher_linger(
+    publisher: sns_sqs_communicator.publishers.BatchingSNSPublisher,
+    sns_client: unittest.mock.Mock,
+) -> None:
+    """Test that buffer is flushed after linger time."""
+    future = await publisher.publish({"a": 1})
+    sns_client.publish_batch.assert_not_called()
+    assert await asyncio.wait_for(future, timeout=1) == 'message-{"a":1}'
+
+
+async def test_batching_publisher_flush_waits(
+    publisher: sns_sqs_communicator.publishers.BatchingSNSPublisher,
+    sns_client: unittest.mock.Mock,
+) -> None:
+    """Test that flush waits for batch sent by linger timer."""
+
+    async def publish_batch(**kwargs: typing.Any) -> dict[str, typing.Any]:
+        await asyncio.sleep(0.05)
+        return prepare_publish_batch_response(**kwargs)
+
+    sns_client.publish_batch.side_effect = publish_batch
+    future = await publisher.publish({"a": 1})
+    # Linger timer has fired and batch is in flight
+    await asyncio.sleep(0.03)
+    await publisher.flush()
+    assert future.done()
+
+
+async def test_batching_publisher_fifo(
+    sns_client: unittest.mock.Mock,
+) -> None:
+    """Test that batches of FIFO topic are sent one at a time."""
+    sending = 0
+    max_sending = 0
+
+    async def publish_batch(**kwargs: typing.Any) -> dict[str, typing.Any]:
+        nonlocal sending, max_sending
+        sending += 1
+        max_sending = max(max_sending, sending)
+        await asyncio.sleep(0.01)
+        sending -= 1
+        return prepare_publish_batch_response(**kwargs)
+
+    sns_client.publish_batch.side_effect = publish_batch
+    publisher = sns_sqs_communicator.publishers.BatchingSNSPublisher(
+        topic=sns_sqs_communicator.topic.SNSTopic(
+            client=sns_client,
+            topic_arn="topic-arn.fifo",
+            fifo_attrs_creator=(
+                sns_sqs_communicator.fifo_attributes_creator.FifoAttributesCreator
+            ),
+        ),
+    )
+    async with publisher:
+        futures = await asyncio.gather(
+            *(
+                publisher.publish(
+                    {"index": index},
+                    {"type": "math_calc", "action": "plus"},
+                )
+                for index in range(30)
+            ),
+        )
+    assert sns_client.publish_batch.call_count == 3
+    assert max_sending == 1
+    assert all(future.done() for future in futures)
+
+
+async def test_batching_publisher_retry(
+    publisher: sns_sqs_communicator.publishers.BatchingSNSPublisher,
+    sns_client: unittest.mock.Mock,
+) -> None:
+    """Test that only entries failed on AWS side are retried."""
+    sns_client.publish_batch.side_effect = functools.partial(
+        prepare_publish_batch_response,
+        failed={'{"index":1}': False, '{"index":2}': True},
+    )
+    async with publisher:
+        futures = [
+            await publisher.publish({"index": index}) for index in range(3)
+        ]
+    assert await futures[0] == 'message-{"index":0}'
+    with pytest.raises(
+        sns_sqs_communicator.batching.BatchEntryError,
+        match="Internal",
+    ):
+        await futures[1]
+    with pytest.raises(
+        sns_sqs_communicator.batching.BatchEntryError,
+        match="InvalidParameter",
+    ):
+        await futures[2]
+    # Entry failed on AWS side is retried until retries are exhausted
+    assert [
+        [entry["Id"] for entry in call.kwargs["entries"]]
+        for call in sns_client.publish_batch.call_args_list
+    ] == [["0", "1", "2"], ["1"], ["1"], ["1"]]
+
+
+def test_batching_publisher_requires_asyncio(
+    publisher: sns_sqs_communicator.publishers.BatchingSNSPublisher,
+) -> None:
+    """Test that publisher explains that it works only on asyncio."""
+    coroutine = publisher.publish({"a": 1})
+    with pytest.raises(RuntimeError, match="works only on asyncio"):
+        coroutine.send(None)
+
+
+def test_sync_publisher(sns_client: unittest.mock.Mock) -> None:
+    """Test that sync publisher batches messages in background loop."""
+    publisher = sns_sqs_communicator.publishers.SyncSNSPublisher(
+        topic=sns_sqs_communicator.topic.SNSTopic(
+            client=sns_client,
+            topic_arn="topic-arn",
+            fifo_attrs_creator=None,
+        ),
+        max_pending_messages=20,
+    )
+    futures = [publisher.publish({"index": index}) for index in range(15)]
+    publisher.flush(timeout=5)
+    assert [future.result(timeout=0) for future in futures] == [
+        f'message-{{"index":{index}}}' for index in range(15)
+    ]
+    publisher.close(timeout=5)
+    with pytest.raises(
+        sns_sqs_communicator.publishers.PublisherClosedError,
+    ):
+        publisher.publish({"index": 15})
+
+
+def test_sync_publisher_backpressure(sns_client: unittest.mock.Mock) -> None:
+    """Test that publishing fails once buffer is full."""
+    publisher = sns_sqs_communicator.publishers.SyncSNSPublisher(
+        topic=sns_sqs_communicator.topic.SNSTopic(
+            client=sns_client,
+            topic_arn="topic-arn",
+            fifo_attrs_creator=None,
+        ),
+        max_pending_messages=1,
+        linger_seconds=60,
+    )
+    publisher.publish({"index": 0})
+    with pytest.raises(
+        sns_sqs_communicator.publishers.PublisherBufferFullError,
+    ):
+        publisher.publish({"index": 1}, timeout=0)
+    publisher.close(timeout=5)
+
+
+async def test_fanout_publisher(sns_client: unittest.mock.Mock) -> None:
+    """Test that message is prepared once and failures are reported."""
+    sqs_client = unittest.mock.create_autospec(
+        sns_sqs_communicator.clients.SQSClient,
+        instance=True,
+    )
+    sqs_client.send_message.side_effect = [ValueError("Queue is broken")]
+    publisher = sns_sqs_communicator.publishers.FanoutPublisher(
+        topics=[
+            sns_sqs_communicator.topic.SNSTopic(
+                client=sns_client,
+                topic_arn=f"topic-arn-{index}",
+                fifo_attrs_creator=None,
+            )
+            for index in range(3)
+        ],
+        queues=[
+            sns_sqs_communicator.queue.SQSQueue(
+                client=sqs_client,
+                queue_url="queue-url",
+            ),
+        ],
+    )
+    sends = await publisher.prepare({"a": 1})
+    assert len({id(prepared_message) for *_, prepared_message in sends}) == 1
+
+    result = await publisher.publish({"a": 1})
+    assert sorted(result.succeeded) == [
+        "topic-arn-0",
+        "topic-arn-1",
+        "topic-arn-2",
+    ]
+    assert list(result.errors) == ["queue-url"]
+    with pytest.raises(ExceptionGroup, match="queue-url"):
+        result.raise_on_failure()
+
+
+async def test_fanout_publisher_claim_check(
+    sns_client: unittest.mock.Mock,
+    tmp_path: pathlib.Path,
+) -> None:
+    """Test that each destination with claim check gets its own body."""
+    claim_check_config = sns_sqs_communicator.claim_check.ClaimCheckConfig(
+        store=sns_sqs_communicator.claim_check.LocalBlobStore(
+            directory=tmp_path,
+        ),
+        threshold=0,
+    )
+    publisher = sns_sqs_communicator.publishers.FanoutPublisher(
+        topics=[
+            sns_sqs_communicator.topic.SNSTopic(
+                client=sns_client,
+                topic_arn=f"topic-arn-{index}",
+                fifo_attrs_creator=None,
+                claim_check_config=claim_check_config,
+            )
+            for index in range(2)
+        ],
+    )
+    sends = await publisher.prepare({"a": 1})
+    assert len({prepared_message.body for *_, prepared_message in sends}) == 2
+    assert len(list(tmp_path.iterdir())) == 2
@@ -0,0 +1,100 @@
+import unittest.mock
+
+import pytest
+
+import botocore.exceptions
+
+import sns_sqs_communicator
+
+from . import queues
+
+
+def prepare_client_error(code: str) -> botocore.exceptions.ClientError:
+    """Prepare error which boto3 raises when AWS returns error."""
+    return botocore.exceptions.ClientError(
+        error_response={"Error": {"Code": code, "Message": code}},
+        operation_name="SendMessage",
+    )
+
+
+def prepare_sqs_client(
+    transport: queues.FakeSQSTransport,
+    retry_policy: sns_sqs_communicator.clients.retry.RetryPolicy,
+) -> sns_sqs_communicator.clients.SQSClient:
+    """Prepare SQS client with fake transport."""
+    return sns_sqs_communicator.clients.SQSClient(
+        client=transport,  # type: ignore
+        default_queue_url="queue-url",
+        retry_policy=retry_policy,
+    )
+
+
+async def test_retry_throttling(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that throttled and transient failures are retried."""
+    counter = unittest.mock.Mock()
+    monkeypatch.setattr(sns_sqs_communicator.metrics, "counter", counter)
+    transport = queues.FakeSQSTransport(
+        send_errors=[
+            prepare_client_error("ThrottlingException"),
+            botocore.exceptions.EndpointConnectionError(endpoint_url="url"),
+        ],
+    )
+    rate_limiter = sns_sqs_communicator.clients.retry.AdaptiveRateLimiter(
+        max_rate=100,
+    )
+    sqs_client = prepare_sqs_client(
+        transport=transport,
+        retry_policy=sns_sqs_communicator.clients.retry.RetryPolicy(
+            base_delay_seconds=0,
+            rate_limiter=rate_limiter,
+        ),
+    )
+    response = await sqs_client.send_message(metadata_attributes={}, body="")
+    assert response == {"MessageId": "message-0"}
+    assert transport.calls["send_message"] == 3
+    # Rate has been halved on throttling and increased on success
+    assert rate_limiter.rate == 51
+    assert counter.call_args_list == [
+        unittest.mock.call(
+            "sns_sqs_communicator.client.throttles",
+            operation="send_message",
+        ),
+        unittest.mock.call(
+            "sns_sqs_communicator.client.retries",
+            operation="send_message",
+            error_kind="throttling",
+        ),
+        unittest.mock.call(
+            "sns_sqs_communicator.client.retries",
+            operation="send_message",
+            error_kind="transient",
+        ),
+    ]
+
+
+@pytest.mark.parametrize(
+    ["error", "budget_capacity"],
+    [
+        [prepare_client_error("AccessDenied"), 500],
+        [prepare_client_error("ThrottlingException"), 0],
+    ],
+    ids=["fatal", "budget_exhausted"],
+)
+async def test_retry_not_allowed(
+    error: Exception,
+    budget_capacity: int,
+) -> None:
+    """Test that fatal errors and errors over budget aren't retried."""
+    transport = queues.FakeSQSTransport(send_errors=[error])
+    sqs_client = prepare_sqs_client(
+        transport=transport,
+        retry_policy=sns_sqs_communicator.clients.retry.RetryPolicy(
+            base_delay_seconds=0,
+            budget=sns_sqs_communicator.clients.retry.RetryBudget(
+                capacity=budget_capacity,
+            ),
+        ),
+    )
+    with pytest.raises(botocore.exceptions.ClientError):
+        await sqs_client.send_message(metadata_attributes={}, body="")
+    assert transport.calls["send_message"] == 1
@@ -1,6 +1,10 @@
 import re
+import typing
 
 import pytest
+import ujson
+
+import sns_sqs_communicator
 
 from . import queues
 
@@ -19,3 +23,99 @@ async def test_duplicate_schema() -> None:
             for_type="math_calc",
         ):
             """Processor for math calculations."""
+
+
+@pytest.mark.parametrize(
+    "parser",
+    [queues.SQSParser, queues.LazySQSParser],
+)
+@pytest.mark.parametrize(
+    ["schema_version", "body"],
+    [
+        [None, {"x": 1, "y": 2}],
+        ["2", {"a": 1, "b": 2}],
+        ["3", {"a": 1, "b": 2, "precision": 0}],
+    ],
+)
+async def test_schema_upgrade(
+    parser: type[sns_sqs_communicator.parsers.ParserProtocol[typing.Any]],
+    schema_version: str | None,
+    body: dict[str, typing.Any],
+) -> None:
+    """Test that bodies of old versions are upgraded to current one."""
+    attributes = (
+        {sns_sqs_communicator.schemas.SCHEMA_VERSION_ATTRIBUTE: schema_version}
+        if schema_version
+        else {}
+    )
+    raw_message = queues.prepare_sqs_raw_message(
+        ujson.dumps(body),
+        message_type="versioned_math_calc",
+        **attributes,
+    )
+    expected_body_schema = queues.VersionedMathQueueBodySchema(
+        a=1,
+        b=2,
+        precision=0,
+    )
+    message = parser.parse(raw_message)
+    assert message.body_schema == expected_body_schema
+    assert message.metadata == {
+        "action": "plus",
+        "type": "versioned_math_calc",
+        "schema-version": "3",
+    }
+    (result,) = parser.parse_many([raw_message])
+    assert result.message
+    assert result.message.body_schema == expected_body_schema
+
+
+async def test_schema_upgrade_chain_cached() -> None:
+    """Test that composed upgrade chain is reused."""
+    assert sns_sqs_communicator.schemas.get_upgrade_chain(
+        message_type="versioned_math_calc",
+        from_version=1,
+        to_version=3,
+    ) is sns_sqs_communicator.schemas.get_upgrade_chain(
+        message_type="versioned_math_calc",
+        from_version=1,
+        to_version=3,
+    )
+
+
+@pytest.mark.parametrize(
+    ["message_type", "schema_version", "expected_message"],
+    [
+        [
+            "math_calc",
+            "0",
+            "No upgrader of math_calc from version 0 is registered",
+        ],
+        [
+            "versioned_math_calc",
+            "4",
+            "Version 4 of versioned_math_calc is newer than current 3",
+        ],
+    ],
+)
+async def test_schema_upgrade_failed(
+    message_type: str,
+    schema_version: str,
+    expected_message: str,
+) -> None:
+    """Test that bodies which can't be upgraded are rejected."""
+    with pytest.raises(
+        sns_sqs_communicator.schemas.SchemaUpgraderNotRegisteredError,
+        match=expected_message,
+    ):
+        queues.SQSParser.parse(
+            queues.prepare_sqs_raw_message(
+                ujson.dumps({"a": 1, "b": 2}),
+                message_type=message_type,
+                **{
+                    sns_sqs_communicator.schemas.SCHEMA_VERSION_ATTRIBUTE: (
+                        schema_version
+                    ),
+                },
+            ),
+        )
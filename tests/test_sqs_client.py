@@ -0,0 +1,182 @@
+import unittest.mock
+
+import anyio
+import pytest
+
+import mypy_boto3_sqs.type_defs
+
+import sns_sqs_communicator
+
+from . import queues
+
+
+async def test_resolution_cache() -> None:
+    """Test that queue urls and arns are resolved once until deletion."""
+    transport = queues.FakeSQSTransport()
+    sqs_client = sns_sqs_communicator.clients.SQSClient(
+        client=transport,  # type: ignore
+    )
+    resolved_queues = await sqs_client.resolve_many(["first", "second"])
+    assert resolved_queues == {
+        "first": sns_sqs_communicator.clients.ResolvedQueue(
+            url="http://localhost/000000000000/first",
+            arn="arn:sqs:first",
+        ),
+        "second": sns_sqs_communicator.clients.ResolvedQueue(
+            url="http://localhost/000000000000/second",
+            arn="arn:sqs:second",
+        ),
+    }
+    assert transport.calls.total() == 4
+    assert (
+        await sqs_client.get_queue_url("first") == resolved_queues["first"].url
+    )
+    assert transport.calls.total() == 4
+
+    await sqs_client.delete_queue(resolved_queues["first"].url)
+    await sqs_client.resolve_many(["first", "second"])
+    assert transport.calls.total() == 6
+
+
+async def test_hedged_receive(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that slow receive is hedged and its messages are released."""
+    counter = unittest.mock.Mock()
+    monkeypatch.setattr(sns_sqs_communicator.metrics, "counter", counter)
+    transport = queues.FakeSQSTransport(
+        raw_messages=[{"ReceiptHandle": "slow"}, {"ReceiptHandle": "fast"}],
+        receive_batch_size=1,
+        receive_delays=[0.3],
+    )
+    sqs_client = sns_sqs_communicator.clients.SQSClient(
+        client=transport,  # type: ignore
+        default_queue_url="queue-url",
+        hedging_policy=sns_sqs_communicator.clients.hedging.HedgingPolicy(
+            initial_delay_seconds=0.05,
+        ),
+        deadlines={"receive_message": 1},
+    )
+    with anyio.fail_after(0.2):
+        response = await sqs_client.receive_messages()
+    assert response == {"Messages": [{"ReceiptHandle": "fast"}]}
+    assert counter.call_args_list == [
+        unittest.mock.call(
+            "sns_sqs_communicator.client.hedges",
+            operation="receive_message",
+        ),
+        unittest.mock.call(
+            "sns_sqs_communicator.client.hedge_wins",
+            operation="receive_message",
+        ),
+    ]
+    # Slow receive releases its messages once it finishes in thread
+    await anyio.sleep(0.5)
+    assert transport.visibility_changes == [
+        {
+            "QueueUrl": "queue-url",
+            "Entries": [
+                {"Id": "0", "ReceiptHandle": "slow", "VisibilityTimeout": 0},
+            ],
+        },
+    ]
+    assert hash(sqs_client) == hash(
+        sns_sqs_communicator.clients.SQSClient(
+            client=transport,  # type: ignore
+            default_queue_url="queue-url",
+        ),
+    )
+
+
+async def test_hedging_discards_losing_result() -> None:
+    """Test that result of losing call completed anyway is discarded."""
+
+    async def call() -> str:
+        """Finish first call slowly, without letting it be cancelled."""
+        calls.append(len(calls))
+        if len(calls) == 1:
+            with anyio.CancelScope(shield=True):
+                await anyio.sleep(0.1)
+            return "slow"
+        return "fast"
+
+    async def discard(result: str) -> None:
+        """Remember discarded result."""
+        discarded_results.append(result)
+
+    calls: list[int] = []
+    discarded_results: list[str] = []
+    hedging_policy = sns_sqs_communicator.clients.hedging.HedgingPolicy(
+        initial_delay_seconds=0.01,
+    )
+    result = await hedging_policy.call(
+        call,
+        operation="call",
+        on_discarded=discard,
+    )
+    assert result == "fast"
+    assert discarded_results == ["slow"]
+
+
+async def test_discardable_call_finished_before_discard() -> None:
+    """Test that result which hasn't reached caller is cleaned up."""
+    discarded_results: list[str] = []
+    call = sns_sqs_communicator.clients.hedging.DiscardableCall(
+        str.upper,
+        on_discarded=discarded_results.append,
+    )
+    assert call("result") == "RESULT"
+    await call.discard()
+    assert discarded_results == ["RESULT"]
+    # Calls finished after discarding clean up their results themselves
+    assert call("late") == "LATE"
+    assert discarded_results == ["RESULT", "LATE"]
+
+
+async def test_deadline() -> None:
+    """Test that calls slower than deadline fail releasing messages."""
+    transport = queues.FakeSQSTransport(
+        raw_messages=[{"ReceiptHandle": "slow"}],
+        receive_delays=[0.3],
+    )
+    sqs_client = sns_sqs_communicator.clients.SQSClient(
+        client=transport,  # type: ignore
+        default_queue_url="queue-url",
+        deadlines={"receive_message": 0.05},
+    )
+    with pytest.raises(TimeoutError):
+        await sqs_client.receive_messages()
+    # Messages received by abandoned call are released
+    await anyio.sleep(0.5)
+    assert len(transport.visibility_changes) == 1
+
+
+async def test_delete_messages_partial_failure(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that failed deletions are retried and persistent ones reported.
+
+    First chunk of 10 messages is deleted after retry of failed entries,
+    while messages of the second one are either deleted or rejected.
+
+    """
+    counter = unittest.mock.Mock()
+    monkeypatch.setattr(sns_sqs_communicator.metrics, "counter", counter)
+    transport = queues.FakeSQSTransport(
+        failed_receipt_handles=["invalid"],
+        flaky_receipt_handles=[str(index) for index in range(1, 10, 2)],
+    )
+    message_queue = queues.prepare_queue(transport)
+    messages: list[mypy_boto3_sqs.type_defs.MessageTypeDef] = [
+        {"ReceiptHandle": str(index)} for index in range(10)
+    ]
+    messages += [{"ReceiptHandle": "invalid"}, {"Body": "not received"}]
+    errors = await message_queue.delete_messages(
+        messages,
+        retry_delay_seconds=0,
+    )
+    assert list(errors) == ["10"]
+    assert transport.calls["delete_message_batch"] == 3
+    counter.assert_called_once_with(
+        "sns_sqs_communicator.queue.delete_failures",
+        value=1,
+        queue_url="queue-url",
+    )
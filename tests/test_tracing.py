@@ -0,0 +1,97 @@
+import logging
+import typing
+
+import opentelemetry.sdk.trace
+import opentelemetry.sdk.trace.export
+import opentelemetry.sdk.trace.export.in_memory_span_exporter
+import pytest
+
+import sns_sqs_communicator
+
+from . import queues
+
+
+@pytest.fixture
+def span_exporter() -> typing.Generator[
+    opentelemetry.sdk.trace.export.in_memory_span_exporter.InMemorySpanExporter,
+    None,
+    None,
+]:
+    """Enable tracing with exporter which keeps spans in memory."""
+    span_exporter = opentelemetry.sdk.trace.export.in_memory_span_exporter.InMemorySpanExporter()  # noqa: E501
+    tracer_provider = opentelemetry.sdk.trace.TracerProvider()
+    tracer_provider.add_span_processor(
+        opentelemetry.sdk.trace.export.SimpleSpanProcessor(span_exporter),
+    )
+    sns_sqs_communicator.tracing.set_tracer(
+        sns_sqs_communicator.otel.OpenTelemetryTracer(
+            tracer_provider=tracer_provider,
+        ),
+    )
+    yield span_exporter
+    sns_sqs_communicator.tracing.set_tracer(None)
+
+
+async def test_trace_propagation(
+    span_exporter: opentelemetry.sdk.trace.export.in_memory_span_exporter.InMemorySpanExporter,  # noqa: E501
+) -> None:
+    """Test that consumer spans continue traces of producers."""
+    message_queue = queues.prepare_queue(queues.FakeSQSTransport())
+    dead_letter_transport = queues.FakeSQSTransport()
+    await message_queue.put(
+        body={"a": 1, "b": 2},
+        metadata={"type": "math_calc", "action": "plus"},
+    )
+    await message_queue.put(
+        body={"error": "Failed"},
+        metadata={"type": "fail", "action": "fail"},
+    )
+    results = await queues.SQSPollWorker.pull_messages(
+        queue=message_queue,
+        dead_letter_queue=queues.prepare_queue(dead_letter_transport),
+        parser=queues.SQSParser,
+        logger=logging.getLogger(__name__),
+    )
+    assert [result.status for result in results] == [
+        sns_sqs_communicator.processing.ProcessingResultStatus.success,
+        sns_sqs_communicator.processing.ProcessingResultStatus.failed,
+    ]
+    # Dead letter continues trace of failed message
+    assert (
+        "traceparent"
+        in dead_letter_transport.sent_messages[0]["MessageAttributes"]
+    )
+
+    spans = span_exporter.get_finished_spans()
+    send_spans = [span for span in spans if span.name == "send"]
+    process_spans = [span for span in spans if span.name == "process"]
+    assert len(send_spans) == 3
+    assert len(process_spans) == 2
+    for send_span, process_span in zip(
+        send_spans,
+        process_spans,
+        strict=False,
+    ):
+        assert process_span.parent
+        assert process_span.parent.span_id == send_span.context.span_id
+    trace_spans = {
+        span.name: span
+        for span in spans
+        if span.context.trace_id == send_spans[0].context.trace_id
+    }
+    assert trace_spans.keys() == {
+        "send",
+        "process",
+        "parse",
+        "dispatch",
+        "prepare_context",
+        "math_calc.plus",
+    }
+    failed_process_span = process_spans[1]
+    assert not failed_process_span.status.is_ok
+    assert {
+        span.name
+        for span in spans
+        if span.context.trace_id == failed_process_span.context.trace_id
+    } >= {"send", "process", "fail.fail", "dead_letter"}
+    assert any(span.name == "ack" for span in spans)